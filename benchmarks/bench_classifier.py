@@ -0,0 +1,92 @@
+"""Microbenchmark for the per-token cost of classifying string tokens.
+
+Times checking every string token of a generated corpus (see
+`corpus.CorpusSpec`) for each of the four `string-quote` modes, with the
+classifier compiled for the configuration against the generic functions
+it replaced, which look the options up and slice the token for every
+string.
+
+Usage:
+    python benchmarks/bench_classifier.py
+"""
+
+import io
+import os
+import sys
+import time
+import tokenize
+
+from pylint_quotes import engine
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from corpus import CorpusSpec, make_module  # noqa: E402 pylint: disable=wrong-import-position
+
+
+def generic_check(token, row, col, is_docstring, config):
+    """Check a string token the way it was done before the classifier."""
+    start, quote = engine.get_quote(token)
+
+    if len(quote) == 3:
+        if is_docstring:
+            correct_quote = engine.TRIPLE_QUOTE_OPTS.get(config.docstring_quote)
+            symbol = 'invalid-docstring-quote'
+        else:
+            correct_quote = engine.TRIPLE_QUOTE_OPTS.get(config.triple_quote)
+            symbol = 'invalid-triple-quote'
+    else:
+        correct_quote = engine.get_preferred_quote(token, start, config.string_quote)
+        symbol = 'invalid-string-quote'
+
+    if quote != correct_quote:
+        return engine.Violation(symbol, row, col, quote, correct_quote)
+    return None
+
+
+def string_tokens(spec):
+    """Get the string tokens of a generated corpus."""
+    tokens = []
+    for i in range(spec.n_files):
+        source = make_module(spec, i)
+        for tok in tokenize.generate_tokens(io.StringIO(source).readline):
+            if tok.type == tokenize.STRING:
+                tokens.append(tok.string)
+    return tokens
+
+
+def best_of(fn, repeat=5):
+    """Get the best time of a number of runs of a function, in seconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    """Run the benchmark and print the per-token cost of each mode."""
+    tokens = string_tokens(CorpusSpec(n_files=50, smart_mix=0.3))
+    print('{} string tokens'.format(len(tokens)))
+    print('{:<22} {:>14} {:>17} {:>9}'.format('string-quote', 'generic (ns)', 'classifier (ns)', 'speedup'))
+
+    for string_quote in engine.CONFIG_OPTS + engine.SMART_CONFIG_OPTS:
+        config = engine.QuoteConfig(string_quote=string_quote)
+        check = engine.QuoteClassifier.compile(config).check
+
+        def _generic():
+            for token in tokens:
+                generic_check(token, 1, 0, False, config)
+
+        def _classifier():
+            for token in tokens:
+                check(token, 1, 0, False)
+
+        generic = best_of(_generic) / len(tokens) * 1e9
+        classifier = best_of(_classifier) / len(tokens) * 1e9
+        print('{:<22} {:>14.0f} {:>17.0f} {:>8.2f}x'.format(
+            string_quote, generic, classifier, generic / classifier))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""Benchmark for the latency of the daemon answering an editor.
+
+Generates a module of about 5,000 lines (see `corpus.make_module`), sends
+it to the daemon once, then sends it again after each of a series of
+single-character edits at random positions -- typing a character, then
+deleting it -- the way an editor does on every keystroke. Reports the
+percentiles of the time taken to answer each `check` request, including
+decoding the request and encoding the response, against checking the
+whole module from scratch on every request.
+
+With `--stdio`, the requests are sent to a `pylint-quotes serve` process
+over a pipe instead, so the latency includes the round trip.
+
+Usage:
+    python benchmarks/bench_daemon.py [--lines N] [--edits N] [--stdio]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+from pylint_quotes import daemon, engine
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import corpus  # noqa: E402 pylint: disable=wrong-import-position
+
+
+def make_source(n_lines):
+    """Generate a module of at least the given number of lines.
+
+    Args:
+        n_lines: the number of lines.
+
+    Returns:
+        str: the module source.
+    """
+    n_literals = n_lines // 2
+    while True:
+        source = corpus.make_module(corpus.CorpusSpec(n_literals=n_literals))
+        if source.count('\n') >= n_lines:
+            return source
+        n_literals += n_lines // 10
+
+
+def iter_edits(source, n_edits, seed=0):
+    """Generate the versions of a module an editor would send while typing.
+
+    Args:
+        source: the module source.
+        n_edits: the number of single-character edits.
+        seed: the random seed.
+
+    Yields:
+        str: the text after each edit; every other edit undoes the one
+        before it.
+    """
+    rng = random.Random(seed)
+    for _ in range(n_edits // 2):
+        pos = rng.randrange(len(source))
+        yield source[:pos] + rng.choice('abcdefxyz_ ') + source[pos:]
+        yield source
+
+
+def _request(request_id, text):
+    return json.dumps({
+        'jsonrpc': '2.0', 'id': request_id, 'method': 'check',
+        'params': {'path': 'bench.py', 'text': text},
+    })
+
+
+def percentiles(times):
+    """Format the percentiles of a list of durations, in milliseconds."""
+    times = sorted(times)
+    return '  '.join(
+        '{} {:7.2f}'.format(name, times[min(int(len(times) * q), len(times) - 1)] * 1000)
+        for name, q in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99), ('max', 1.0))
+    )
+
+
+def bench_in_process(source, edits):
+    """Time the requests answered by a daemon in this process.
+
+    Args:
+        source: the first version of the module.
+        edits: the versions of the module to send after it.
+
+    Returns:
+        tuple: the durations of the incremental requests, and of the same
+        requests checked from scratch.
+    """
+    config = engine.QuoteConfig()
+    server = daemon.Daemon(config)
+    server.handle_line(_request(0, source))
+    incremental = []
+    for i, text in enumerate(edits, 1):
+        line = _request(i, text)
+        start = time.perf_counter()
+        server.handle_line(line)
+        incremental.append(time.perf_counter() - start)
+
+    scratch = []
+    for i, text in enumerate(edits, 1):
+        line = _request(i, text)
+        start = time.perf_counter()
+        daemon.Daemon(config).handle_line(line)
+        scratch.append(time.perf_counter() - start)
+    return incremental, scratch
+
+
+def bench_stdio(source, edits):
+    """Time the requests answered by a `pylint-quotes serve` process.
+
+    Args:
+        source: the first version of the module.
+        edits: the versions of the module to send after it.
+
+    Returns:
+        list[float]: the round trip time of each request after the first.
+    """
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'pylint_quotes', 'serve'], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    times = []
+    try:
+        for i, text in enumerate([source] + list(edits)):
+            start = time.perf_counter()
+            process.stdin.write(_request(i, text).encode('utf-8') + b'\n')
+            process.stdin.flush()
+            process.stdout.readline()
+            if i:
+                times.append(time.perf_counter() - start)
+        process.stdin.write(b'{"jsonrpc": "2.0", "id": -1, "method": "shutdown"}\n')
+        process.stdin.flush()
+    finally:
+        process.stdin.close()
+        process.wait()
+    return times
+
+
+def main(argv=None):
+    """Run the benchmark and print the latency percentiles."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--lines', type=int, default=5000, help='the size of the module (default: %(default)s)')
+    parser.add_argument('--edits', type=int, default=1000, help='the number of edits (default: %(default)s)')
+    parser.add_argument('--stdio', action='store_true', help='send the requests to a serve process')
+    args = parser.parse_args(argv)
+
+    source = make_source(args.lines)
+    edits = list(iter_edits(source, args.edits))
+    n_diagnostics = len(daemon.Daemon(engine.QuoteConfig()).check('bench.py', source)['diagnostics'])
+    print('{} lines, {:.0f} KB, {} messages, {} single-character edits'.format(
+        source.count('\n'), len(source) / 1024, n_diagnostics, len(edits)))
+
+    incremental, scratch = bench_in_process(source, edits)
+    print('{:<12} {}'.format('incremental', percentiles(incremental)))
+    print('{:<12} {}'.format('scratch', percentiles(scratch)))
+    if args.stdio:
+        print('{:<12} {}'.format('stdio', percentiles(bench_stdio(source, edits))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark for matching docstrings to tracked triple quotes.
+
+Generates modules with a growing number of classes and methods, each
+with a docstring, and times the docstring matching done while walking
+the module. The cost per definition should stay flat as the number of
+definitions grows.
+
+Usage:
+    python benchmarks/bench_docstring_lookup.py
+"""
+
+import time
+import tokenize
+from io import StringIO
+
+import astroid
+from astroid import nodes
+from pylint.testutils import UnittestLinter
+
+from pylint_quotes.checker import StringQuoteChecker
+
+
+def make_module(n_classes, n_methods):
+    """Generate source for a module with docstrings on every definition.
+
+    Args:
+        n_classes: the number of classes in the module.
+        n_methods: the number of methods on each class.
+
+    Returns:
+        str: the generated module source.
+    """
+    lines = ['"""Generated module."""', '']
+    for c in range(n_classes):
+        lines.append('class C{}:'.format(c))
+        lines.append('    """Class docstring."""')
+        for m in range(n_methods):
+            lines.append('    def m{}(self):'.format(m))
+            lines.append('        """Method docstring."""')
+            # every other method is a stub with only a docstring, which
+            # astroid parses as a definition with no body.
+            if m % 2:
+                lines.append("        return '''not a docstring'''")
+        lines.append('')
+    return '\n'.join(lines) + '\n'
+
+
+def run(source, repeat=3):
+    """Time the checker on the given source.
+
+    Args:
+        source: the module source to check.
+        repeat: the number of times to repeat the measurement.
+
+    Returns:
+        float: the best time, in seconds.
+    """
+    module = astroid.parse(source)
+    defs = list(module.nodes_of_class((nodes.ClassDef, nodes.FunctionDef)))
+    tokens = list(tokenize.generate_tokens(StringIO(source).readline))
+
+    best = None
+    for _ in range(repeat):
+        checker = StringQuoteChecker(UnittestLinter())
+        checker.open()
+        start = time.perf_counter()
+        checker.process_tokens(tokens)
+        checker.visit_module(module)
+        for node in defs:
+            if isinstance(node, nodes.ClassDef):
+                checker.visit_classdef(node)
+            else:
+                checker.visit_functiondef(node)
+        checker.leave_module(module)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(defs)
+
+
+def main():
+    """Run the benchmark and print the per-definition cost."""
+    print('{:>8} {:>12} {:>14}'.format('defs', 'total (ms)', 'per def (us)'))
+    for n_classes in (10, 20, 40, 80, 160):
+        elapsed, n_defs = run(make_module(n_classes, 25))
+        print('{:>8} {:>12.2f} {:>14.2f}'.format(
+            n_defs, elapsed * 1e3, elapsed / n_defs * 1e6))
+
+
+if __name__ == '__main__':
+    main()
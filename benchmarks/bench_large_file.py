@@ -0,0 +1,118 @@
+"""Benchmark for the peak memory and time of checking one very large module.
+
+Generates a module of the given size (50 MB by default) shaped like
+generated code -- a data table of short string literals, or a fixture
+holding one large triple quoted string -- and checks it in a fresh
+process, reporting the time taken and the peak RSS of the process on top
+of its RSS before the check.
+
+Usage:
+    python benchmarks/bench_large_file.py [--size MB] [--shape table|blob]
+        [--via file|cache] [--scanner regex|tokenize]
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from pylint_quotes import engine, runner
+from pylint_quotes.cache import ResultCache
+
+SHAPES = ('table', 'blob')
+
+
+def write_module(path, size, shape):
+    """Write a generated module of about the given size.
+
+    Args:
+        path: the path to write the module to.
+        size: the size of the module, in bytes.
+        shape: 'table' for a list of rows of short literals, or 'blob' for
+            a single triple quoted string.
+    """
+    with open(path, 'w') as f:
+        f.write('"""Generated module."""\n\n')
+        if shape == 'table':
+            f.write('ROWS = [\n')
+            row = 0
+            while f.tell() < size:
+                f.write("    ('key{0}', \"value{0}\", {0}),\n".format(row))
+                row += 1
+            f.write(']\n')
+        else:
+            f.write("BLOB = '''\\\n")
+            line = 'abcdefghij klmnopqrst uvwxyz "quoted" 0123456789 ' * 2 + '\n'
+            while f.tell() < size:
+                f.write(line * 1000)
+            f.write("'''\n")
+
+
+def _max_rss():
+    """Get the peak RSS of this process, in bytes."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macos.
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def measure(path, via, scanner):
+    """Check a module in this process, and measure the check.
+
+    Args:
+        path: the path to the module.
+        via: 'file' to check it with engine.check_file, or 'cache' to check
+            it through a runner with a result cache.
+        scanner: how to find the strings of the module; one of
+            engine.SCANNERS.
+
+    Returns:
+        tuple: the time taken, in seconds, the peak RSS of the process
+        before the check and after it, in bytes, and the number of
+        violations found.
+    """
+    config = engine.QuoteConfig()
+    before = _max_rss()
+    start = time.perf_counter()
+    if via == 'file':
+        violations = engine.check_file(path, config, scanner=scanner)
+    else:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            violations = runner.check_path(path, config, cache=ResultCache(cache_dir), scanner=scanner).violations
+    return time.perf_counter() - start, before, _max_rss(), len(violations)
+
+
+def main(argv=None):
+    """Generate the module, then check it in a fresh process."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', type=float, default=50, help='the module size, in MB')
+    parser.add_argument('--shape', choices=SHAPES, default='table')
+    parser.add_argument('--via', choices=('file', 'cache'), default='file')
+    parser.add_argument('--scanner', choices=engine.SCANNERS, default='regex')
+    parser.add_argument('--measure', metavar='PATH', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        print(*measure(args.measure, args.via, args.scanner))
+        return 0
+
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, 'large.py')
+        write_module(path, int(args.size * 2 ** 20), args.shape)
+        # a fresh process, so nothing else counts towards its peak RSS.
+        output = subprocess.run(
+            [sys.executable, __file__, '--via', args.via, '--scanner', args.scanner, '--measure', path],
+            check=True, stdout=subprocess.PIPE, universal_newlines=True,
+        ).stdout
+        elapsed, before, after, n_violations = (float(value) for value in output.split())
+        print('{:.1f} MB {} module, checked via {} ({}): {:.2f}s, peak RSS +{:.1f} MB, {:.0f} violations'.format(
+            os.path.getsize(path) / 2 ** 20, args.shape, args.via, args.scanner, elapsed,
+            (after - before) / 2 ** 20, n_violations,
+        ))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Benchmark for the peak memory and time of writing a very large result set.
+
+Generates a tree of modules with about a million violations between them,
+and checks it with `pylint-quotes check` in a fresh process for each
+output format, writing the messages to /dev/null. Reports the time taken,
+the messages written per second and the peak RSS of the main process.
+For comparison, 'sarif (document)' collects every result and dumps the
+SARIF log as a whole, as a writer which does not stream would.
+
+Usage:
+    python benchmarks/bench_output.py [--files N] [--rows N] [--jobs N]
+"""
+
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from pylint_quotes import cli, engine, report, runner
+
+MODES = ('text', 'jsonl', 'sarif', 'sarif (document)')
+
+
+def write_tree(root, n_files, n_rows):
+    """Write a tree of modules with two violations on each row.
+
+    Args:
+        root: the directory to write the modules to.
+        n_files: the number of modules.
+        n_rows: the number of rows of each module.
+    """
+    for i in range(n_files):
+        with open(os.path.join(root, 'mod{}.py'.format(i)), 'w') as f:
+            f.write('"""Generated module."""\n\nROWS = [\n')
+            f.writelines('    ("key{0}", "value{0}", {0}),\n'.format(row) for row in range(n_rows))
+            f.write(']\n')
+
+
+def _max_rss():
+    """Get the peak RSS of this process, in bytes."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macos.
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def _write_document(root, jobs, out):
+    """Check a tree and dump its SARIF log as a whole.
+
+    Args:
+        root: the directory to check.
+        jobs: the number of worker processes.
+        out: the stream to write the log to.
+    """
+    results = list(runner.run(runner.iter_python_files([root]), engine.QuoteConfig(), jobs=jobs))
+    text = io.StringIO()
+    with report.SarifWriter(text) as writer:
+        for result in results:
+            writer.write(result)
+    json.dump(json.loads(text.getvalue()), out)
+
+
+def measure(root, mode, jobs):
+    """Check a tree in this process, writing its messages to /dev/null.
+
+    Args:
+        root: the directory to check.
+        mode: the output format, or 'sarif (document)'.
+        jobs: the number of worker processes.
+
+    Returns:
+        tuple: the time taken, in seconds, and the peak RSS of the process
+        before the check and after it, in bytes.
+    """
+    before = _max_rss()
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as out:
+        if mode in report.WRITERS:
+            args = cli.build_parser().parse_args(['check', '-f', mode, '-j', str(jobs), root])
+            cli.run_check(args, out)
+        else:
+            _write_document(root, jobs, out)
+    return time.perf_counter() - start, before, _max_rss()
+
+
+def main(argv=None):
+    """Generate the tree, then check it for each mode in a fresh process."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--files', type=int, default=100, help='the modules (default: %(default)s)')
+    parser.add_argument('--rows', type=int, default=5000, help='the rows of each module (default: %(default)s)')
+    parser.add_argument('--jobs', type=int, default=2, help='the worker processes (default: %(default)s)')
+    parser.add_argument('--measure', metavar='DIR', help=argparse.SUPPRESS)
+    parser.add_argument('--mode', choices=MODES, default='text', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        print(*measure(args.measure, args.mode, args.jobs))
+        return 0
+
+    with tempfile.TemporaryDirectory() as root:
+        write_tree(root, args.files, args.rows)
+        n_messages = args.files * args.rows * 2
+        print('{} files, {} messages, {} jobs'.format(args.files, n_messages, args.jobs))
+        print('{:<18} {:>8} {:>14} {:>18}'.format('output', 'time (s)', 'messages/s', 'peak RSS +(MB)'))
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, __file__, '--mode', mode, '--jobs', str(args.jobs), '--measure', root],
+                check=True, stdout=subprocess.PIPE, universal_newlines=True,
+            ).stdout
+            elapsed, before, after = (float(value) for value in output.split())
+            print('{:<18} {:>8.2f} {:>14.0f} {:>18.1f}'.format(
+                mode, elapsed, n_messages / elapsed, (after - before) / 2 ** 20))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
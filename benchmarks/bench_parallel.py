@@ -0,0 +1,68 @@
+"""Benchmark for the files/sec of the standalone runner by worker count.
+
+Generates a corpus of python files, including a few large generated
+modules, and checks it with 1 to N worker processes.
+
+Usage:
+    python benchmarks/bench_parallel.py [MAX_JOBS]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from pylint_quotes import engine, runner
+
+N_FILES = 2000
+N_LARGE = 4
+
+
+def make_corpus(root):
+    """Write the benchmark corpus to the given directory.
+
+    Args:
+        root: the directory to write the corpus to.
+
+    Returns:
+        list[str]: the paths of the files in the corpus.
+    """
+    paths = []
+    for i in range(N_FILES):
+        # a handful of large generated modules, the rest regular sized.
+        n_defs = 2000 if i < N_LARGE else 10 + i % 40
+        lines = ['"""Generated module {}."""'.format(i), '']
+        for d in range(n_defs):
+            lines.append('def fn{}(x="default", y=\'other\'):'.format(d))
+            lines.append("    '''Docstring.'''")
+            lines.append('    return {"key": x, \'other\': y}')
+            lines.append('')
+        path = os.path.join(root, 'mod{:05}.py'.format(i))
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines))
+        paths.append(path)
+    return paths
+
+
+def main():
+    """Run the benchmark and print the files/sec for each worker count."""
+    max_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    config = engine.QuoteConfig()
+
+    with tempfile.TemporaryDirectory() as root:
+        paths = make_corpus(root)
+        print('{} files, {} CPUs'.format(len(paths), os.cpu_count()))
+        print('{:>6} {:>10} {:>12}'.format('jobs', 'time (s)', 'files/sec'))
+
+        jobs = 1
+        while jobs <= max_jobs:
+            start = time.perf_counter()
+            for _ in runner.run(paths, config, jobs=jobs):
+                pass
+            elapsed = time.perf_counter() - start
+            print('{:>6} {:>10.2f} {:>12.0f}'.format(jobs, elapsed, len(paths) / elapsed))
+            jobs *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark for the throughput of finding strings with the regex scanner,
+against tokenizing the source.
+
+Checks every python file of the local CPython standard library (or the
+given directories) with each of the engine's scanners, and reports the
+MB/sec and files/sec of each, along with how many files the regex scanner
+had to fall back to tokenizing.
+
+Usage:
+    python benchmarks/bench_scanner.py [DIR...]
+"""
+
+import os
+import sys
+import time
+import tokenize
+
+from pylint_quotes import engine, runner, scanner
+
+
+def main(argv=None):
+    """Run the benchmark and print the throughput of each scanner."""
+    roots = (sys.argv[1:] if argv is None else argv) or [os.path.dirname(tokenize.__file__)]
+    sources = []
+    for path in runner.iter_python_files(roots):
+        with open(path, 'rb') as f:
+            sources.append(f.read())
+    size = sum(len(content) for content in sources) / 2 ** 20
+    config = engine.QuoteConfig()
+
+    fallbacks = 0
+    for content in sources:
+        try:
+            list(scanner.iter_strings(content))
+        except scanner.ScanError:
+            fallbacks += 1
+        except SyntaxError:
+            pass
+
+    print('{} files, {:.1f} MB; the regex scanner falls back on {}'.format(len(sources), size, fallbacks))
+    print('{:<10} {:>10} {:>10} {:>12}'.format('scanner', 'time (s)', 'MB/sec', 'files/sec'))
+    for name in engine.SCANNERS:
+        start = time.perf_counter()
+        for content in sources:
+            try:
+                engine.check_bytes(content, config, scanner=name)
+            except runner.CHECK_ERRORS + (UnicodeDecodeError,):
+                pass
+        elapsed = time.perf_counter() - start
+        print('{:<10} {:>10.2f} {:>10.2f} {:>12.0f}'.format(name, elapsed, size / elapsed, len(sources) / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+"""Benchmark suite for the token processing and docstring matching of the
+plugin.
+
+Generates a synthetic corpus (see `corpus.CorpusSpec`) and measures, for
+each `string-quote` option and docstring detection mode, the throughput of
+the checker's token processing -- `process_tokens` and the per-string
+checks, plus the docstring matching done while walking the module in the
+'ast' mode -- in tokens/sec and files/sec. The tokens and the astroid tree
+of each module are prepared up front, so only the checker is timed.
+
+The cost of modules with every quote message disabled is measured too,
+which should be close to nothing.
+
+The overhead of the plugin on top of bare pylint is measured by running
+pylint on part of the corpus with all messages disabled, with and without
+the plugin loaded and its messages enabled.
+
+Every measurement is a throughput, so higher is better. Results can be
+saved as a baseline and later runs compared against it; a metric which
+drops by more than the threshold is reported as a regression, and the
+exit status is 1.
+
+Usage:
+    python benchmarks/bench_suite.py [--save BASELINE] [--compare BASELINE]
+        [--threshold 0.1] [--files N] [--literals N] [--length N]
+        [--triple-density F] [--depth N] [--smart-mix F] [--pylint-files N]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tokenize
+from io import StringIO
+
+import astroid
+from astroid import nodes
+from pylint.testutils import UnittestLinter
+
+from pylint_quotes.checker import DOCSTRING_DETECTION_OPTS, StringQuoteChecker
+from pylint_quotes.engine import CONFIG_OPTS, SMART_CONFIG_OPTS
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from corpus import CorpusSpec, make_module, write_corpus  # noqa: E402 pylint: disable=wrong-import-position
+
+QUOTE_MSGS = 'invalid-string-quote,invalid-triple-quote,invalid-docstring-quote'
+
+
+def prepare(spec):
+    """Generate the corpus in memory, with the tokens and tree of each module.
+
+    Args:
+        spec: the CorpusSpec to generate.
+
+    Returns:
+        list[tuple]: the tokens, the module node and the class and function
+        nodes of each module.
+    """
+    modules = []
+    for i in range(spec.n_files):
+        source = make_module(spec, i)
+        tokens = list(tokenize.generate_tokens(StringIO(source).readline))
+        module = astroid.parse(source)
+        defs = list(module.nodes_of_class((nodes.ClassDef, nodes.FunctionDef)))
+        modules.append((tokens, module, defs))
+    return modules
+
+
+class DisabledLinter(UnittestLinter):
+    """A linter with every message disabled, e.g. by the rcfile."""
+
+    @staticmethod
+    def is_message_enabled(*unused_args, **unused_kwargs):
+        return False
+
+
+def time_plugin(modules, string_quote, detection, repeat=3, disabled=False):
+    """Time the checker over the prepared corpus.
+
+    Args:
+        modules: the prepared corpus, from `prepare`.
+        string_quote: the `string-quote` option value.
+        detection: the `docstring-detection` option value.
+        repeat: the number of times to repeat the measurement.
+        disabled: whether the quote messages are disabled.
+
+    Returns:
+        float: the best time, in seconds.
+    """
+    best = None
+    for _ in range(repeat):
+        checker = StringQuoteChecker(DisabledLinter() if disabled else UnittestLinter())
+        checker.config.string_quote = string_quote
+        checker.config.docstring_detection = detection
+
+        start = time.perf_counter()
+        for tokens, module, defs in modules:
+            checker.open()
+            checker.process_tokens(tokens)
+            if detection == 'ast':
+                checker.visit_module(module)
+                for node in defs:
+                    if isinstance(node, nodes.ClassDef):
+                        checker.visit_classdef(node)
+                    else:
+                        checker.visit_functiondef(node)
+                checker.leave_module(module)
+            checker.linter.release_messages()
+        elapsed = time.perf_counter() - start
+
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def time_pylint(paths, plugin, repeat=3):
+    """Time a pylint run over the given files.
+
+    Args:
+        paths: the files to run pylint on.
+        plugin: whether to load the plugin and enable its messages.
+        repeat: the number of times to repeat the measurement.
+
+    Returns:
+        float: the best time, in seconds.
+    """
+    args = [sys.executable, '-m', 'pylint', '--rcfile=' + os.devnull, '--persistent=n',
+            '--score=n', '--disable=all']
+    if plugin:
+        args += ['--load-plugins=pylint_quotes', '--enable=' + QUOTE_MSGS]
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args + paths, stdout=subprocess.DEVNULL, check=False)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_suite(spec, pylint_files, repeat=3):
+    """Run every benchmark of the suite.
+
+    Args:
+        spec: the CorpusSpec of the corpus to benchmark on.
+        pylint_files: the number of files to run pylint on, for the plugin
+            overhead; 0 skips it.
+        repeat: the number of times to repeat each measurement.
+
+    Returns:
+        dict: the throughput of each benchmark, keyed by metric name.
+    """
+    modules = prepare(spec)
+    n_tokens = sum(len(tokens) for tokens, _, _ in modules)
+
+    metrics = {}
+    for detection in DOCSTRING_DETECTION_OPTS:
+        for string_quote in CONFIG_OPTS + SMART_CONFIG_OPTS:
+            elapsed = time_plugin(modules, string_quote, detection, repeat)
+            name = 'plugin/{}/{}'.format(detection, string_quote)
+            metrics[name + '/tokens_per_sec'] = n_tokens / elapsed
+            metrics[name + '/files_per_sec'] = len(modules) / elapsed
+
+        # the same modules, with the quote messages disabled.
+        elapsed = time_plugin(modules, CONFIG_OPTS[0], detection, repeat, disabled=True)
+        name = 'plugin/{}/disabled'.format(detection)
+        metrics[name + '/tokens_per_sec'] = n_tokens / elapsed
+        metrics[name + '/files_per_sec'] = len(modules) / elapsed
+
+    if pylint_files:
+        with tempfile.TemporaryDirectory() as root:
+            paths = write_corpus(root, spec._replace(n_files=min(pylint_files, spec.n_files)))
+            metrics['pylint/bare/files_per_sec'] = len(paths) / time_pylint(paths, False, repeat)
+            metrics['pylint/plugin/files_per_sec'] = len(paths) / time_pylint(paths, True, repeat)
+
+    return metrics
+
+
+def compare(metrics, baseline, threshold):
+    """Compare the metrics of a run against a baseline.
+
+    Args:
+        metrics: the metrics of this run, from `run_suite`.
+        baseline: the baseline metrics.
+        threshold: the fraction a metric may drop by before it counts as a
+            regression.
+
+    Returns:
+        list[tuple]: the (name, baseline, current) of each metric which
+        regressed.
+    """
+    regressions = []
+    for name, value in sorted(metrics.items()):
+        expected = baseline.get(name)
+        if expected and value < expected * (1 - threshold):
+            regressions.append((name, expected, value))
+    return regressions
+
+
+def build_parser():
+    """Build the command line argument parser.
+
+    Returns:
+        argparse.ArgumentParser: the parser for the command line.
+    """
+    defaults = CorpusSpec()
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--save', metavar='BASELINE', help='save the results as a baseline')
+    parser.add_argument('--compare', metavar='BASELINE', help='compare the results against a baseline')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='the fraction a metric may drop by before it is a regression')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--files', type=int, default=defaults.n_files)
+    parser.add_argument('--literals', type=int, default=defaults.n_literals)
+    parser.add_argument('--length', type=int, default=defaults.literal_length)
+    parser.add_argument('--triple-density', type=float, default=defaults.triple_density)
+    parser.add_argument('--depth', type=int, default=defaults.depth)
+    parser.add_argument('--smart-mix', type=float, default=defaults.smart_mix)
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--pylint-files', type=int, default=20,
+                        help='the number of files to measure the overhead on pylint with; 0 skips it')
+    return parser
+
+
+def main(argv=None):
+    """Run the suite, print the results and compare them to a baseline.
+
+    Returns:
+        int: 1 if a metric regressed against the baseline, otherwise 0.
+    """
+    args = build_parser().parse_args(argv)
+    spec = CorpusSpec(
+        n_files=args.files, n_literals=args.literals, literal_length=args.length,
+        triple_density=args.triple_density, depth=args.depth, smart_mix=args.smart_mix,
+        seed=args.seed,
+    )
+
+    metrics = run_suite(spec, args.pylint_files, args.repeat)
+
+    print('{:<52} {:>14}'.format('metric', 'value'))
+    for name, value in sorted(metrics.items()):
+        print('{:<52} {:>14.1f}'.format(name, value))
+    for detection in DOCSTRING_DETECTION_OPTS:
+        name = 'plugin/{}/{{}}/files_per_sec'.format(detection)
+        print('{} detection, messages disabled: {:.1%} of the cost of checking'.format(
+            detection, metrics[name.format(CONFIG_OPTS[0])] / metrics[name.format('disabled')]))
+    if 'pylint/bare/files_per_sec' in metrics:
+        overhead = metrics['pylint/bare/files_per_sec'] / metrics['pylint/plugin/files_per_sec'] - 1
+        print('plugin overhead on pylint: {:+.1%}'.format(overhead))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'spec': spec._asdict(), 'metrics': metrics}, f, indent=2, sort_keys=True)
+
+    if not args.compare:
+        return 0
+
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    if baseline.get('spec') != spec._asdict():
+        print('warning: the baseline was measured on a different corpus: {}'.format(baseline.get('spec')))
+
+    regressions = compare(metrics, baseline.get('metrics', {}), args.threshold)
+    for name, expected, value in regressions:
+        print('REGRESSION {}: {:.1f} -> {:.1f} ({:+.1%})'.format(name, expected, value, value / expected - 1))
+    if not regressions:
+        print('no regressions against {} (threshold {:.0%})'.format(args.compare, args.threshold))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
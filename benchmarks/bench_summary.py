@@ -0,0 +1,137 @@
+"""Benchmark for summarizing the quote violations of a module in one message.
+
+Generates a module with about 20,000 quote violations (see
+`corpus.make_module`), and runs pylint on it with the plugin adding a
+message for each violation, with `quote-summary` adding a single message
+for the module instead, and with the summary writing every violation to a
+JSON lines file too. Each run is in a fresh process, so none reuses the
+modules astroid parsed for another. Reports the best time of the whole run
+and of the plugin (from `quote-profile`, which includes the messages it
+adds and their reporting), and the size of what was written.
+
+Usage:
+    python benchmarks/bench_summary.py [--violations N] [--repeat N]
+"""
+
+import argparse
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from pylint.lint import Run
+from pylint.reporters.text import TextReporter
+
+from pylint_quotes import engine
+from pylint_quotes.checker import StringQuoteChecker
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import corpus  # noqa: E402 pylint: disable=wrong-import-position
+
+SYMBOLS = 'invalid-string-quote,invalid-triple-quote,invalid-docstring-quote,quote-violations-summary'
+
+
+def make_source(n_violations):
+    """Generate a module with at least the given number of violations.
+
+    Args:
+        n_violations: the number of violations, with the default
+            configuration.
+
+    Returns:
+        str: the module source.
+    """
+    n_literals = n_violations * 2
+    while True:
+        source = corpus.make_module(corpus.CorpusSpec(n_literals=n_literals))
+        if len(engine.check_bytes(source.encode('utf-8'), engine.QuoteConfig())) >= n_violations:
+            return source
+        n_literals += n_violations // 5
+
+
+def measure(path, options):
+    """Run pylint with the plugin on a file in this process, and measure it.
+
+    Args:
+        path: the file to run pylint on.
+        options: the extra pylint options.
+
+    Returns:
+        tuple: the time of the run and of the plugin, in seconds, and the
+        size of the output, in bytes.
+    """
+    args = [
+        '--rcfile=' + os.devnull, '--persistent=n', '--score=n', '--load-plugins=pylint_quotes',
+        '--disable=all', '--enable=' + SYMBOLS, '--quote-profile=y',
+    ] + options + [path]
+    out = io.StringIO()
+    start = time.perf_counter()
+    run = Run(args, reporter=TextReporter(out), exit=False)
+    elapsed = time.perf_counter() - start
+    checker = next(c for c in run.linter.get_checkers() if isinstance(c, StringQuoteChecker))
+    return elapsed, sum(checker._profile.times.values()), len(out.getvalue().encode('utf-8'))
+
+
+def time_pylint(path, options, repeat):
+    """Time pylint runs with the plugin on a file, each in a fresh process.
+
+    Args:
+        path: the file to run pylint on.
+        options: the extra pylint options.
+        repeat: the number of times to repeat the run.
+
+    Returns:
+        tuple: the best time of the run and of the plugin, in seconds, and
+        the size of the output, in bytes.
+    """
+    best = None
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, __file__, '--measure', path] + ['--option=' + option for option in options],
+            check=True, stdout=subprocess.PIPE, universal_newlines=True,
+        ).stdout
+        elapsed, plugin, size = (float(value) for value in output.split())
+        result = (elapsed, plugin, int(size))
+        best = result if best is None else min(best, result, key=lambda r: r[1])
+    return best
+
+
+def main(argv=None):
+    """Run the benchmark and print the time and output size of each mode."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--violations', type=int, default=20000, help='the violations (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3, help='the runs of each mode (default: %(default)s)')
+    parser.add_argument('--measure', metavar='PATH', help=argparse.SUPPRESS)
+    parser.add_argument('--option', action='append', default=[], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        print(*measure(args.measure, args.option))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'legacy.py')
+        source = make_source(args.violations)
+        with open(path, 'w') as f:
+            f.write(source)
+        n_violations = len(engine.check_bytes(source.encode('utf-8'), engine.QuoteConfig()))
+        print('{} lines, {} violations'.format(source.count('\n'), n_violations))
+
+        summary_file = os.path.join(tmp, 'violations.jsonl')
+        print('{:<16} {:>8} {:>10} {:>12} {:>12}'.format('mode', 'run (s)', 'plugin (s)', 'output (KB)',
+                                                          'sidecar (KB)'))
+        for name, options in (
+                ('per violation', []),
+                ('summary', ['--quote-summary=y']),
+                ('summary + file', ['--quote-summary=y', '--quote-summary-file=' + summary_file]),
+        ):
+            elapsed, plugin, size = time_pylint(path, options, args.repeat)
+            sidecar = os.path.getsize(summary_file) / 1024 if len(options) > 1 else 0
+            print('{:<16} {:>8.2f} {:>10.3f} {:>12.1f} {:>12.1f}'.format(name, elapsed, plugin, size / 1024, sidecar))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
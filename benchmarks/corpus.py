@@ -0,0 +1,111 @@
+"""Synthetic corpus generator for the benchmarks.
+
+Modules are generated from a `CorpusSpec`, which controls the shape of the
+source the checker has to work through: how many string literals there
+are and how long they are, how many of them are triple quoted, how deeply
+the classes and functions holding them are nested, and how many of them
+contain a quote character (the cases the `*-avoid-escape` options treat
+differently). Generation is seeded, so the same spec always produces the
+same corpus.
+"""
+
+import collections
+import os
+import random
+
+CorpusSpec = collections.namedtuple('CorpusSpec', [
+    'n_files', 'n_literals', 'literal_length', 'triple_density', 'depth', 'smart_mix', 'seed',
+])
+CorpusSpec.__new__.__defaults__ = (200, 200, 16, 0.1, 3, 0.2, 0)
+CorpusSpec.__doc__ = """The shape of a generated corpus.
+
+Attributes:
+    n_files: the number of modules in the corpus.
+    n_literals: the number of string literals in each module, not counting
+        docstrings.
+    literal_length: the average number of characters in each literal.
+    triple_density: the fraction of the literals which are triple quoted.
+    depth: how deeply the classes and functions holding the literals are
+        nested; each definition has a docstring.
+    smart_mix: the fraction of the single quoted literals which contain a
+        quote character.
+    seed: the random seed.
+"""
+
+# literals per innermost definition.
+_LITERALS_PER_DEF = 8
+
+
+def _literal(rng, spec):
+    """Generate the source of a single string literal."""
+    length = max(1, int(rng.expovariate(1.0 / spec.literal_length)))
+    text = ''.join(rng.choice('abcdefghij klmnop') for _ in range(length))
+
+    if rng.random() < spec.triple_density:
+        quote = rng.choice(('"""', "'''"))
+        return quote + text.replace(' ', '\n', 1) + quote
+
+    quote = rng.choice(('"', "'"))
+    if rng.random() < spec.smart_mix:
+        # an embedded quote: either the same one, escaped, or the other one.
+        inner = rng.choice(('"', "'"))
+        if inner == quote:
+            inner = '\\' + inner
+        middle = len(text) // 2
+        text = text[:middle] + inner + text[middle:]
+    return quote + text + quote
+
+
+def make_module(spec, index=0):
+    """Generate the source of a single module.
+
+    Args:
+        spec: the CorpusSpec to generate from.
+        index: the index of the module in the corpus, mixed into the seed.
+
+    Returns:
+        str: the module source.
+    """
+    rng = random.Random('{}-{}'.format(spec.seed, index))
+    lines = ['"""Generated module {}."""'.format(index), '']
+    remaining = spec.n_literals
+
+    n_def = 0
+    while remaining > 0:
+        indent = ''
+        for level in range(spec.depth):
+            if level % 2 == 0:
+                lines.append('{}class C{}_{}:'.format(indent, n_def, level))
+            else:
+                lines.append('{}def f{}_{}(self, x={}):'.format(indent, n_def, level, _literal(rng, spec)))
+                remaining -= 1
+            indent += '    '
+            lines.append('{}"""Docstring of level {}."""'.format(indent, level))
+
+        for i in range(min(remaining, _LITERALS_PER_DEF)):
+            lines.append('{}v{} = {}'.format(indent, i, _literal(rng, spec)))
+            remaining -= 1
+        lines.append('{}pass'.format(indent))
+        lines.append('')
+        n_def += 1
+
+    return '\n'.join(lines) + '\n'
+
+
+def write_corpus(root, spec):
+    """Write a generated corpus to a directory.
+
+    Args:
+        root: the directory to write the corpus to.
+        spec: the CorpusSpec to generate from.
+
+    Returns:
+        list[str]: the paths of the modules written.
+    """
+    paths = []
+    for i in range(spec.n_files):
+        path = os.path.join(root, 'mod{:05}.py'.format(i))
+        with open(path, 'w') as f:
+            f.write(make_module(spec, i))
+        paths.append(path)
+    return paths
@@ -2,6 +2,20 @@
 
 from __future__ import absolute_import
 
-from pylint_quotes import checker, plugin  # noqa: F401
+from pylint_quotes.api import check_many, check_source
+from pylint_quotes.engine import QuoteConfig, Violation
 
-register = plugin.register  # pylint: disable=invalid-name
+__all__ = ['QuoteConfig', 'Violation', 'check_many', 'check_source', 'register']
+
+
+def register(linter):
+    """Required method to auto register this checker.
+
+    pylint is only imported once the plugin is registered, so the package
+    can also be used without it (see `pylint_quotes.cli`).
+
+    Args:
+        linter: Main interface object for Pylint plugins.
+    """
+    from pylint_quotes import plugin  # pylint: disable=import-outside-toplevel
+    plugin.register(linter)
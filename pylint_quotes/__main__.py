@@ -0,0 +1,7 @@
+"""Entrypoint for running pylint-quotes with `python -m pylint_quotes`."""
+
+import sys
+
+from pylint_quotes.cli import main
+
+sys.exit(main())
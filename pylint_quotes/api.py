@@ -0,0 +1,196 @@
+"""Check sources held in memory, without pylint or astroid.
+
+This is the library interface of the checks, for code which has sources
+as text rather than files, e.g. snippets from a code review or a notebook:
+
+    import pylint_quotes
+
+    violations = pylint_quotes.check_source('x = "a"\\n', {'string-quote': 'single'})
+
+    for result in pylint_quotes.check_many(snippets, config):
+        ...
+
+The strings of each source are classified the same way the pylint plugin
+classifies the tokens of a module (see `engine.QuoteClassifier` and
+`docstrings.iter_strings`), so the violations are those the plugin reports
+with the default 'tokens' docstring detection. `check_many` compiles the
+configuration once for the whole batch.
+
+Unlike `pylint_quotes.pool`, which runs the plugin's own checker, nothing
+here imports pylint.
+"""
+
+from __future__ import absolute_import
+
+import collections.abc
+import io
+import tokenize
+
+from pylint_quotes import docstrings, engine, runner
+from pylint_quotes import scanner as _scanner
+
+# the values of each quote option, keyed by its QuoteConfig field.
+CONFIG_VALUES = {
+    'string_quote': engine.CONFIG_OPTS + engine.SMART_CONFIG_OPTS,
+    'triple_quote': engine.CONFIG_OPTS,
+    'docstring_quote': engine.CONFIG_OPTS,
+}
+
+
+def make_config(config=None):
+    """Get the quote configuration to check against.
+
+    Args:
+        config: an engine.QuoteConfig, or a mapping of the quote options
+            to use, by their pylint option name (e.g. 'string-quote') or
+            their QuoteConfig field (e.g. 'string_quote'); the other
+            options have their default value. If None (default), the
+            default configuration is used.
+
+    Returns:
+        engine.QuoteConfig: the configuration.
+
+    Raises:
+        TypeError: the configuration is neither a QuoteConfig nor a mapping.
+        ValueError: an option is unknown, or has an invalid value.
+    """
+    if config is None:
+        return engine.QuoteConfig()
+    if isinstance(config, engine.QuoteConfig):
+        return config
+    if not isinstance(config, collections.abc.Mapping):
+        raise TypeError('the quote configuration must be a QuoteConfig or a mapping, not {}'.format(
+            type(config).__name__))
+
+    values = {}
+    for option, value in config.items():
+        field = option.replace('-', '_')
+        if field not in CONFIG_VALUES:
+            raise ValueError('unknown quote option: {}'.format(option))
+        if value not in CONFIG_VALUES[field]:
+            raise ValueError('invalid value for {}: {}'.format(option, value))
+        values[field] = value
+    return engine.QuoteConfig(**values)
+
+
+def _find_strings(source, scanner):
+    """Find the strings of a source, the same way the checks find them.
+
+    Text is scanned as its UTF-8 encoding, unless it declares another
+    encoding: the declaration does not apply to text, so it is tokenized
+    as it is instead.
+
+    Args:
+        source: the source, as text or bytes.
+        scanner: how to find the strings of the source; one of
+            engine.SCANNERS.
+
+    Returns:
+        list[tuple]: the (token, row, col, is_docstring) of each string.
+
+    Raises:
+        SyntaxError: the source could not be decoded.
+        tokenize.TokenError: the source could not be tokenized.
+    """
+    if not isinstance(source, str):
+        return engine.find_strings(source, scanner)
+
+    if scanner == 'regex':
+        try:
+            content = source.encode('utf-8')
+            encoding, _ = tokenize.detect_encoding(io.BytesIO(content).readline)
+        except (UnicodeEncodeError, SyntaxError):
+            encoding = None
+        if encoding == 'utf-8':
+            try:
+                return list(_scanner.iter_strings(content))
+            except _scanner.ScanError:
+                pass
+    return list(docstrings.iter_strings(tokenize.generate_tokens(io.StringIO(source).readline)))
+
+
+def _check(source, classifier, scanner):
+    """Check a source with a compiled configuration.
+
+    Args:
+        source: the source, as text or bytes.
+        classifier: the engine.QuoteClassifier of the configuration.
+        scanner: how to find the strings of the source.
+
+    Returns:
+        list[engine.Violation]: the violations found, in token order.
+    """
+    check = classifier.check
+    violations = []
+    for token, row, col, is_docstring in _find_strings(source, scanner):
+        violation = check(token, row, col, is_docstring)
+        if violation:
+            violations.append(violation)
+    return violations
+
+
+def check_source(source, config=None, scanner='regex'):
+    """Check the strings of a source held in memory.
+
+    Args:
+        source: the module source, as text, or as bytes whose encoding is
+            detected the same way the interpreter does it.
+        config: the configuration to check against; see `make_config`.
+        scanner: how to find the strings of the source; one of
+            engine.SCANNERS. With 'regex' (default), sources the scanner
+            cannot handle are tokenized instead, so the result is the same
+            either way.
+
+    Returns:
+        list[engine.Violation]: the violations found, in token order, with
+        the same rows and columns as the plugin's messages.
+
+    Raises:
+        TypeError: the configuration is neither a QuoteConfig nor a mapping.
+        ValueError: the configuration is invalid.
+        SyntaxError: the source could not be decoded.
+        tokenize.TokenError: the source could not be tokenized.
+    """
+    return _check(source, engine.QuoteClassifier.compile(make_config(config)), scanner)
+
+
+def check_many(sources, config=None, scanner='regex'):
+    """Check the strings of many sources held in memory, one after the
+    other, against one configuration.
+
+    A source which cannot be checked does not stop the batch; its result
+    has an error instead, as for a file the runner cannot check.
+
+    Args:
+        sources: the module sources, as text or bytes (see
+            `check_source`), or as (name, source) pairs.
+        config: the configuration to check against; see `make_config`.
+            It is only compiled once, for the whole batch.
+        scanner: how to find the strings of each source; one of
+            engine.SCANNERS.
+
+    Yields:
+        runner.CheckResult: the result for each source, in the order of
+        `sources`, with the name of the source as its path, or None if it
+        has none.
+
+    Raises:
+        TypeError: the configuration is neither a QuoteConfig nor a mapping.
+        ValueError: the configuration is invalid.
+
+        Either is raised before any source is checked.
+    """
+    classifier = engine.QuoteClassifier.compile(make_config(config))
+    return _check_many(sources, classifier, scanner)
+
+
+def _check_many(sources, classifier, scanner):
+    """Check many sources with a compiled configuration; see `check_many`."""
+    for source in sources:
+        name = None
+        if isinstance(source, tuple):
+            name, source = source
+        try:
+            yield runner.CheckResult(name, _check(source, classifier, scanner))
+        except runner.CHECK_ERRORS as e:
+            yield runner.error_result(name, e)
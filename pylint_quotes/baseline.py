@@ -0,0 +1,413 @@
+"""Baseline of the violations a codebase already has.
+
+A baseline records the violations of a tree at one point in time, so that
+later checks only report the new ones -- e.g. to adopt the checks on a
+legacy codebase without fixing it first.
+
+Each violation is recorded by a fingerprint which survives the lines of
+the file moving around it: a 64-bit hash of its message id, its quote and
+the tokens of its string and of the code around the string on its own
+lines -- not its row, nor the lines before or after it. Identical strings
+in identical code are told apart by counting them, so a new copy of one is
+still reported. Suppressing a violation costs a hash of its context and a
+set lookup, before any message is added.
+
+Fingerprints are kept by file, keyed by path relative to the directory of
+the baseline file, so the baseline can be used from anywhere in the tree.
+The baseline file is a JSON object mapping each path to its fingerprints,
+packed as 8 bytes each and base64 encoded; the fingerprints of a file are
+only unpacked when that file is checked.
+"""
+
+from __future__ import absolute_import
+
+import array
+import base64
+import hashlib
+import io
+import json
+import os
+import sys
+import tokenize
+
+from pylint_quotes import engine
+
+# the version of the baseline file format, and of the fingerprints.
+FORMAT_VERSION = 1
+
+
+def _pack(fingerprints):
+    """Pack fingerprints for the baseline file.
+
+    Args:
+        fingerprints: the fingerprints, as ints.
+
+    Returns:
+        str: the sorted fingerprints, as base64 of 8 little-endian bytes each.
+    """
+    packed = array.array('Q', sorted(fingerprints))
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return base64.b64encode(packed.tobytes()).decode('ascii')
+
+
+def _unpack(text):
+    """Unpack the fingerprints of a file from the baseline file.
+
+    Args:
+        text: the fingerprints, as packed by `_pack`.
+
+    Returns:
+        frozenset: the fingerprints, as ints.
+
+    Raises:
+        ValueError: the fingerprints are not validly packed.
+    """
+    data = base64.b64decode(text, validate=True)
+    if len(data) % 8:
+        raise ValueError('truncated fingerprints')
+    packed = array.array('Q')
+    packed.frombytes(data)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return frozenset(packed)
+
+
+class Matcher:
+    """The fingerprints of the violations of a single file.
+
+    Attributes:
+        fingerprints: the fingerprints recorded for the file in the
+            baseline, to suppress.
+        suppressed: the number of violations suppressed so far.
+    """
+
+    __slots__ = ('fingerprints', 'suppressed', '_strings', '_seen')
+
+    def __init__(self, strings, fingerprints=frozenset()):
+        """Start matching the violations of a file.
+
+        Args:
+            strings: the (token, lines) of the strings of the file, keyed
+                by their (row, col): the text of each string and the source
+                lines it spans, from its first to its last, e.g. as the
+                `line` of a tokenize.TokenInfo (see `string_lines`).
+            fingerprints: the fingerprints to suppress.
+        """
+        self.fingerprints = fingerprints
+        self.suppressed = 0
+        self._strings = strings
+        # how many violations were seen with each context, for the
+        # occurrence of the next one.
+        self._seen = {}
+
+    @classmethod
+    def from_tokens(cls, tokens, fingerprints=frozenset()):
+        """Start matching the violations of a file from its tokens.
+
+        Args:
+            tokens: the tokens of the file, as from `tokenize.tokenize`.
+            fingerprints: the fingerprints to suppress.
+
+        Returns:
+            Matcher: the matcher.
+        """
+        return cls({
+            start: (token, line)
+            for tok_type, token, start, _, line in tokens
+            if tok_type == tokenize.STRING
+        }, fingerprints)
+
+    def fingerprint(self, msg_id, quote, row, col):
+        """Get the fingerprint of the next violation of the file.
+
+        The context of the violation is its string along with the code
+        around it on its first and last lines, leading and trailing
+        whitespace aside, so it is the same whichever lines it is on.
+
+        Args:
+            msg_id: the id of the message for the violation.
+            quote: the quote characters that were found.
+            row: the row the string starts on.
+            col: the column the string starts on.
+
+        Returns:
+            int: the fingerprint.
+        """
+        string = self._strings.get((row, col))
+        if string is None:
+            context = (msg_id, quote, '', '', '')
+        else:
+            token, lines = string
+            n_lines = token.count('\n')
+            lines = lines.split('\n', n_lines + 1)
+            end = col + len(token) if not n_lines else len(token) - token.rfind('\n') - 1
+            context = (msg_id, quote, lines[0][:col].lstrip(), token, lines[n_lines][end:].rstrip())
+        occurrence = self._seen.get(context, 0)
+        self._seen[context] = occurrence + 1
+
+        data = '\0'.join(context + (str(occurrence),)).encode('utf-8', 'surrogatepass')
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+    def suppress(self, msg_id, quote, row, col):
+        """Check whether the next violation of the file is in the baseline,
+        counting it as suppressed if so.
+
+        Args:
+            msg_id: the id of the message for the violation.
+            quote: the quote characters that were found.
+            row: the row the string starts on.
+            col: the column the string starts on.
+
+        Returns:
+            bool: True if the violation should not be reported.
+        """
+        if self.fingerprint(msg_id, quote, row, col) in self.fingerprints:
+            self.suppressed += 1
+            return True
+        return False
+
+
+def string_lines(content, violations, scanner='regex'):
+    """Get the strings of the violations of a file, with the lines they span.
+
+    Args:
+        content: the source of the file, as bytes or an mmap.
+        violations: the engine.Violation of the file.
+        scanner: how to find the strings of the file; one of
+            engine.SCANNERS.
+
+    Returns:
+        dict: the (token, lines) of the string of each violation, keyed by
+        (row, col); see `Matcher`.
+
+    Raises:
+        SyntaxError: the source could not be decoded.
+        tokenize.TokenError: the source could not be tokenized.
+    """
+    positions = {(v.row, v.col) for v in violations}
+    strings = [
+        string for string in engine.find_strings(content, scanner)
+        if (string[1], string[2]) in positions
+    ]
+    if not strings:
+        return {}
+
+    content = bytes(content)
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(content).readline)
+    lines = content.decode(encoding, 'replace').split('\n')
+    return {
+        (row, col): (token, '\n'.join(lines[row - 1:row + token.count('\n')]))
+        for token, row, col, _ in strings
+    }
+
+
+def filter_violations(violations, content, fingerprints, scanner='regex'):
+    """Drop the violations of a file which are in its baseline.
+
+    Args:
+        violations: the engine.Violation of the file, in token order.
+        content: the source of the file, as bytes or an mmap.
+        fingerprints: the fingerprints recorded for the file.
+        scanner: how to find the strings of the file; one of
+            engine.SCANNERS.
+
+    Returns:
+        tuple: the list of violations to report, and the number suppressed.
+
+    Raises:
+        SyntaxError: the source could not be decoded.
+        tokenize.TokenError: the source could not be tokenized.
+    """
+    matcher = Matcher(string_lines(content, violations, scanner), fingerprints)
+    kept = [v for v in violations if not matcher.suppress(v.msg_id, v.quote, v.row, v.col)]
+    return kept, matcher.suppressed
+
+
+def fingerprint_file(path, violations, scanner='regex'):
+    """Get the fingerprints of the violations of a file.
+
+    Args:
+        path: the path to the file.
+        violations: the engine.Violation of the file, in token order.
+        scanner: how to find the strings of the file; one of
+            engine.SCANNERS.
+
+    Returns:
+        list[int]: the fingerprint of each violation.
+
+    Raises:
+        OSError: the file could not be read.
+        SyntaxError: the file could not be decoded.
+        tokenize.TokenError: the file could not be tokenized.
+    """
+    if not violations:
+        return []
+    with engine.map_file(path) as content:
+        matcher = Matcher(string_lines(content, violations, scanner))
+    return [matcher.fingerprint(v.msg_id, v.quote, v.row, v.col) for v in violations]
+
+
+class Baseline:
+    """The fingerprints of the violations recorded for a tree.
+
+    Attributes:
+        root: the directory the paths of the files are relative to.
+        stamp: the (path, modification time, size) of the baseline file it
+            was loaded from, or None.
+    """
+
+    __slots__ = ('root', 'stamp', '_packed', '_files')
+
+    def __init__(self, root, packed=None, stamp=None):
+        """Start a baseline.
+
+        Args:
+            root: the directory the paths of the files are relative to.
+            packed: the packed fingerprints of each file, keyed by relative
+                path, as read from a baseline file.
+            stamp: see the attribute.
+        """
+        self.root = root
+        self.stamp = stamp
+        self._packed = packed or {}
+        self._files = {}
+
+    def __len__(self):
+        return sum(len(fingerprints) for fingerprints in self._files.values()) + sum(
+            len(text) * 3 // 4 // 8
+            for path, text in self._packed.items()
+            if path not in self._files
+        )
+
+    @staticmethod
+    def _stamp(path):
+        st = os.stat(path)
+        return os.path.abspath(path), st.st_mtime_ns, st.st_size
+
+    @classmethod
+    def load(cls, path):
+        """Load a baseline file.
+
+        Args:
+            path: the path to the baseline file. If it does not exist, the
+                baseline is empty.
+
+        Returns:
+            Baseline: the baseline.
+
+        Raises:
+            OSError: the baseline file could not be read.
+            ValueError: the file is not a baseline file of this version.
+        """
+        root = os.path.dirname(os.path.abspath(path))
+        try:
+            stamp = cls._stamp(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls(root)
+
+        if not isinstance(data, dict) or data.get('version') != FORMAT_VERSION:
+            raise ValueError('{} is not a version {} baseline file'.format(path, FORMAT_VERSION))
+        files = data.get('files')
+        if not isinstance(files, dict) or not all(isinstance(v, str) for v in files.values()):
+            raise ValueError('{} is not a version {} baseline file'.format(path, FORMAT_VERSION))
+        return cls(root, files, stamp)
+
+    def is_current(self, path):
+        """Check whether the baseline was loaded from a file which has not
+        changed since.
+
+        Args:
+            path: the path to the baseline file.
+
+        Returns:
+            bool: True if the baseline does not need loading again.
+        """
+        try:
+            return self.stamp is not None and self.stamp == self._stamp(path)
+        except OSError:
+            return False
+
+    def relpath(self, path):
+        """Get the key of a file in the baseline.
+
+        Args:
+            path: the path to the file.
+
+        Returns:
+            str: the path relative to the root, with '/' separators.
+        """
+        path = os.path.abspath(path)
+        try:
+            path = os.path.relpath(path, self.root)
+        except ValueError:
+            # on another drive.
+            pass
+        return path.replace(os.sep, '/')
+
+    def fingerprints(self, path):
+        """Get the fingerprints recorded for a file.
+
+        Args:
+            path: the path to the file.
+
+        Returns:
+            frozenset: the fingerprints, empty if none are recorded.
+
+        Raises:
+            ValueError: the fingerprints of the file are not validly packed.
+        """
+        key = self.relpath(path)
+        fingerprints = self._files.get(key)
+        if fingerprints is None:
+            text = self._packed.get(key)
+            fingerprints = self._files[key] = _unpack(text) if text else frozenset()
+        return fingerprints
+
+    def matcher(self, path, tokens):
+        """Get the matcher of the violations of a file against its baseline.
+
+        Args:
+            path: the path to the file.
+            tokens: the tokens of the file, as from `tokenize.tokenize`.
+
+        Returns:
+            Matcher: the matcher, or None if nothing is recorded for the file.
+        """
+        fingerprints = self.fingerprints(path)
+        if not fingerprints:
+            return None
+        return Matcher.from_tokens(tokens, fingerprints)
+
+    def update(self, path, fingerprints):
+        """Replace the fingerprints recorded for a file.
+
+        Args:
+            path: the path to the file.
+            fingerprints: the fingerprints of its violations; if empty, the
+                file is dropped from the baseline.
+        """
+        key = self.relpath(path)
+        self._packed.pop(key, None)
+        self._files[key] = frozenset(fingerprints)
+
+    def save(self, path):
+        """Write the baseline to a file.
+
+        Args:
+            path: the path to the baseline file.
+        """
+        files = dict(self._packed)
+        for key, fingerprints in self._files.items():
+            if fingerprints:
+                files[key] = _pack(fingerprints)
+            else:
+                files.pop(key, None)
+
+        tmp = '{}.{}.tmp'.format(path, os.getpid())
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': FORMAT_VERSION, 'files': files}, f, indent=1, sort_keys=True)
+            f.write('\n')
+        os.replace(tmp, path)
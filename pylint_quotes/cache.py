@@ -0,0 +1,175 @@
+"""On-disk cache of quote check results.
+
+Results are keyed by the content of the checked source, the quote
+configuration it was checked against and the pylint-quotes version, so a
+file which has not changed since it was last checked does not need to be
+tokenized again. Since the key is derived from the content alone, a cache
+directory can be shared between checkouts, worker processes and
+concurrent runs on the same machine.
+
+Each entry is written to a temporary file and moved into place, so readers
+only ever see complete entries. Reading an entry refreshes its modification
+time, which `ResultCache.evict` uses to drop the least recently used
+entries once the cache grows past its size limit.
+"""
+
+from __future__ import absolute_import
+
+import hashlib
+import json
+import os
+import tempfile
+
+from pylint_quotes.__version__ import __version__
+from pylint_quotes.engine import Violation
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+
+class ResultCache:
+    """A size-limited, content-addressed store of quote violations.
+
+    Attributes:
+        directory: the directory the cache entries are stored in.
+        max_size: the size, in bytes, the cache is trimmed to on eviction.
+        hits: the number of lookups which found a cached result.
+        misses: the number of lookups which did not.
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(content, config):
+        """Get the cache key for checking a source against a configuration.
+
+        Args:
+            content: the source, as bytes or an mmap.
+            config: the engine.QuoteConfig the source is checked against.
+
+        Returns:
+            str: the cache key.
+        """
+        digest = hashlib.sha256()
+        digest.update('{}\0{}\0'.format(__version__, '\0'.join(config)).encode('utf-8'))
+        digest.update(content)
+        return digest.hexdigest()
+
+    @staticmethod
+    def blob_key(sha, config):
+        """Get the cache key for checking a git blob against a configuration.
+
+        A blob id already identifies the content, so the blob does not need
+        to be read to look up its result.
+
+        Args:
+            sha: the git blob id.
+            config: the engine.QuoteConfig the blob is checked against.
+
+        Returns:
+            str: the cache key.
+        """
+        digest = hashlib.sha256()
+        text = '{}\0{}\0blob\0{}'.format(__version__, '\0'.join(config), sha)
+        digest.update(text.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key[2:] + '.json')
+
+    def get(self, key):
+        """Look up the cached violations for a key.
+
+        Args:
+            key: the cache key, from `ResultCache.key`.
+
+        Returns:
+            list[engine.Violation]: the cached violations, or None if there
+            is no usable entry for the key.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                violations = [Violation(*v) for v in json.load(f)]
+        except (OSError, ValueError, TypeError):
+            self.misses += 1
+            return None
+
+        # mark the entry as recently used, for eviction.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return violations
+
+    def put(self, key, violations):
+        """Store the violations for a key.
+
+        Failures to write are ignored; the result is simply not cached.
+
+        Args:
+            key: the cache key, from `ResultCache.key`.
+            violations: the engine.Violation list to store.
+        """
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump([list(v) for v in violations], f, separators=(',', ':'))
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError:
+            pass
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits its
+        size limit.
+
+        Entries may be removed concurrently by another process evicting the
+        same cache; those are skipped.
+
+        Returns:
+            int: the number of entries removed.
+        """
+        entries = []
+        total = 0
+        try:
+            shards = list(os.scandir(self.directory))
+        except OSError:
+            return 0
+
+        for shard in shards:
+            if not shard.is_dir():
+                continue
+            try:
+                for entry in os.scandir(shard.path):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+            except OSError:
+                continue
+
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.unlink(path)
+                removed += 1
+            except OSError:
+                pass
+            total -= size
+        return removed
@@ -5,7 +5,10 @@ from __future__ import absolute_import
 import tokenize
 
 from pylint.checkers import BaseTokenChecker
+from pylint.checkers.mapreduce_checker import MapReduceMixin
+from pylint.exceptions import EmptyReportError
 from pylint.interfaces import IAstroidChecker, ITokenChecker
+from pylint.reporters.ureports.nodes import Paragraph, Table
 
 try:
     from pylint import version as pv
@@ -13,19 +16,41 @@ except ImportError:
     # Backwards compatibility (pylint<2.8.0)
     from pylint.__pkginfo__ import version as pv
 
-pylint_version = tuple(pv.split("."))
-
-CONFIG_OPTS = ('single', 'double')
-SMART_CONFIG_OPTS = tuple('%s-avoid-escape' % c for c in CONFIG_OPTS)
-
-QUOTES = ('\'', '"')
+from pylint_quotes import docstrings, engine, usage
+from pylint_quotes.baseline import Baseline
+from pylint_quotes.cache import DEFAULT_MAX_SIZE, ResultCache
+from pylint_quotes.diff import LineRanges
+# re-exported for backward compatibility; the checks moved to engine.
+from pylint_quotes.engine import (  # noqa: F401 pylint: disable=unused-import
+    CONFIG_OPTS, MSG_IDS, MSGS, QUOTES, SINGLE_QUOTE_OPTS, SMART_CONFIG_OPTS,
+    SMART_QUOTE_OPTS, TRIPLE_QUOTE_OPTS, get_preferred_quote, get_quote)
+from pylint_quotes.module_state import ModuleState
+from pylint_quotes.profiling import QuoteProfile
+from pylint_quotes.summary import QuoteSummary, SummaryFile
+from pylint_quotes.triple_quotes import TripleQuoteRecord
 
-SINGLE_QUOTE_OPTS = dict(zip(CONFIG_OPTS, QUOTES))
-SMART_QUOTE_OPTS = dict(zip(CONFIG_OPTS + SMART_CONFIG_OPTS, QUOTES + QUOTES))
-TRIPLE_QUOTE_OPTS = dict(zip(CONFIG_OPTS, [q * 3 for q in QUOTES]))
-
-
-class StringQuoteChecker(BaseTokenChecker):
+pylint_version = tuple(pv.split("."))
+# the numeric release, so e.g. 2.11 compares greater than 2.2.
+pylint_version_info = tuple(
+    int(''.join(c for c in part if c.isdigit()) or 0) for part in pylint_version[:3]
+)
+
+DOCSTRING_DETECTION_OPTS = ('tokens', 'ast')
+
+# the message added for a module instead of its quote messages, with
+# `quote-summary` enabled.
+SUMMARY_MSGS = {
+    'C4004': (
+        'Quote violations: %s',
+        'quote-violations-summary',
+        'Used with `quote-summary` enabled, once for each module with quote '
+        'violations, instead of a message for each: counts the violations of '
+        'each quote message, and gives the location of the first one.'
+    ),
+}
+
+
+class StringQuoteChecker(BaseTokenChecker, MapReduceMixin):
     """Pylint checker for the consistent use of characters in strings.
 
     This checker will check for quote consistency among string literals,
@@ -36,32 +61,17 @@ class StringQuoteChecker(BaseTokenChecker):
     Additionally string literals can enforce avoiding escaping chars, e.g.
     enforcing single quotes (') most of the time, except if the string itself
     contains a single quote, then enforce double quotes (").
+
+    With `--jobs`, each worker process checks files with its own checker,
+    whose per-run totals (see `get_map_data`) are merged into the checker of
+    the main process, so the reports are the same as for a serial run.
     """
 
     __implements__ = (ITokenChecker, IAstroidChecker, )
 
     name = 'string_quotes'
 
-    msgs = {
-        'C4001': (
-            'Invalid string quote %s, should be %s',
-            'invalid-string-quote',
-            'Used when the string quote character does not match the '
-            'value configured in the `string-quote` option.'
-        ),
-        'C4002': (
-            'Invalid triple quote %s, should be %s',
-            'invalid-triple-quote',
-            'Used when the triple quote characters do not match the '
-            'value configured in the `triple-quote` option.'
-        ),
-        'C4003': (
-            'Invalid docstring quote %s, should be %s',
-            'invalid-docstring-quote',
-            'Used when the docstring quote characters do not match the '
-            'value configured in the `docstring-quote` option.'
-        )
-    }
+    msgs = dict(MSGS, **SUMMARY_MSGS)
 
     options = (
         (
@@ -93,17 +103,362 @@ class StringQuoteChecker(BaseTokenChecker):
                 choices=CONFIG_OPTS,
                 help='The quote character for triple-quoted docstrings.'
             )
+        ),
+        (
+            'docstring-detection',
+            dict(
+                type='choice',
+                metavar='<{0} or {1}>'.format(*DOCSTRING_DETECTION_OPTS),
+                default=DOCSTRING_DETECTION_OPTS[0],
+                choices=DOCSTRING_DETECTION_OPTS,
+                help='How docstrings are told apart from other triple-quoted '
+                     'strings: from the token stream as it is processed '
+                     '(tokens), or by matching against the docstrings of the '
+                     'module, class and function nodes (ast).'
+            )
+        ),
+        (
+            'quote-cache-dir',
+            dict(
+                type='string',
+                metavar='<directory>',
+                default='',
+                help='A directory to cache quote check results in, keyed by '
+                     'file content and quote configuration, so unchanged files '
+                     'are not checked again. Only used with '
+                     '`docstring-detection=tokens`. Disabled when empty.'
+            )
+        ),
+        (
+            'quote-cache-size',
+            dict(
+                type='int',
+                metavar='<megabytes>',
+                default=DEFAULT_MAX_SIZE // (1024 * 1024),
+                help='The size the quote result cache is trimmed to at the end '
+                     'of a run, least recently used entries first.'
+            )
+        ),
+        (
+            'quote-profile',
+            dict(
+                type='yn',
+                metavar='<y or n>',
+                default=False,
+                help='Time the phases of the quote checks and count the strings '
+                     'they see, for the linter stats and the quote profile '
+                     'report.'
+            )
+        ),
+        (
+            'quote-usage',
+            dict(
+                type='yn',
+                metavar='<y or n>',
+                default=False,
+                help='Count the quotes the strings of each module use, and the '
+                     'violations each quote configuration would report, for '
+                     'the quote usage report.'
+            )
+        ),
+        (
+            'quote-summary',
+            dict(
+                type='yn',
+                metavar='<y or n>',
+                default=False,
+                help='Add a single quote-violations-summary message for each '
+                     'module, with the number of violations of each quote '
+                     'message and where the first one is, rather than a '
+                     'message for each violation.'
+            )
+        ),
+        (
+            'quote-summary-file',
+            dict(
+                type='string',
+                metavar='<file>',
+                default='',
+                help='With `quote-summary`, a file to write every quote '
+                     'violation to, as a JSON object per line. Disabled when '
+                     'empty.'
+            )
+        ),
+        (
+            'quote-baseline',
+            dict(
+                type='string',
+                metavar='<file>',
+                default='',
+                help='A baseline file of the quote violations a codebase already '
+                     'has, which are not reported, e.g. as written by '
+                     '`pylint-quotes check --update-baseline`. Disabled when '
+                     'empty.'
+            )
         )
     )
 
     # we need to check quote usage via tokenization, as the AST walk will
-    # only tell us what the doc is, but not how it is quoted. we need to
-    # store any triple quotes found during tokenization and check against
-    # these when performing the walk. if a triple-quote string matches to
-    # a node's docstring, it is checked and removed from this collection.
+    # only tell us what the doc is, but not how it is quoted. by default,
+    # docstrings are found from the token stream itself, so every string is
+    # checked as soon as it is tokenized. with `docstring-detection=ast`, we
+    # instead store any triple quotes found during tokenization and check
+    # against these when performing the walk. if a triple-quote string matches
+    # to a node's docstring, it is checked and removed from this collection.
     # once we leave the module, any remaining triple quotes in this collection
-    # are checked as regular triple quote strings.
-    _tokenized_triple_quotes = {}
+    # are checked as regular triple quote strings. the collection is part of
+    # the ModuleState of the module being checked.
+
+    def __init__(self, linter=None):
+        super().__init__(linter)
+        self._module = ModuleState()
+
+        # the quote checks compiled for the configuration of the run.
+        self._classifier = engine.QuoteClassifier.compile(self._quote_config())
+
+        # the result cache for the run, if `quote-cache-dir` is set.
+        self._cache = None
+
+        # the profile of the run, if `quote-profile` is set.
+        self._profile = None
+
+        # the usage.QuoteUsage of the run, if `quote-usage` is set.
+        self._usage = None
+
+        # the baseline of the run, if `quote-baseline` is set.
+        self._baseline = None
+
+        # the summary.SummaryFile of the run, if `quote-summary-file` is set.
+        self._summary = None
+
+    @property
+    def reports(self):
+        """The reports of this checker, as pylint registers them."""
+        return (
+            ('RP4001', 'Quote result cache', self._report_cache),
+            ('RP4002', 'Quote checker profile', self._report_profile),
+            ('RP4003', 'Quote usage', self._report_usage),
+        )
+
+    def open(self):
+        """Start this checker's run, compiling the quote checks for its
+        configuration.
+        """
+        self._module = ModuleState()
+        self._classifier = engine.QuoteClassifier.compile(self._quote_config())
+
+        self._cache = None
+        if self.config.quote_cache_dir:
+            self._cache = ResultCache(
+                self.config.quote_cache_dir,
+                self.config.quote_cache_size * 1024 * 1024,
+            )
+
+        self._profile = None
+        QuoteProfile.restore(self)
+        if self.config.quote_profile:
+            self._profile = QuoteProfile()
+            self._profile.instrument(self)
+
+        self._usage = usage.QuoteUsage() if self.config.quote_usage else None
+
+        # the checker of a worker process is opened for every file, so the
+        # baseline is only loaded again if its file changed.
+        path = self.config.quote_baseline
+        if not path:
+            self._baseline = None
+        elif self._baseline is None or not self._baseline.is_current(path):
+            self._baseline = Baseline.load(path)
+
+        # likewise, a worker process keeps appending to its part of the
+        # summary file.
+        path = self.config.quote_summary_file if self.config.quote_summary else ''
+        if not path:
+            self._summary = None
+        else:
+            if self._summary is None or self._summary.path != path:
+                self._summary = SummaryFile(path)
+            self._summary.open(self._is_parallel())
+
+    def close(self):
+        """Trim the result cache, if there is one, and record the profile,
+        if any, at the end of the run.
+
+        In a parallel run, the checker of each worker process is closed
+        after every file, so the cache is only trimmed once, by the main
+        process, when the totals of the workers are merged.
+        """
+        if self._cache is not None and not self._is_parallel():
+            self._cache.evict()
+        if self._summary is not None:
+            self._summary.close()
+        stats = getattr(self.linter, 'stats', None)
+        if self._profile is not None and isinstance(stats, dict):
+            self._profile.record(stats)
+
+    def _is_parallel(self):
+        """Check whether the run is spread over worker processes."""
+        jobs = getattr(getattr(self.linter, 'config', None), 'jobs', 1)
+        return jobs is not None and jobs != 1
+
+    def get_map_data(self):
+        """Get the totals of this checker, for merging those of parallel
+        runs (see `reduce_map_data`).
+
+        Returns:
+            dict: the 'cache' hit and miss counts, or None if no cache is
+            used, the QuoteProfile as 'profile', or None if the checks are
+            not profiled, the usage.QuoteUsage as 'usage', or None if quote
+            usage is not counted, and the path of the part of the summary
+            file written by this process as 'summary_part', or None.
+        """
+        return {
+            'cache': (self._cache.hits, self._cache.misses) if self._cache is not None else None,
+            'profile': self._profile,
+            'usage': self._usage,
+            'summary_part': self._summary.part if self._summary is not None else None,
+        }
+
+    @classmethod
+    def reduce_map_data(cls, linter, data):
+        """Merge the totals of the checkers of a parallel run into the
+        checker of the main process, trim the result cache, and join the
+        parts of the summary file.
+
+        Args:
+            linter: the linter of the main process.
+            data: the `get_map_data` of the checker for each file checked by
+                a worker process.
+        """
+        # the checker is an instance of this class, so its state is ours.
+        # pylint: disable=protected-access
+        checker = next(c for c in linter.get_checkers() if isinstance(c, cls))
+
+        counts = [item['cache'] for item in data if item['cache'] is not None]
+        if counts:
+            if checker._cache is None:
+                checker._cache = ResultCache(
+                    checker.config.quote_cache_dir,
+                    checker.config.quote_cache_size * 1024 * 1024,
+                )
+            for hits, misses in counts:
+                checker._cache.hits += hits
+                checker._cache.misses += misses
+            checker._cache.evict()
+
+        profiles = [item['profile'] for item in data if item['profile'] is not None]
+        if profiles:
+            if checker._profile is None:
+                checker._profile = QuoteProfile()
+            for profile in profiles:
+                checker._profile.merge(profile)
+
+        usages = [item['usage'] for item in data if item.get('usage') is not None]
+        if usages:
+            if checker._usage is None:
+                checker._usage = usage.QuoteUsage()
+            for counts in usages:
+                checker._usage.add(counts)
+
+        parts = sorted({item['summary_part'] for item in data if item.get('summary_part')})
+        if parts:
+            SummaryFile.join(checker.config.quote_summary_file, parts)
+
+    # the arguments are those pylint passes to every report.
+    def _report_cache(self, sect, stats, old_stats):  # pylint: disable=unused-argument
+        """Report the hits and misses of the result cache for the run.
+
+        Args:
+            sect: the report section to add to.
+            stats: the linter stats for this run.
+            old_stats: the linter stats from the previous run.
+        """
+        if self._cache is None:
+            raise EmptyReportError()
+
+        sect.append(Table(
+            children=[
+                'lookups', 'number',
+                'hits', str(self._cache.hits),
+                'misses', str(self._cache.misses),
+            ],
+            cols=2,
+            rheaders=1,
+        ))
+
+    def _report_profile(self, sect, stats, old_stats):
+        """Report the timings and counters of the checker for the run, and
+        the modules which took the longest.
+
+        Args:
+            sect: the report section to add to.
+            stats: the linter stats for this run.
+            old_stats: the linter stats from the previous run.
+        """
+        profile = QuoteProfile.from_stats(stats)
+        if profile is None:
+            # the linter stats cannot hold the profile (pylint>=2.12).
+            profile, old_stats = self._profile, None
+        if profile is None:
+            raise EmptyReportError()
+
+        old_profile = QuoteProfile.from_stats(old_stats)
+        old_values = old_profile.values() if old_profile else [None] * len(QuoteProfile.stat_keys())
+        lines = []
+        for key, new, old in zip(QuoteProfile.stat_keys(), profile.values(), old_values):
+            number = '{:.3f}' if isinstance(new, float) else '{}'
+            lines += [key.replace('_', ' '), number.format(new)]
+            if old is None:
+                lines += ['NC', 'NC']
+            else:
+                difference = '{:+.3f}' if isinstance(new, float) else '{:+d}'
+                lines += [number.format(old), difference.format(new - old)]
+        sect.append(Table(
+            children=['type', 'number', 'previous', 'difference'] + lines,
+            cols=4,
+            rheaders=1,
+        ))
+
+        slowest = profile.slowest()
+        if slowest:
+            sect.append(Paragraph(('slowest modules:',)))
+            children = ['module', 'time']
+            for name, elapsed in slowest:
+                children += [name, '{:.3f}'.format(elapsed)]
+            sect.append(Table(children=children, cols=2, rheaders=1))
+
+    def _report_usage(self, sect, stats, old_stats):  # pylint: disable=unused-argument
+        """Report the quotes used by the strings of the modules of the run,
+        and the configuration which would report the fewest violations.
+
+        Args:
+            sect: the report section to add to.
+            stats: the linter stats for this run.
+            old_stats: the linter stats from the previous run.
+        """
+        counts = self._usage
+        if counts is None:
+            raise EmptyReportError()
+
+        children = ['strings', 'number', 'modules', str(counts.files)]
+        for quote in QUOTES:
+            children += ['{} strings'.format(quote), str(counts.strings[quote])]
+        children += ['avoiding escapes', str(counts.escapes)]
+        for kind, quotes in (('triple quoted', counts.triples), ('docstrings', counts.docstrings)):
+            for quote in TRIPLE_QUOTE_OPTS.values():
+                children += ['{} {}'.format(quote, kind), str(quotes[quote])]
+        sect.append(Table(children=children, cols=2, rheaders=1))
+
+        children = ['option', 'value', 'violations']
+        for option, values in usage.OPTIONS:
+            for value in values:
+                children += [option, value, str(counts.violations[option][value])]
+        sect.append(Table(children=children, cols=3, rheaders=1))
+
+        recommended = counts.recommend()
+        sect.append(Paragraph(('fewest violations: {}'.format(', '.join(
+            '{}={}'.format(option, value) for (option, _), value in zip(usage.OPTIONS, recommended)
+        )),)))
 
     def visit_module(self, node):
         """Visit module and check for docstring quote consistency.
@@ -114,18 +469,44 @@ class StringQuoteChecker(BaseTokenChecker):
         self._process_for_docstring(node, 'module')
 
     # pylint: disable=unused-argument
-    def leave_module(self, node):
+    # the profiler wraps this method on the instance, see QuoteProfile.instrument.
+    def leave_module(self, node):  # pylint: disable=method-hidden
         """Leave module and check remaining triple quotes.
 
         Args:
             node: the module node we are leaving.
         """
-        for triple_quote in self._tokenized_triple_quotes.values():
+        for triple_quote in self._module.triple_quotes.values():
             self._check_triple_quotes(triple_quote)
 
-        # after we are done checking these, clear out the triple-quote
-        # tracking collection so nothing is left over for the next module.
-        self._tokenized_triple_quotes = {}
+        summary = self._module.summary
+        if summary is not None and summary.counts:
+            self._add_summary(summary, node)
+
+        # after we are done checking these, drop the module state so
+        # nothing is left over for the next module.
+        self._module = ModuleState()
+
+    def _add_summary(self, summary, node):
+        """Add the summary message of the module being left, and write its
+        violations to the summary file, if there is one.
+
+        Args:
+            summary: the QuoteSummary of the module.
+            node: the module node, or None.
+        """
+        row, col = summary.location()
+        self.add_message(
+            'quote-violations-summary',
+            line=row,
+            args=(summary.describe(),),
+            **self.get_offset(col)
+        )
+        if self._summary is not None:
+            self._summary.write(summary.json_lines(
+                getattr(self.linter, 'current_file', None),
+                getattr(self.linter, 'current_name', None) or getattr(node, 'name', None),
+            ))
 
     def visit_classdef(self, node):
         """Visit class and check for docstring quote consistency.
@@ -158,12 +539,19 @@ class StringQuoteChecker(BaseTokenChecker):
             node: the AST node being visited.
             node_type: the type of node being operated on.
         """
+        # docstrings were already checked from the token stream.
+        if self.config.docstring_detection != 'ast':
+            return
+
+        # nothing was tracked if no triple quotes are checked.
+        if not self._module.triple_quotes:
+            return
+
         # if there is no docstring, don't need to do anything.
         if node.doc is not None:
 
-            # the module is everything, so to find the docstring, we
-            # iterate line by line from the start until the first element
-            # to find the docstring, as it cannot appear after the first
+            # the module is everything, so the docstring is the first
+            # tracked triple quote, as it cannot appear after the first
             # element in the body.
             if node_type == 'module':
 
@@ -172,23 +560,17 @@ class StringQuoteChecker(BaseTokenChecker):
                 if not node.body:
                     # in this case, we should only have the module docstring
                     # parsed in the node, so the only record in the
-                    # self._tokenized_triple_quotes dict will correspond to
-                    # the module comment. this can vary by index depending
+                    # self._module.triple_quotes index will correspond to
+                    # the module comment. this can vary by row depending
                     # on the presence of a shebang, encoding, etc at the top
                     # of the file.
-                    for key in list(self._tokenized_triple_quotes.keys()):
-                        quote_record = self._tokenized_triple_quotes.get(key)
-                        if quote_record:
-                            self._check_docstring_quotes(quote_record)
-                            del self._tokenized_triple_quotes[key]
+                    for quote_record in self._module.triple_quotes.values():
+                        self._check_docstring_quotes(quote_record)
+                        self._module.triple_quotes.pop(quote_record.row)
 
                 else:
-                    for i in range(0, node.body[0].lineno):
-                        quote_record = self._tokenized_triple_quotes.get(i)
-                        if quote_record:
-                            self._check_docstring_quotes(quote_record)
-                            del self._tokenized_triple_quotes[i]
-                            break
+                    doc_row = self._module.triple_quotes.first_row(0, node.body[0].lineno - 1)
+                    self._check_docstring_row(doc_row)
 
             else:
                 # the node has a docstring so we check the tokenized triple
@@ -199,18 +581,24 @@ class StringQuoteChecker(BaseTokenChecker):
                     # if there is no body to the class, the class def only
                     # contains the docstring, so the only quotes we are
                     # tracking should correspond to the class docstring.
-                    lineno = self._find_docstring_line_for_no_body(node.fromlineno)
-                    quote_record = self._tokenized_triple_quotes.get(lineno)
-                    if quote_record:
-                        self._check_docstring_quotes(quote_record)
-                        del self._tokenized_triple_quotes[lineno]
-
+                    doc_row = self._find_docstring_line_for_no_body(node.fromlineno)
                 else:
                     doc_row = self._find_docstring_line(node.fromlineno, node.tolineno)
-                    quote_record = self._tokenized_triple_quotes.get(doc_row)
-                    if quote_record:
-                        self._check_docstring_quotes(quote_record)
-                        del self._tokenized_triple_quotes[doc_row]
+                self._check_docstring_row(doc_row)
+
+    def _check_docstring_row(self, row):
+        """Check the triple quote tracked on the given row as a docstring.
+
+        The record is no longer tracked afterwards, so it will not be checked
+        again as a regular triple quote when leaving the module.
+
+        Args:
+            row: the row of the docstring, or None if it was not found.
+        """
+        if row is not None:
+            quote_record = self._module.triple_quotes.pop(row)
+            if quote_record:
+                self._check_docstring_quotes(quote_record)
 
     def _find_docstring_line_for_no_body(self, start):
         """Find the docstring associated with a definition with no body
@@ -226,12 +614,7 @@ class StringQuoteChecker(BaseTokenChecker):
         Returns:
             int: the row number where the docstring is found.
         """
-        tracked = sorted(list(self._tokenized_triple_quotes.keys()))
-
-        for i in tracked:
-            if min(start, i) == start:
-                return i
-        return None
+        return self._module.triple_quotes.first_row(start)
 
     def _find_docstring_line(self, start, end):
         """Find the row where a docstring starts in a function or class.
@@ -246,10 +629,7 @@ class StringQuoteChecker(BaseTokenChecker):
         Returns:
             int: the row number where the docstring is found.
         """
-        for i in range(start, end + 1):
-            if i in self._tokenized_triple_quotes:
-                return i
-        return None
+        return self._module.triple_quotes.first_row(start, end)
 
     def process_tokens(self, tokens):
         """Process the token stream.
@@ -259,13 +639,202 @@ class StringQuoteChecker(BaseTokenChecker):
         Args:
             tokens: the tokens from the token stream to process.
         """
-        for tok_type, token, (start_row, start_col), _, _ in tokens:
-            if tok_type == tokenize.STRING:
-                # 'token' is the whole un-parsed token; we can look at the start
-                # of it to see whether it's a raw or unicode string etc.
-                self._process_string_token(token, start_row, start_col)
+        # the tokens are the first thing seen of a module.
+        self._module = self._start_module()
+
+        if self._usage is not None:
+            self._usage.add(usage.count_strings(docstrings.iter_strings(tokens)))
+
+        # nothing to do if every message is disabled for the module.
+        if len(self._module.skipped) == len(MSGS):
+            return
+
+        if self.config.quote_summary:
+            self._module.summary = QuoteSummary(keep_violations=self._summary is not None)
+
+        if self._baseline is not None:
+            path = getattr(self.linter, 'current_file', None)
+            if path:
+                self._module.baseline = self._baseline.matcher(path, tokens)
+
+        if self.config.docstring_detection == 'ast':
+            for tok_type, token, (start_row, start_col), _, _ in tokens:
+                if tok_type == tokenize.STRING:
+                    # 'token' is the whole un-parsed token; we can look at the start
+                    # of it to see whether it's a raw or unicode string etc.
+                    self._process_string_token(token, start_row, start_col)
+            return
+
+        cache_key = self._cache_key()
+        if cache_key is not None:
+            violations = self._cache.get(cache_key)
+            if violations is None:
+                violations = list(engine.check_tokens(tokens, self._quote_config()))
+                self._cache.put(cache_key, violations)
+            for violation in violations:
+                self._add_violation(violation)
+            return
+
+        for token, start_row, start_col, is_docstring in docstrings.iter_strings(tokens):
+            self._process_string_token(token, start_row, start_col, is_docstring)
+
+    def _start_module(self):
+        """Start the state of a new module, with the messages disabled for it.
+
+        Whether each message is enabled is asked of the linter once per
+        module, so strings are not classified for nothing: a message disabled
+        for the whole module (in the configuration, or with a module level
+        pragma) is not checked at all, and one disabled by pragmas for part
+        of the module is not checked on those lines.
+
+        Returns:
+            ModuleState: the state for the module.
+        """
+        is_enabled = self.linter.is_message_enabled
+
+        # the lines pragmas disable messages on, once the linter has read
+        # them from the module. pylint records when a pragma suppresses a
+        # message, to report it with `useless-suppression` if it never did,
+        # so messages are only skipped by line if that report is off.
+        file_state = getattr(self.linter, 'file_state', None)
+        msgs_state = getattr(file_state, '_module_msgs_state', None) or {}
+        if msgs_state and is_enabled('useless-suppression'):
+            msgs_state = {}
+        max_line = None
+        if msgs_state and hasattr(file_state, 'get_effective_max_line_number'):
+            max_line = file_state.get_effective_max_line_number()
+
+        skipped = set()
+        disabled_lines = {}
+        for msg_id, (_, symbol, _) in MSGS.items():
+            if not is_enabled(msg_id):
+                skipped.add(symbol)
+                continue
+
+            lines = LineRanges(
+                row for row, enabled in msgs_state.get(msg_id, {}).items() if not enabled
+            )
+            if not lines:
+                continue
+            if max_line and lines.ranges[0][0] <= 1 and lines.ranges[0][1] >= max_line:
+                skipped.add(symbol)
+            else:
+                disabled_lines[symbol] = lines
+
+        return ModuleState(frozenset(skipped), disabled_lines)
+
+    def _quote_config(self):
+        """Get the quote options of the checker as an engine.QuoteConfig."""
+        return engine.QuoteConfig(
+            self.config.string_quote,
+            self.config.triple_quote,
+            self.config.docstring_quote,
+        )
+
+    def _cache_key(self):
+        """Get the result cache key for the module being checked.
+
+        Returns:
+            str: the cache key, or None if the result should not be cached.
+        """
+        if self._cache is None:
+            return None
+
+        # the module source has to be the file on disk to key the cache by it.
+        path = getattr(self.linter, 'current_file', None)
+        from_stdin = getattr(getattr(self.linter, 'config', None), 'from_stdin', False)
+        if not path or from_stdin:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return self._cache.key(f.read(), self._quote_config())
+        except OSError:
+            return None
+
+    def _add_violation(self, violation):
+        """Add a message for a violation found by the engine.
+
+        Args:
+            violation: the engine.Violation to add a message for.
+        """
+        self._add_quote_message(
+            violation.symbol, violation.row, violation.col,
+            violation.quote, violation.correct_quote,
+        )
+
+    # the arguments are the fields of an engine.Violation.
+    def _add_quote_message(  # pylint: disable=too-many-arguments
+            self, symbol, row, col, quote, correct_quote):
+        """Add a message for a violation, unless it is in the baseline, or
+        only counted for the summary of the module.
+
+        Args:
+            symbol: the symbol of the message.
+            row: the row the string starts on.
+            col: the column the string starts on.
+            quote: the quote characters that were found.
+            correct_quote: the quote characters that are required.
+        """
+        if self._is_baselined(symbol, quote, row, col):
+            return
+        summary = self._module.summary
+        if summary is not None:
+            if self._is_suppressed(symbol, row):
+                return
+            summary.add(symbol, row, col, quote, correct_quote)
+            return
+        self.add_message(
+            symbol,
+            line=row,
+            args=(quote, correct_quote),
+            **self.get_offset(col)
+        )
+
+    def _is_suppressed(self, symbol, row):
+        """Check whether a message is disabled on a row, as pylint does
+        before adding a message, for a violation only counted in the summary
+        of the module.
+
+        The suppression is recorded with the linter as pylint records it,
+        so the pragma is not reported by `useless-suppression`.
+
+        Args:
+            symbol: the symbol of the message for the violation.
+            row: the row the string starts on.
+
+        Returns:
+            bool: True if the message is disabled on the row.
+        """
+        linter = self.linter
+        msg_id = MSG_IDS[symbol]
+        if linter.is_message_enabled(msg_id, row):
+            return False
+
+        file_state = getattr(linter, 'file_state', None)
+        if file_state is not None and hasattr(linter, 'get_message_state_scope'):
+            # the node, args and confidence are only taken before 2.13.
+            extra = (None, None, None) if pylint_version_info < (2, 13) else ()
+            scope = linter.get_message_state_scope(msg_id, row)
+            file_state.handle_ignored_message(scope, msg_id, row, *extra)
+        return True
+
+    def _is_baselined(self, symbol, quote, row, col):
+        """Check whether a violation is recorded in the baseline, so no
+        message should be added for it.
+
+        Args:
+            symbol: the symbol of the message for the violation.
+            quote: the quote characters that were found.
+            row: the row the string starts on.
+            col: the column the string starts on.
 
-    def _process_string_token(self, token, start_row, start_col):
+        Returns:
+            bool: True if the violation is in the baseline.
+        """
+        matcher = self._module.baseline
+        return matcher is not None and matcher.suppress(engine.MSG_IDS[symbol], quote, row, col)
+
+    def _process_string_token(self, token, start_row, start_col, is_docstring=None):
         """Internal method for identifying and checking string tokens
         from the token stream.
 
@@ -273,34 +842,52 @@ class StringQuoteChecker(BaseTokenChecker):
             token: the token to check.
             start_row: the line on which the token was found.
             start_col: the column on which the token was found.
+            is_docstring: whether the token is a docstring. If None (default),
+                it is not known yet, so triple quotes are tracked until the
+                AST walk matches them to docstrings.
         """
-        for i, char in enumerate(token):
-            if char in QUOTES:
-                break
+        classifier = self._classifier
+        module = self._module
+
+        if is_docstring is not None:
+            if module.restricted:
+                _, quote = classifier.opening(token)
+                if len(quote) == 1:
+                    symbol = 'invalid-string-quote'
+                else:
+                    symbol = 'invalid-docstring-quote' if is_docstring else 'invalid-triple-quote'
+                if module.is_disabled(symbol, start_row):
+                    return
+
+            violation = classifier.check(token, start_row, start_col, is_docstring)
+            if violation:
+                self._add_violation(violation)
+            return
 
-        # pylint: disable=undefined-loop-variable
-        # ignore prefix markers like u, b, r
-        norm_quote = token[i:]
+        start, quote = classifier.opening(token)
 
         # triple-quote strings
-        if len(norm_quote) >= 3 and norm_quote[:3] in TRIPLE_QUOTE_OPTS.values():
-            self._tokenized_triple_quotes[start_row] = (token, norm_quote[:3], start_row, start_col)
+        if len(quote) == 3:
+            # a triple quote is only known to be a docstring or not after the
+            # AST walk, so it is tracked unless neither check can apply. they
+            # still need tracking when only disabled on some lines, so the
+            # walk does not mistake a later triple quote for the docstring.
+            if ('invalid-triple-quote' in module.skipped
+                    and 'invalid-docstring-quote' in module.skipped):
+                return
+            module.triple_quotes.add(start_row, TripleQuoteRecord(quote, start_row, start_col))
             return
 
         # single quote strings
 
-        preferred_quote = SMART_QUOTE_OPTS.get(self.config.string_quote)
+        if module.restricted and module.is_disabled('invalid-string-quote', start_row):
+            return
 
-        # Smart case.
-        if self.config.string_quote in SMART_CONFIG_OPTS:
-            other_quote = next(q for q in QUOTES if q != preferred_quote)
-            # If using the other quote avoids escaping, we switch to the other quote.
-            if preferred_quote in token[i + 1:-1] and other_quote not in token[i + 1:-1]:
-                preferred_quote = other_quote
+        preferred_quote = classifier.preferred(token, start)
 
-        if norm_quote[0] != preferred_quote:
+        if quote != preferred_quote:
             self._invalid_string_quote(
-                quote=norm_quote[0],
+                quote=quote,
                 row=start_row,
                 correct_quote=preferred_quote,
                 col=start_col,
@@ -310,23 +897,23 @@ class StringQuoteChecker(BaseTokenChecker):
         """Check if the triple quote from tokenization is valid.
 
         Args:
-            quote_record: a tuple containing the info about the string
-                from tokenization, giving the (token, quote, row number, column).
+            quote_record: the TripleQuoteRecord of the string.
         """
-        _, triple, row, col = quote_record
-        if triple != TRIPLE_QUOTE_OPTS.get(self.config.triple_quote):
-            self._invalid_triple_quote(triple, row, col)
+        if self._module.is_disabled('invalid-triple-quote', quote_record.row):
+            return
+        if quote_record.quote != self._classifier.triple_quote:
+            self._invalid_triple_quote(quote_record.quote, quote_record.row, quote_record.col)
 
     def _check_docstring_quotes(self, quote_record):
         """Check if the docstring quote from tokenization is valid.
 
         Args:
-            quote_record: a tuple containing the info about the string
-                from tokenization, giving the (token, quote, row number).
+            quote_record: the TripleQuoteRecord of the string.
         """
-        _, triple, row, col = quote_record
-        if triple != TRIPLE_QUOTE_OPTS.get(self.config.docstring_quote):
-            self._invalid_docstring_quote(triple, row, col)
+        if self._module.is_disabled('invalid-docstring-quote', quote_record.row):
+            return
+        if quote_record.quote != self._classifier.docstring_quote:
+            self._invalid_docstring_quote(quote_record.quote, quote_record.row, quote_record.col)
 
     def _invalid_string_quote(self, quote, row, correct_quote=None, col=None):
         """Add a message for an invalid string literal quote.
@@ -341,12 +928,7 @@ class StringQuoteChecker(BaseTokenChecker):
         if not correct_quote:
             correct_quote = SMART_QUOTE_OPTS.get(self.config.string_quote)
 
-        self.add_message(
-            'invalid-string-quote',
-            line=row,
-            args=(quote, correct_quote),
-            **self.get_offset(col)
-        )
+        self._add_quote_message('invalid-string-quote', row, col, quote, correct_quote)
 
     @staticmethod
     def get_offset(col):
@@ -364,7 +946,7 @@ class StringQuoteChecker(BaseTokenChecker):
         Returns:
             dict: Keyword arguments to pass to add_message
         """
-        if ('2', '2', '2') < pylint_version:
+        if (2, 2, 2) < pylint_version_info:
             return {'col_offset': col}
         return {}
 
@@ -376,11 +958,9 @@ class StringQuoteChecker(BaseTokenChecker):
             row: The row number the quote characters were found on.
             col: The column the quote characters were found on.
         """
-        self.add_message(
-            'invalid-triple-quote',
-            line=row,
-            args=(quote, TRIPLE_QUOTE_OPTS.get(self.config.triple_quote)),
-            **self.get_offset(col)
+        self._add_quote_message(
+            'invalid-triple-quote', row, col, quote,
+            TRIPLE_QUOTE_OPTS.get(self.config.triple_quote),
         )
 
     def _invalid_docstring_quote(self, quote, row, col=None):
@@ -391,9 +971,7 @@ class StringQuoteChecker(BaseTokenChecker):
             row: The row number the quote characters were found on.
             col: The column the quote characters were found on.
         """
-        self.add_message(
-            'invalid-docstring-quote',
-            line=row,
-            args=(quote, TRIPLE_QUOTE_OPTS.get(self.config.docstring_quote)),
-            **self.get_offset(col)
+        self._add_quote_message(
+            'invalid-docstring-quote', row, col, quote,
+            TRIPLE_QUOTE_OPTS.get(self.config.docstring_quote),
         )
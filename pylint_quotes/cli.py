@@ -0,0 +1,627 @@
+"""Standalone command line interface for pylint-quotes.
+
+This runs the same quote checks as the pylint plugin directly on the
+token stream of each file, without starting pylint or parsing the files
+with astroid, and prints the results in pylint's default message format:
+
+    pylint-quotes check [options] PATH...
+
+The exit status follows pylint's: a bit-or of 1 for fatal messages, 2 for
+errors and 16 for convention messages (which all quote messages are).
+
+Files can be checked by a pool of worker processes with `--jobs`; see
+`pylint_quotes.runner`. With `--diff`, only the lines changed in a git
+revision range or a unified diff are checked; see `pylint_quotes.diff`.
+With `--staged`, the content staged in the git index is checked instead of
+the working tree, e.g. from a pre-commit hook; see `pylint_quotes.staged`.
+With `--fix`, the strings with invalid quotes are rewritten; see
+`pylint_quotes.fix`. With `--baseline`, the violations recorded in a
+baseline file are not reported, and `--update-baseline` records them; see
+`pylint_quotes.baseline`. With `--output-format jsonl` or `sarif`, the
+messages are streamed as JSON lines or a SARIF log instead; see
+`pylint_quotes.report`.
+
+    pylint-quotes migrate [options] PATH...
+
+rewrites the strings of a whole tree to the configured quotes with a pool
+of worker processes, recording its progress in a journal so an
+interrupted run can be resumed; see `pylint_quotes.migrate`.
+
+    pylint-quotes stats [options] PATH...
+
+counts the quotes a tree already uses, and recommends the configuration
+which would report the fewest violations; see `pylint_quotes.usage`.
+
+    pylint-quotes serve [--socket PATH] [options]
+
+answers the JSON-RPC requests of an editor over stdin/stdout or a Unix
+socket, rescanning only what changed in each file it is sent; see
+`pylint_quotes.daemon`.
+"""
+
+from __future__ import absolute_import
+
+import argparse
+import configparser
+import subprocess
+import sys
+
+from pylint_quotes import baseline as quote_baseline
+from pylint_quotes import cache as result_cache
+from pylint_quotes import (daemon, diff, engine, fix, migrate, report, runner,
+                           staged, usage)
+
+DEFAULT_JOURNAL = '.pylint-quotes-journal'
+
+CONFIG_OPTIONS = (
+    ('string-quote', engine.CONFIG_OPTS + engine.SMART_CONFIG_OPTS),
+    ('triple-quote', engine.CONFIG_OPTS),
+    ('docstring-quote', engine.CONFIG_OPTS),
+)
+
+
+def load_config(args):
+    """Get the quote configuration for a run.
+
+    Options given on the command line take precedence over those found in
+    the rcfile, which take precedence over the defaults.
+
+    Args:
+        args: the parsed command line arguments.
+
+    Returns:
+        engine.QuoteConfig: the configuration to check against.
+    """
+    values = {}
+
+    if args.rcfile:
+        # pylint reads its options from any section of the rcfile, so do
+        # the same here.
+        parser = configparser.ConfigParser()
+        if not parser.read(args.rcfile):
+            raise SystemExit('pylint-quotes: cannot read rcfile {}'.format(args.rcfile))
+        for section in parser.sections():
+            for option, choices in CONFIG_OPTIONS:
+                value = parser.get(section, option, fallback=None)
+                if value is None:
+                    continue
+                value = value.strip()
+                if value not in choices:
+                    raise SystemExit('pylint-quotes: invalid value for {} in {}: {}'.format(
+                        option, args.rcfile, value))
+                values[option.replace('-', '_')] = value
+
+    for option, _ in CONFIG_OPTIONS:
+        dest = option.replace('-', '_')
+        value = getattr(args, dest)
+        if value is not None:
+            values[dest] = value
+
+    return engine.QuoteConfig(**values)
+
+
+def changed_lines(revision_range, paths=()):
+    """Get the changed lines of the python files to check for `--diff`.
+
+    Args:
+        revision_range: the git revision range to diff, or '-' to read a
+            unified diff from stdin.
+        paths: the paths to limit the changed files to. If empty (default),
+            all changed files are used.
+
+    Returns:
+        dict: the diff.LineRanges of changed lines, keyed by file path.
+    """
+    root = diff.repository_root()
+    if revision_range == '-':
+        changed = diff.parse_unified_diff(sys.stdin)
+    else:
+        if root is None:
+            raise SystemExit(
+                'pylint-quotes: --diff {} needs a git repository'.format(revision_range))
+        try:
+            changed = diff.git_diff(revision_range, cwd=root)
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise SystemExit('pylint-quotes: git diff failed: {}'.format(e)) from e
+
+    changed = diff.resolve_paths(changed, root)
+    if paths:
+        changed = {
+            path: lines for path, lines in changed.items()
+            if runner.under_paths(path, paths)
+        }
+    return changed
+
+
+def add_config_arguments(parser):
+    """Add the options the quote configuration is read from to a parser.
+
+    Args:
+        parser: the argparse.ArgumentParser of a command.
+    """
+    parser.add_argument(
+        '--rcfile',
+        help='a pylint configuration file to read the quote options from',
+    )
+    for option, choices in CONFIG_OPTIONS:
+        parser.add_argument(
+            '--' + option, choices=choices, default=None,
+            help='the {} option (see the pylint plugin options)'.format(option),
+        )
+
+
+def build_parser():
+    """Build the command line argument parser.
+
+    Returns:
+        argparse.ArgumentParser: the parser for the command line.
+    """
+    parser = argparse.ArgumentParser(
+        prog='pylint-quotes',
+        description='Check the consistency of string quotes without running pylint.',
+    )
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    check = subparsers.add_parser(
+        'check',
+        help='check files for invalid quotes',
+        description='Check python files for string, triple and docstring quotes '
+                    'which do not match the configuration.',
+    )
+    check.add_argument(
+        'paths', nargs='*', metavar='PATH',
+        help='the files or directories to check; with --diff or --staged, '
+             'limits the changed files to those under these paths',
+    )
+    check.add_argument(
+        '--diff', metavar='RANGE',
+        help='only check the lines changed in a git revision range of the '
+             'local repository (e.g. main...HEAD), or in a unified diff read '
+             'from stdin if RANGE is -',
+    )
+    check.add_argument(
+        '--staged', action='store_true',
+        help='check the content staged in the git index of the files with '
+             'staged changes, rather than the working tree',
+    )
+    check.add_argument(
+        '-j', '--jobs', type=int, default=1, metavar='N',
+        help='the number of worker processes to check files with; 0 uses '
+             'one per CPU (default: 1)',
+    )
+    check.add_argument(
+        '--durations-file', metavar='FILE',
+        help='a file to record how long each file took to check, used to '
+             'schedule the slowest files first on the next parallel run',
+    )
+    check.add_argument(
+        '--cache-dir', metavar='DIR',
+        help='a directory to cache results in, so unchanged files are not '
+             'checked again; it can be shared between runs and checkouts',
+    )
+    check.add_argument(
+        '--cache-size', type=int, default=result_cache.DEFAULT_MAX_SIZE // (1024 * 1024),
+        metavar='MB',
+        help='the size the cache is trimmed to at the end of a run, least '
+             'recently used entries first (default: %(default)s)',
+    )
+    check.add_argument(
+        '--no-prefilter', dest='prefilter', action='store_false',
+        help='tokenize every file, even those whose bytes prove them clean '
+             '(e.g. to report files which do not tokenize)',
+    )
+    check.add_argument(
+        '--scanner', choices=engine.SCANNERS, default='regex',
+        help='how to find the strings of each file: a single regex pass, '
+             'which tokenizes any file it cannot handle, or always tokenizing '
+             '(default: %(default)s)',
+    )
+    check.add_argument(
+        '--fix', action='store_true',
+        help='rewrite the strings with invalid quotes to the configured ones, '
+             'and only report those which cannot be rewritten',
+    )
+    check.add_argument(
+        '-f', '--output-format', choices=sorted(report.WRITERS), default='text',
+        help='the format to write the messages in: pylint\'s text messages, '
+             'a JSON object per line, or a SARIF log. JSON lines and SARIF '
+             'are written as each file is checked, in the order the files '
+             'finish with --jobs (default: %(default)s)',
+    )
+    check.add_argument(
+        '-o', '--output', metavar='FILE',
+        help='a file to write the messages to, rather than stdout',
+    )
+    check.add_argument(
+        '--stats', action='store_true',
+        help='print how many files the pre-filter proved clean to stderr',
+    )
+    check.add_argument(
+        '--baseline', metavar='FILE',
+        help='a baseline file of the violations the files already have, '
+             'which are not reported',
+    )
+    check.add_argument(
+        '--update-baseline', action='store_true',
+        help='record the violations of the checked files in the --baseline '
+             'file, replacing those recorded for them, rather than report them',
+    )
+    add_config_arguments(check)
+    check.set_defaults(func=run_check)
+
+    migration = subparsers.add_parser(
+        'migrate',
+        help='rewrite all strings to the configured quotes',
+        description='Rewrite the strings of python files to the configured quotes, '
+                    'in parallel, recording the progress so an interrupted run can '
+                    'be resumed.',
+    )
+    migration.add_argument(
+        'paths', nargs='+', metavar='PATH',
+        help='the files or directories to migrate',
+    )
+    migration.add_argument(
+        '-j', '--jobs', type=int, default=0, metavar='N',
+        help='the number of worker processes to fix files with; 0 uses '
+             'one per CPU (default: 0)',
+    )
+    migration.add_argument(
+        '--journal', metavar='FILE', default=DEFAULT_JOURNAL,
+        help='the file to record the files done with in; a run given the '
+             'journal of an interrupted one skips the files it finished '
+             '(default: %(default)s)',
+    )
+    migration.add_argument(
+        '--scanner', choices=engine.SCANNERS, default='regex',
+        help='how to find the strings of each file (default: %(default)s)',
+    )
+    add_config_arguments(migration)
+    migration.set_defaults(func=run_migrate)
+
+    stats = subparsers.add_parser(
+        'stats',
+        help='count the quotes already used, and recommend a configuration',
+        description='Count the quotes used by the strings of python files, per '
+                    'package, and recommend the configuration which would report '
+                    'the fewest violations.',
+    )
+    stats.add_argument(
+        'paths', nargs='+', metavar='PATH',
+        help='the files or directories to survey',
+    )
+    stats.add_argument(
+        '--modules', action='store_true',
+        help='count the quotes of each module, not only of each package',
+    )
+    stats.add_argument(
+        '--sample', type=int, metavar='N',
+        help='only survey N files, drawn at random',
+    )
+    stats.add_argument(
+        '--stop-early', action='store_true',
+        help='survey the files in a random order, and stop as soon as the '
+             'recommendation is statistically stable',
+    )
+    stats.add_argument(
+        '--confidence', type=float, default=0.99, metavar='P',
+        help='the confidence the recommendation has to be stable at with '
+             '--stop-early (default: %(default)s)',
+    )
+    stats.add_argument(
+        '--min-files', type=int, default=50, metavar='N',
+        help='the number of files to survey before first checking whether '
+             'the recommendation is stable (default: %(default)s)',
+    )
+    stats.add_argument(
+        '--seed', type=int,
+        help='the seed of the random order of the files, to repeat a survey',
+    )
+    stats.add_argument(
+        '--scanner', choices=engine.SCANNERS, default='regex',
+        help='how to find the strings of each file (default: %(default)s)',
+    )
+    stats.set_defaults(func=run_stats)
+
+    serve = subparsers.add_parser(
+        'serve',
+        help='answer the JSON-RPC requests of an editor',
+        description='Keep the files an editor sends warm, and answer its JSON-RPC '
+                    'requests for their quote messages, one per line.',
+    )
+    serve.add_argument(
+        '--socket', metavar='PATH',
+        help='listen on a Unix socket at PATH, rather than on stdin/stdout',
+    )
+    add_config_arguments(serve)
+    serve.set_defaults(func=run_serve)
+
+    return parser
+
+
+def run_check(args, out=None):
+    """Run the `check` command.
+
+    Args:
+        args: the parsed command line arguments.
+        out: the stream to write the messages to, without `--output`. If
+            None (default), sys.stdout is used.
+
+    Returns:
+        int: the exit status.
+    """
+    out = out or sys.stdout
+    config = load_config(args)
+    if args.jobs < 0:
+        raise SystemExit('pylint-quotes: --jobs must be 0 or more')
+
+    if args.diff and args.staged:
+        raise SystemExit('pylint-quotes: --diff and --staged cannot be used together')
+    if args.fix and args.staged:
+        raise SystemExit('pylint-quotes: --fix cannot be used with --staged')
+    # fixing would rewrite the strings recorded in the baseline too.
+    if args.fix and args.baseline:
+        raise SystemExit('pylint-quotes: --fix cannot be used with --baseline')
+    if not args.paths and not args.diff and not args.staged:
+        raise SystemExit('pylint-quotes: no paths to check')
+    if args.update_baseline and not args.baseline:
+        raise SystemExit('pylint-quotes: --update-baseline needs --baseline')
+    if args.update_baseline and (args.diff or args.staged or args.fix):
+        raise SystemExit(
+            'pylint-quotes: --update-baseline cannot be used with --diff, --staged or --fix'
+        )
+
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = quote_baseline.Baseline.load(args.baseline)
+        except (OSError, ValueError) as e:
+            raise SystemExit('pylint-quotes: cannot use the baseline: {}'.format(e)) from e
+    # the baseline being updated is not applied to the check.
+    suppress = None if args.update_baseline else baseline
+
+    durations = runner.load_durations(args.durations_file) if args.durations_file else {}
+    cache = None
+    if args.cache_dir:
+        cache = result_cache.ResultCache(args.cache_dir, args.cache_size * 1024 * 1024)
+
+    lines = None
+    if args.staged:
+        root = diff.repository_root()
+        if root is None:
+            raise SystemExit('pylint-quotes: --staged needs a git repository')
+        try:
+            results = list(staged.check_staged(
+                config, cache=cache, root=root, paths=args.paths, prefilter_files=args.prefilter,
+                scanner=args.scanner, baseline=suppress,
+            ))
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise SystemExit('pylint-quotes: reading the git index failed: {}'.format(e)) from e
+    else:
+        if args.diff:
+            lines = changed_lines(args.diff, args.paths)
+            paths = sorted(lines)
+        else:
+            paths = runner.iter_python_files(args.paths)
+        results = runner.run(
+            paths, config, jobs=args.jobs, durations=durations, cache=cache, lines=lines,
+            prefilter_files=args.prefilter, scanner=args.scanner, baseline=suppress,
+            ordered=args.output_format == 'text',
+        )
+
+    if args.output:
+        try:
+            out = open(args.output, 'w', encoding='utf-8')
+        except OSError as e:
+            raise SystemExit('pylint-quotes: cannot write {}: {}'.format(args.output, e)) from e
+
+    status = 0
+    checked = skipped = baselined = 0
+    n_fixed = n_fixed_files = 0
+    with report.WRITERS[args.output_format](out) as writer:
+        for result in results:
+            checked += 1
+            skipped += result.skipped
+            baselined += result.baselined
+            if args.update_baseline and not result.error:
+                try:
+                    baseline.update(result.path, quote_baseline.fingerprint_file(
+                        result.path, result.violations, args.scanner,
+                    ))
+                except runner.CHECK_ERRORS as e:
+                    result = runner.error_result(result.path, e)
+                else:
+                    continue
+
+            if args.fix and result.violations:
+                try:
+                    fixed, result.violations = fix.fix_file(
+                        result.path, config, lines.get(result.path) if lines else None,
+                        args.scanner,
+                    )
+                except migrate.FIX_ERRORS as e:
+                    sys.stderr.write('pylint-quotes: cannot fix {}: {}\n'.format(result.path, e))
+                else:
+                    n_fixed += len(fixed)
+                    n_fixed_files += bool(fixed)
+            writer.write(result)
+            status |= result.status
+    if args.output:
+        out.close()
+
+    if args.fix:
+        sys.stderr.write('pylint-quotes: fixed {} strings in {} files\n'.format(
+            n_fixed, n_fixed_files))
+    if args.durations_file:
+        runner.save_durations(args.durations_file, durations)
+    if args.update_baseline:
+        baseline.save(args.baseline)
+        sys.stderr.write('pylint-quotes: baseline: {} violations recorded\n'.format(len(baseline)))
+    elif baseline is not None:
+        sys.stderr.write('pylint-quotes: baseline: {} violations suppressed\n'.format(baselined))
+    if cache is not None:
+        cache.evict()
+        sys.stderr.write('pylint-quotes: cache: {} hits, {} misses\n'.format(
+            cache.hits, cache.misses))
+    if args.stats:
+        sys.stderr.write('pylint-quotes: pre-filter: {} of {} files proven clean ({:.0%})\n'.format(
+            skipped, checked, skipped / checked if checked else 0))
+    return status
+
+
+def run_migrate(args, out=None):
+    """Run the `migrate` command.
+
+    Args:
+        args: the parsed command line arguments.
+        out: the stream to write the messages to. If None (default),
+            sys.stdout is used.
+
+    Returns:
+        int: the exit status.
+    """
+    out = out or sys.stdout
+    config = load_config(args)
+    if args.jobs < 0:
+        raise SystemExit('pylint-quotes: --jobs must be 0 or more')
+
+    try:
+        journal = migrate.Journal(args.journal, config)
+    except (OSError, ValueError) as e:
+        raise SystemExit('pylint-quotes: cannot use the journal: {}'.format(e)) from e
+
+    status = 0
+    summary = migrate.MigrationSummary()
+    with journal:
+        paths = runner.iter_python_files(args.paths)
+        for migration in migrate.migrate(
+                paths, config, jobs=args.jobs, journal=journal, summary=summary,
+                scanner=args.scanner):
+            # only the strings which could not be rewritten are reported.
+            for line in report.format_result(migration.result):
+                out.write(line + '\n')
+            status |= migration.result.status
+    if summary.remaining:
+        status |= runner.CONVENTION_STATUS
+
+    sys.stderr.write(
+        'pylint-quotes: migrated {} files in {:.1f}s ({:.0f} files/s): {} changed, '
+        '{} strings rewritten ({:.0f} strings/s), {} left to fix, {} errors, '
+        '{} resumed from the journal\n'.format(
+            summary.files, summary.elapsed, summary.files_per_second, summary.changed,
+            summary.rewritten, summary.rewritten_per_second, summary.remaining, summary.errors,
+            summary.resumed,
+        ))
+    return status
+
+
+def format_usage(surveyed, title):
+    """Get the lines of a table of quote usage.
+
+    Args:
+        surveyed: the usage.QuoteUsage of each row, keyed by its title.
+        title: the title of the first column.
+
+    Returns:
+        list[str]: the lines of the table.
+    """
+    rows = [[title, 'files', '\'', '"', 'escapes', '\'\'\'', '"""', 'doc \'\'\'', 'doc """']]
+    for name, counts in surveyed.items():
+        rows.append([name, counts.files] + [
+            counts.strings[q] for q in engine.QUOTES
+        ] + [counts.escapes] + [
+            counts.triples[q] for q in engine.TRIPLE_QUOTE_OPTS.values()
+        ] + [
+            counts.docstrings[q] for q in engine.TRIPLE_QUOTE_OPTS.values()
+        ])
+    widths = [max(len(str(row[i])) for row in rows) for i in range(len(rows[0]))]
+    return [
+        '  '.join(
+            [str(row[0]).ljust(widths[0])] + [str(v).rjust(w) for v, w in zip(row[1:], widths[1:])]
+        )
+        for row in rows
+    ]
+
+
+def run_stats(args, out=None):
+    """Run the `stats` command.
+
+    Args:
+        args: the parsed command line arguments.
+        out: the stream to write the report to. If None (default),
+            sys.stdout is used.
+
+    Returns:
+        int: the exit status.
+    """
+    out = out or sys.stdout
+    if args.sample is not None and args.sample < 1:
+        raise SystemExit('pylint-quotes: --sample must be 1 or more')
+    if not 0 < args.confidence < 1:
+        raise SystemExit('pylint-quotes: --confidence must be between 0 and 1')
+
+    surveyed = usage.survey(
+        runner.iter_python_files(args.paths), sample=args.sample, stop_early=args.stop_early,
+        confidence=args.confidence, min_files=args.min_files, seed=args.seed, scanner=args.scanner,
+    )
+
+    status = 0
+    for result in surveyed.errors:
+        for line in report.format_result(result):
+            sys.stderr.write(line + '\n')
+        status |= result.status
+
+    rows = dict(surveyed.modules) if args.modules else surveyed.packages()
+    rows['total'] = surveyed.total
+    for line in format_usage(rows, 'module' if args.modules else 'package'):
+        out.write(line + '\n')
+
+    n = len(surveyed.modules)
+    out.write('\n# surveyed {} of {} files'.format(n, surveyed.population))
+    if n < surveyed.population:
+        stable = surveyed.is_stable(usage.z_score(args.confidence))
+        out.write('; the recommendation is {}stable at {:.0%} confidence'.format(
+            '' if stable else 'not ', args.confidence))
+    out.write('\n')
+    recommended = surveyed.total.recommend()
+    for (option, values), value in zip(usage.OPTIONS, recommended):
+        violations = surveyed.total.violations[option]
+        out.write('# {} violations: {}\n'.format(
+            option, ', '.join('{} {}'.format(v, violations[v]) for v in values)))
+        out.write('{}={}\n'.format(option, value))
+    return status
+
+
+def run_serve(args, out=None):
+    """Run the `serve` command.
+
+    Args:
+        args: the parsed command line arguments.
+        out: the binary stream to write the responses to, without
+            `--socket`. If None (default), sys.stdout is used.
+
+    Returns:
+        int: the exit status.
+    """
+    server = daemon.Daemon(load_config(args))
+    if args.socket:
+        try:
+            daemon.serve_socket(server, args.socket)
+        except OSError as e:
+            raise SystemExit('pylint-quotes: cannot listen on {}: {}'.format(args.socket, e)) from e
+    else:
+        daemon.serve_stdio(server, sys.stdin.buffer, out or sys.stdout.buffer)
+    return 0
+
+
+def main(argv=None):
+    """Run the pylint-quotes command line interface.
+
+    Args:
+        argv: the command line arguments. If None (default), sys.argv is used.
+
+    Returns:
+        int: the exit status.
+    """
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,696 @@
+"""A long-running checker for editors, answering JSON-RPC requests.
+
+Starting a process and finding the strings of a whole module on every
+keystroke is too slow for an editor. The daemon keeps the state of each
+file it was sent between requests -- its lines, its strings and where a
+scan can resume -- and when a new version of the file arrives, only the
+region around the edit is scanned again.
+
+A scan can only start where the state of the scanner and of the docstring
+classification is known without looking back: at the start of a logical
+line which is outside of any bracket and of any def/class header, and
+which is not the first statement of a body (it could be a docstring).
+The depth of the blocks the line is in is the only state left then, so
+those lines are recorded, with the columns of their blocks, as resume
+points. An edit is scanned from the last resume point before it up to the
+first resume point after it which was also a resume point of the old
+version, in the same blocks; the strings past that are the old ones,
+shifted by the lines the edit added or removed. A region the scanner
+cannot handle (see `pylint_quotes.scanner`) is tokenized from the same
+point instead, which also finds any error in it; versions with an error
+are answered with the strings before it, and the next version is rescanned
+from the last one without.
+
+The protocol is JSON-RPC 2.0, one request or response per line, over
+stdin/stdout or a Unix socket (see `serve_stdio` and `serve_socket`):
+
+    {"jsonrpc": "2.0", "id": 1, "method": "check",
+     "params": {"path": "foo.py", "text": "x = \\"a\\"\\n"}}
+
+is answered with the quote messages for the text, with the lines and
+columns each string starts and ends at:
+
+    {"jsonrpc": "2.0", "id": 1, "result": {"path": "foo.py", "error": null,
+     "diagnostics": [{"msg_id": "C4001", "symbol": "invalid-string-quote",
+     "message": "...", "line": 1, "column": 4, "end_line": 1,
+     "end_column": 7}]}}
+
+Lines are 1-based and columns 0-based, the same as the checks report them.
+`forget` drops the state of a path (e.g. when the editor closes it), and
+`shutdown` stops the daemon.
+"""
+
+from __future__ import absolute_import
+
+import bisect
+import io
+import json
+import os
+import socketserver
+import stat
+import threading
+import tokenize
+
+from pylint_quotes import docstrings, engine, runner, scanner
+
+# JSON-RPC error codes.
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+
+_TABSIZE = 8
+
+# tokens which are not part of a statement.
+_NON_CODE_TOKENS = frozenset((tokenize.NL, tokenize.COMMENT, tokenize.ENCODING))
+
+_STATEMENT_START_TOKENS = frozenset((tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT))
+
+# the (row, indents) of the start of a module.
+_MODULE_START = (1, (0,))
+
+
+def _indent_column(line):
+    """Get the column of the indentation of a line, measured the way
+    tokenize does.
+    """
+    column = 0
+    for char in line:
+        if char == ' ':
+            column += 1
+        elif char == '\t':
+            column = (column // _TABSIZE + 1) * _TABSIZE
+        elif char == '\f':
+            column = 0
+        else:
+            break
+    return column
+
+
+class _Tracker:
+    """Records the resume points of a token stream as it is consumed.
+
+    Args:
+        lines: all the lines of the source, for the columns of its blocks.
+        start: the (row, indents) the tokens start at: the row of the source
+            and the columns of the blocks it is in.
+        at_module_start: whether the tokens start at the start of the module.
+
+    Attributes:
+        points: the (row, indents) of each resume point found, in order.
+    """
+
+    __slots__ = ('points', '_lines', '_offset', '_blocks', '_depth', '_in_header', '_after_colon')
+
+    def __init__(self, lines, start, at_module_start):
+        self.points = []
+        self._lines = lines
+        self._offset = start[0] - 1
+        self._blocks = list(start[1])
+        self._depth = 0
+        self._in_header = False
+        # whether the last code token was a colon, which a body may follow.
+        # the first statement of a module may be its docstring, the same
+        # as that of a body.
+        self._after_colon = at_module_start
+
+    def track(self, tokens, resume=None):
+        """Consume a token stream, recording its resume points.
+
+        Args:
+            tokens: the tokens of the source from the start row on, with rows
+                counted from 1 there.
+            resume: a function called with each resume point; if it returns
+                True, the stream ends right before the point. If None
+                (default), the stream is consumed to its end.
+
+        Yields:
+            tuple: each token, as a 5-tuple with its row in the whole source.
+        """
+        line_start = True
+        statement_start = True
+        # tokenize does not reset its state after a single quoted string
+        # which runs on over several lines without being terminated, so it
+        # tokenizes the rest of the source differently from any line on.
+        resumable = True
+
+        for tok_type, token, (row, col), _, _ in tokens:
+            row += self._offset
+            if tok_type in _NON_CODE_TOKENS:
+                continue
+
+            if tok_type == tokenize.INDENT:
+                self._blocks.append(_indent_column(self._lines[row - 1]))
+            elif tok_type == tokenize.DEDENT:
+                self._blocks.pop()
+            elif tok_type == tokenize.NEWLINE:
+                line_start = True
+            elif tok_type != tokenize.ENDMARKER:
+                if line_start:
+                    line_start = False
+                    if (resumable and self._depth == 0
+                            and not (self._in_header or self._after_colon)):
+                        point = (row, tuple(self._blocks))
+                        if resume is not None and resume(point):
+                            return
+                        self.points.append(point)
+                if tok_type == tokenize.ERRORTOKEN and '\n' in token:
+                    resumable = False
+                statement_start = self._code_token(tok_type, token, statement_start)
+                yield tok_type, token, (row, col), None, None
+                continue
+
+            statement_start = tok_type in _STATEMENT_START_TOKENS
+            yield tok_type, token, (row, col), None, None
+
+    def _code_token(self, tok_type, token, statement_start):
+        """Follow the brackets and headers of the statements through a token
+        of code.
+
+        Args:
+            tok_type: the type of the token.
+            token: the text of the token.
+            statement_start: whether the token starts a statement.
+
+        Returns:
+            bool: whether the next token starts a statement.
+        """
+        self._after_colon = False
+        if tok_type == tokenize.OP:
+            if token in '([{':
+                self._depth += 1
+            elif token in ')]}':
+                self._depth -= 1
+            elif self._depth == 0 and token == ':':
+                self._in_header = False
+                self._after_colon = True
+                return True
+            elif self._depth == 0 and token == ';':
+                return True
+        elif tok_type == tokenize.NAME and statement_start:
+            if token in ('def', 'class'):
+                self._in_header = True
+            elif token == 'async':
+                return True
+        return False
+
+
+def _tokenize(lines, first_row, indents):
+    """Tokenize the source from the start of one of its lines.
+
+    The tokenizer is first run through a header opening each block the line
+    is in, so it is in the state it would be in at the line had it
+    tokenized the source from its start.
+
+    Args:
+        lines: all the lines of the source.
+        first_row: the row of the source to tokenize from.
+        indents: the columns of the blocks the row is in.
+
+    Yields:
+        tuple: each token from the row on, as a 5-tuple with rows counted
+        from 1 there.
+
+    Raises:
+        SyntaxError: the source has an error; its line is that of the whole
+            source.
+        tokenize.TokenError: the same.
+    """
+    headers = len(indents) - 1
+    readline = io.StringIO(
+        ''.join(' ' * column + 'if 1:\n' for column in indents[:-1])
+        + '\n'.join(lines[first_row - 1:])
+    ).readline
+    # the row itself indents to the last block.
+    skip_indent = headers > 0
+    offset = first_row - 1 - headers
+    try:
+        for tok_type, token, (row, col), _, _ in tokenize.generate_tokens(readline):
+            if row <= headers:
+                continue
+            if skip_indent:
+                skip_indent = False
+                if tok_type == tokenize.INDENT:
+                    continue
+            yield tok_type, token, (row - headers, col), None, None
+    except SyntaxError as e:
+        if e.lineno:
+            e.lineno += offset
+        raise
+    except tokenize.TokenError as e:
+        # raised with the message and the (row, col) of the error.
+        row, col = e.args[1]
+        raise tokenize.TokenError(e.args[0], (row + offset, col))
+
+
+def _diagnostic(violation, token):
+    """Get the diagnostic the daemon answers with for a violation.
+
+    Args:
+        violation: the engine.Violation.
+        token: the string token of the violation.
+
+    Returns:
+        dict: the message and span of the violation.
+    """
+    newlines = token.count('\n')
+    if newlines:
+        end_line, end_column = violation.row + newlines, len(token) - token.rfind('\n') - 1
+    else:
+        end_line, end_column = violation.row, violation.col + len(token)
+    return {
+        'msg_id': violation.msg_id,
+        'symbol': violation.symbol,
+        'message': violation.msg,
+        'line': violation.row,
+        'column': violation.col,
+        'end_line': end_line,
+        'end_column': end_column,
+    }
+
+
+def _changed_region(old_lines, lines):
+    """Find the lines which changed between two versions of a text.
+
+    Args:
+        old_lines: the lines of the old version.
+        lines: the lines of the new version.
+
+    Returns:
+        tuple: the number of lines the versions start with in common, and
+        the last changed row of the new version.
+    """
+    limit = min(len(old_lines), len(lines))
+    prefix = 0
+    while prefix < limit and old_lines[prefix] == lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_lines[-1 - suffix] == lines[-1 - suffix]:
+        suffix += 1
+    return prefix, len(lines) - suffix
+
+
+def _shifted_rest(old, index, delta):
+    """Get what a version of a text knows from one of its resume points on,
+    moved by the lines an edit before the point added or removed.
+
+    Args:
+        old: the FileState of the version.
+        index: the index of the resume point.
+        delta: the number of lines added before the point, or minus the
+            number removed.
+
+    Returns:
+        tuple: the entries and the resume points from the point on, and the
+        error of the version.
+    """
+    points = old.points[index:]
+    entries = old.entries[bisect.bisect_left(old.entries, (points[0][0],)):]
+    error = old.error
+    if not delta:
+        return entries, points, error
+
+    entries = [
+        (row + delta, col, token, is_docstring, dict(
+            diagnostic, line=row + delta, end_line=diagnostic['end_line'] + delta,
+        ) if diagnostic is not None else None)
+        for row, col, token, is_docstring, diagnostic in entries
+    ]
+    points = [(row + delta, blocks) for row, blocks in points]
+    if error:
+        error = error[:2] + (error[2] + delta,) + error[3:]
+    return entries, points, error
+
+
+class FileState:
+    """What the daemon knows about a version of a file.
+
+    Attributes:
+        lines: the lines of the text, without their line ends.
+        entries: a (row, col, token, is_docstring, diagnostic) tuple for each
+            string, in order; the diagnostic is None for a valid string.
+        points: the (row, indents) of each resume point, in order.
+        error: the (msg_id, symbol, line, column, message) of the error the
+            text could not be fully checked with, or None. Only the strings
+            before the error are known.
+        rescanned: the number of lines scanned to check the text.
+        clean: the state of the last version of the file without an error
+            (this one if it has none), or None. Editors send versions with
+            errors all the time, e.g. while a string is being typed, and the
+            next versions are rescanned from it rather than from them.
+    """
+
+    __slots__ = ('lines', 'entries', 'points', 'error', 'rescanned', 'clean')
+
+    # an argument for each of the slots.
+    def __init__(  # pylint: disable=too-many-arguments
+            self, lines, entries, points, error=None, rescanned=0, clean=None):
+        self.lines = lines
+        self.entries = entries
+        self.points = points
+        self.error = error
+        self.rescanned = rescanned
+        self.clean = clean if error else self
+
+    def diagnostics(self):
+        """Get the diagnostics of the text.
+
+        Returns:
+            list[dict]: the message and span of each violation, in order.
+        """
+        return [entry[4] for entry in self.entries if entry[4] is not None]
+
+
+class Daemon:
+    """The state of the daemon, and the handlers of its requests.
+
+    Requests are handled one at a time; servers handling connections in
+    parallel have to hold `lock` around `handle`.
+
+    Attributes:
+        config: the engine.QuoteConfig the files are checked against.
+        files: the FileState of each file, keyed by path.
+        running: whether the daemon has not been asked to shut down.
+        lock: a lock to serialize the requests of concurrent connections.
+    """
+
+    __slots__ = ('config', 'files', 'running', 'lock', '_classifier')
+
+    def __init__(self, config):
+        self.config = config
+        self.files = {}
+        self.running = True
+        self.lock = threading.Lock()
+        self._classifier = engine.QuoteClassifier.compile(config)
+
+    def check_text(self, path, text):
+        """Check a version of a file, rescanning only what changed since the
+        last version the daemon was sent.
+
+        Args:
+            path: the path of the file; only used as the key of its state.
+            text: the whole text of the file.
+
+        Returns:
+            FileState: the state of the new version.
+        """
+        lines = text.split('\n')
+        old = self.files.get(path)
+        if old is None:
+            entries, points, error = self._scan(lines, _MODULE_START, True)
+            state = FileState(lines, entries, points, error, len(lines))
+        else:
+            state = self._rescan(old.clean or old, lines)
+            if state.error:
+                state.clean = old.clean
+        self.files[path] = state
+        return state
+
+    def check(self, path, text):
+        """Handle a `check` request.
+
+        Args:
+            path: the path of the file.
+            text: the whole text of the file.
+
+        Returns:
+            dict: the result of the request.
+        """
+        state = self.check_text(path, text)
+        error = None
+        if state.error:
+            msg_id, symbol, line, column, message = state.error
+            error = {
+                'msg_id': msg_id, 'symbol': symbol, 'line': line, 'column': column,
+                'message': message,
+            }
+        return {'path': path, 'diagnostics': state.diagnostics(), 'error': error}
+
+    def forget(self, path):
+        """Handle a `forget` request, dropping the state of a file.
+
+        Args:
+            path: the path of the file.
+
+        Returns:
+            bool: whether the daemon had any state for the file.
+        """
+        return self.files.pop(path, None) is not None
+
+    def shutdown(self):
+        """Handle a `shutdown` request."""
+        self.running = False
+
+    def _scan(self, lines, start, module_start, resume=None):
+        """Check a text from a resume point (or its start) on.
+
+        The text is scanned, or tokenized if the scanner cannot handle it,
+        which also finds any error in it.
+
+        Args:
+            lines: the lines of the text.
+            start: the (row, indents) of the resume point.
+            module_start: whether the text is checked from its start.
+            resume: a function to end the check at a resume point with; see
+                `_Tracker.track`.
+
+        Returns:
+            tuple: the entries and the resume points found, and the error.
+        """
+        first_row, indents = start
+        try:
+            content = '\n'.join(lines[first_row - 1:]).encode('utf-8')
+            tracker = _Tracker(lines, start, module_start)
+            strings = list(docstrings.iter_strings(tracker.track(
+                scanner.scan_tokens(content, 'utf-8', indents), resume,
+            ), at_module_start=module_start))
+            return self._entries(strings), tracker.points, None
+        except (scanner.ScanError, UnicodeError):
+            pass
+
+        tracker = _Tracker(lines, start, module_start)
+        strings = []
+        error = None
+        try:
+            strings.extend(docstrings.iter_strings(tracker.track(
+                _tokenize(lines, first_row, indents), resume,
+            ), at_module_start=module_start))
+        except (SyntaxError, tokenize.TokenError) as e:
+            error = runner.error_result(None, e).error
+        return self._entries(strings), tracker.points, error
+
+    def _entries(self, strings):
+        """Check classified strings, as entries of a FileState."""
+        check = self._classifier.check
+        entries = []
+        for token, row, col, is_docstring in strings:
+            violation = check(token, row, col, is_docstring)
+            diagnostic = _diagnostic(violation, token) if violation else None
+            entries.append((row, col, token, is_docstring, diagnostic))
+        return entries
+
+    def _rescan(self, old, lines):
+        """Check a text from the state of its previous version, scanning
+        only the region around what changed.
+
+        Args:
+            old: the FileState of the previous version.
+            lines: the lines of the new version.
+
+        Returns:
+            FileState: the state of the new version.
+        """
+        prefix, changed_end = _changed_region(old.lines, lines)
+        if prefix == len(old.lines) == len(lines):
+            return FileState(lines, old.entries, old.points, old.error)
+        delta = len(lines) - len(old.lines)
+
+        # resume from the last point whose whole line is unchanged.
+        start = bisect.bisect_left(old.points, (prefix + 1,)) - 1
+        module_start = start < 0
+        if module_start:
+            start = 0
+            first = _MODULE_START
+        else:
+            first = old.points[start]
+
+        # the index of the old point the check was ended at.
+        stop = []
+
+        def resume(point):
+            row, blocks = point
+            if row <= changed_end:
+                return False
+            i = bisect.bisect_left(old.points, (row - delta,))
+            if i < len(old.points) and old.points[i] == (row - delta, blocks):
+                stop.append(i)
+                return True
+            return False
+
+        entries, points, error = self._scan(lines, first, module_start, resume)
+        entries[:0] = old.entries[:bisect.bisect_left(old.entries, (first[0],))]
+        points[:0] = old.points[:start]
+        if not stop:
+            return FileState(
+                lines, entries, points, error,
+                (error[2] if error else len(lines)) + 1 - first[0],
+            )
+
+        # the rest of the text is unchanged from the point on, and so is the
+        # error it had, if any.
+        rest = _shifted_rest(old, stop[-1], delta)
+        return FileState(
+            lines, entries + rest[0], points + rest[1], rest[2],
+            old.points[stop[-1]][0] + delta - first[0],
+        )
+
+    def _rpc_check(self, params):
+        path, text = params.get('path'), params.get('text')
+        if not isinstance(path, str) or not isinstance(text, str):
+            raise _InvalidParams('check takes a path and a text')
+        return self.check(path, text)
+
+    def _rpc_forget(self, params):
+        path = params.get('path')
+        if not isinstance(path, str):
+            raise _InvalidParams('forget takes a path')
+        return self.forget(path)
+
+    def _rpc_shutdown(self, params):  # pylint: disable=unused-argument
+        self.shutdown()
+
+    # the handler of each method, given the params of the request.
+    _METHODS = {
+        'check': _rpc_check,
+        'forget': _rpc_forget,
+        'shutdown': _rpc_shutdown,
+    }
+
+    def handle(self, request):
+        """Handle a JSON-RPC request.
+
+        Args:
+            request: the decoded request.
+
+        Returns:
+            dict: the response, or None if the request is a notification.
+        """
+        if not isinstance(request, dict) or request.get('jsonrpc') != '2.0' \
+                or not isinstance(request.get('method'), str):
+            return _error(None, INVALID_REQUEST, 'Invalid Request')
+        request_id = request.get('id')
+        params = request.get('params', {})
+        method = self._METHODS.get(request['method'])
+        if not isinstance(params, dict):
+            response = _error(request_id, INVALID_PARAMS, 'params must be an object')
+        elif method is None:
+            response = _error(
+                request_id, METHOD_NOT_FOUND, 'Method not found: {}'.format(request['method']),
+            )
+        else:
+            try:
+                response = {'jsonrpc': '2.0', 'id': request_id, 'result': method(self, params)}
+            except _InvalidParams as e:
+                response = _error(request_id, INVALID_PARAMS, str(e))
+
+        # notifications are never answered, not even with an error.
+        return None if 'id' not in request else response
+
+    def handle_line(self, line):
+        """Handle a line of the protocol.
+
+        Args:
+            line: the line holding the JSON-RPC request, as str or bytes.
+
+        Returns:
+            str: the line holding the response, without its line end, or None
+            if there is nothing to answer.
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = _error(None, PARSE_ERROR, 'Parse error: {}'.format(e))
+        else:
+            response = self.handle(request)
+        if response is None:
+            return None
+        return json.dumps(response)
+
+
+class _InvalidParams(ValueError):
+    """The params of a request are not those its method takes."""
+
+
+def _error(request_id, code, message):
+    """Get a JSON-RPC error response."""
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+
+def serve_stdio(daemon, stdin, stdout):
+    """Answer the requests read from a stream until it ends or the daemon is
+    shut down.
+
+    Args:
+        daemon: the Daemon to handle the requests with.
+        stdin: the binary stream to read a request per line from.
+        stdout: the binary stream to write a response per line to.
+    """
+    for line in iter(stdin.readline, b''):
+        if not line.strip():
+            continue
+        response = daemon.handle_line(line)
+        if response is not None:
+            stdout.write(response.encode('utf-8') + b'\n')
+            stdout.flush()
+        if not daemon.running:
+            break
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Answer the requests of a connection to the socket."""
+
+    def handle(self):
+        daemon = self.server.daemon
+        for line in iter(self.rfile.readline, b''):
+            if not line.strip():
+                continue
+            with daemon.lock:
+                response = daemon.handle_line(line)
+            if response is not None:
+                self.wfile.write(response.encode('utf-8') + b'\n')
+                self.wfile.flush()
+            if not daemon.running:
+                # shutdown() waits for serve_forever, so it cannot run on its thread.
+                threading.Thread(target=self.server.shutdown).start()
+                break
+
+
+def serve_socket(daemon, path):
+    """Answer the requests of connections to a Unix socket until the daemon
+    is shut down.
+
+    Connections are served in parallel, but their requests are handled one
+    at a time. A socket left behind at the path by a previous daemon is
+    replaced; the socket is removed when the daemon stops.
+
+    Args:
+        daemon: the Daemon to handle the requests with.
+        path: the path of the socket.
+
+    Raises:
+        OSError: the socket could not be created, e.g. because a file which
+            is not a socket exists at the path.
+    """
+    try:
+        if stat.S_ISSOCK(os.lstat(path).st_mode):
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
+    server = socketserver.ThreadingUnixStreamServer(path, _Handler)
+    server.daemon_threads = True
+    server.daemon = daemon
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        os.unlink(path)
@@ -0,0 +1,225 @@
+"""Restrict quote checks to the lines changed in a diff.
+
+The changed lines of each file are read from a unified diff, either one
+produced by running `git diff` on a revision range in the local repository
+or one passed in directly (e.g. on stdin). Only the changed files are then
+checked, and only strings which touch a changed line are evaluated against
+the quote configuration. A multi-line string counts as changed if any of
+its lines are.
+"""
+
+from __future__ import absolute_import
+
+import bisect
+import os
+import re
+import subprocess
+
+_HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+# the escapes git uses in quoted paths, other than octal bytes.
+_C_ESCAPES = {
+    'a': b'\a', 'b': b'\b', 't': b'\t', 'n': b'\n', 'v': b'\v', 'f': b'\f', 'r': b'\r',
+    '"': b'"', '\\': b'\\',
+}
+_C_ESCAPE = re.compile(r'\\([0-7]{3}|.)')
+
+
+class LineRanges:
+    """A set of line numbers, stored as sorted, non-overlapping ranges.
+
+    Attributes:
+        ranges: the (first, last) line ranges, inclusive, in order.
+    """
+
+    __slots__ = ('ranges', '_starts')
+
+    def __init__(self, lines=()):
+        self.ranges = []
+        for line in sorted(set(lines)):
+            if self.ranges and self.ranges[-1][1] == line - 1:
+                self.ranges[-1] = (self.ranges[-1][0], line)
+            else:
+                self.ranges.append((line, line))
+        self._starts = [first for first, _ in self.ranges]
+
+    def __bool__(self):
+        return bool(self.ranges)
+
+    def __eq__(self, other):
+        return isinstance(other, LineRanges) and self.ranges == other.ranges
+
+    def __repr__(self):
+        return 'LineRanges({!r})'.format(self.ranges)
+
+    def overlaps(self, first, last):
+        """Check whether any line in [first, last] is in the set.
+
+        Args:
+            first: the first line of the span.
+            last: the last line of the span.
+
+        Returns:
+            bool: True if the span touches a line in the set.
+        """
+        # the last range starting at or before the end of the span is the
+        # only one which can overlap it.
+        i = bisect.bisect_right(self._starts, last) - 1
+        return i >= 0 and self.ranges[i][1] >= first
+
+
+def _unquote(name):
+    """Get the path a file name of a diff header stands for.
+
+    Git quotes a path as a C string when it has unusual characters, e.g.
+    `"caf\\303\\251.py"`, with its non-ASCII bytes in octal.
+
+    Args:
+        name: the file name, as found in the header.
+
+    Returns:
+        str: the path, unquoted if it was quoted.
+    """
+    if not (len(name) > 1 and name.startswith('"') and name.endswith('"')):
+        return name
+    path = b''
+    end = 1
+    for match in _C_ESCAPE.finditer(name, 1, len(name) - 1):
+        path += os.fsencode(name[end:match.start()])
+        escape = match.group(1)
+        path += bytes([int(escape, 8)]) if len(escape) == 3 else _C_ESCAPES.get(escape, b'')
+        end = match.end()
+    path += os.fsencode(name[end:-1])
+    return os.fsdecode(path)
+
+
+def parse_unified_diff(lines):
+    """Get the lines added or changed in each file of a unified diff.
+
+    Only the new side of the diff is considered: removed lines are not
+    part of the files being checked, and context lines were not touched.
+    Deleted files are skipped.
+
+    Args:
+        lines: the lines of the diff.
+
+    Returns:
+        dict: the LineRanges of changed lines, keyed by the path of the file
+        on the new side of the diff (unquoted, and without the 'b/' prefix
+        git adds).
+    """
+    changed = {}
+    path = None
+    row = 0
+    remaining = 0
+
+    for line in lines:
+        line = line.rstrip('\r\n')
+
+        if remaining > 0:
+            if line.startswith('+'):
+                changed[path].append(row)
+                row += 1
+                remaining -= 1
+                continue
+            if line.startswith(' '):
+                row += 1
+                remaining -= 1
+                continue
+            if line.startswith('-') or line.startswith('\\'):
+                continue
+            # anything else ends the hunk early (e.g. a truncated diff).
+            remaining = 0
+
+        if line.startswith('+++ '):
+            # a quoted name has its tabs escaped, so it has none to split.
+            name = _unquote(line[4:].split('\t')[0])
+            if name == '/dev/null':
+                path = None
+            else:
+                path = name[2:] if name.startswith('b/') else name
+                changed.setdefault(path, [])
+            continue
+
+        match = _HUNK_HEADER.match(line)
+        if match and path is not None:
+            row = int(match.group(1))
+            remaining = int(match.group(2)) if match.group(2) is not None else 1
+
+    return {p: LineRanges(rows) for p, rows in changed.items()}
+
+
+def _git(*args, cwd=None):
+    # paths are bytes as far as git is concerned, so they are decoded the
+    # same way as the file system's.
+    return os.fsdecode(subprocess.run(
+        ('git',) + args, cwd=cwd, check=True, stdout=subprocess.PIPE,
+    ).stdout)
+
+
+def repository_root(cwd=None):
+    """Get the top level directory of the local git repository.
+
+    Args:
+        cwd: the directory to look up the repository from. If None
+            (default), the current directory is used.
+
+    Returns:
+        str: the repository root, or None if not in a git repository.
+    """
+    try:
+        return _git('rev-parse', '--show-toplevel', cwd=cwd).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def git_diff(revision_range, cwd=None):
+    """Get the changed lines of the python files in a revision range.
+
+    The diff is taken in the local repository only. As with `git diff`, a
+    single revision compares the working tree against it. The prefixes and
+    quoting of the paths are set on the command line, so the user's git
+    configuration (e.g. diff.noprefix or diff.mnemonicPrefix) does not
+    change which files are found.
+
+    Args:
+        revision_range: the revision range, e.g. 'main...HEAD'.
+        cwd: the directory to run git in. If None (default), the current
+            directory is used.
+
+    Returns:
+        dict: the LineRanges of changed lines, keyed by file path relative
+        to the repository root.
+
+    Raises:
+        subprocess.CalledProcessError: git failed, e.g. for an unknown
+            revision.
+    """
+    output = _git(
+        '-c', 'core.quotePath=false', 'diff', '--no-color', '--no-ext-diff', '-U0',
+        '--src-prefix=a/', '--dst-prefix=b/', revision_range, '--', '*.py', cwd=cwd,
+    )
+    return parse_unified_diff(output.splitlines())
+
+
+def resolve_paths(changed, root=None):
+    """Make the paths of a parsed diff usable from the current directory.
+
+    Args:
+        changed: the LineRanges keyed by path, as from `parse_unified_diff`.
+        root: the directory the diff paths are relative to. If None
+            (default), they are used as they are.
+
+    Returns:
+        dict: the LineRanges of the python files that changed and still
+        exist, keyed by their path relative to the current directory.
+    """
+    resolved = {}
+    for path, lines in changed.items():
+        if not path.endswith('.py') or not lines:
+            continue
+        if root:
+            path = os.path.relpath(os.path.join(root, path))
+        if os.path.isfile(path):
+            resolved[path] = lines
+    return resolved
@@ -0,0 +1,162 @@
+"""Docstring detection from the token stream.
+
+A docstring is the first statement of a module, class or function when
+that statement is made up of nothing but a string literal. All of that
+can be determined from the tokens alone: the first statement of a module,
+or the first statement following the colon which ends a `def`/`class`
+header (either on the same line, or after the NEWLINE and INDENT which
+open the body).
+
+This lets docstrings be classified in the same pass the tokens are read
+in, without waiting for an AST walk to say which strings are docstrings.
+"""
+
+from __future__ import absolute_import
+
+import tokenize
+
+# tokens which can come between a definition header (or the start of the
+# module) and the first statement of its body.
+_SKIP_TOKENS = frozenset((
+    tokenize.NL,
+    tokenize.NEWLINE,
+    tokenize.COMMENT,
+    tokenize.INDENT,
+    tokenize.ENCODING,
+))
+
+# tokens which are not part of a statement, so do not affect whether we
+# are at the start of one.
+_NON_CODE_TOKENS = frozenset((
+    tokenize.NL,
+    tokenize.COMMENT,
+    tokenize.ENCODING,
+))
+
+# tokens which start a new statement.
+_STATEMENT_START_TOKENS = frozenset((
+    tokenize.NEWLINE,
+    tokenize.INDENT,
+    tokenize.DEDENT,
+))
+
+_DEFINITION_KEYWORDS = frozenset(('def', 'class'))
+
+_OPEN_BRACKETS = frozenset('([{')
+_CLOSE_BRACKETS = frozenset(')]}')
+
+# string prefix characters which stop a string literal from being a docstring.
+_NON_DOCSTRING_PREFIXES = frozenset('bBfF')
+
+
+def is_docstring_literal(token):
+    """Check whether a string token can be used as a docstring.
+
+    Bytes literals and f-strings are not docstrings, even when they are the
+    first statement of a body.
+
+    Args:
+        token: the string token to check.
+
+    Returns:
+        bool: True if the string token can be a docstring; False otherwise.
+    """
+    for char in token:
+        if char in '\'"':
+            return True
+        if char in _NON_DOCSTRING_PREFIXES:
+            return False
+    return False
+
+
+def iter_strings(tokens, at_module_start=True):
+    """Classify the string tokens of a token stream as docstrings or not.
+
+    Whether a string is a docstring is only known once the statement it
+    starts has ended, so a docstring candidate is held back until the next
+    token which is part of the code. Strings are still yielded in the
+    order they appear in the token stream.
+
+    Args:
+        tokens: the tokens from the token stream to classify, as 5-tuples
+            (or TokenInfo) like those produced by the tokenize module.
+        at_module_start: whether the tokens start at the start of the
+            module (default True). If False, they have to start at the
+            start of a statement which is not the first of a module, class
+            or function body, e.g. to classify the strings of part of a
+            module.
+
+    Yields:
+        tuple: (token, start row, start column, is docstring) for each
+        string token in the stream.
+    """
+    # whether the next statement is the first of a module, class or function.
+    expect_docstring = at_module_start
+    # whether the next code token starts a statement.
+    at_statement_start = True
+    # whether we are in a def/class header, waiting for its colon.
+    in_header = False
+    depth = 0
+    # the string tokens of a statement which may be a docstring.
+    pending = []
+
+    for tok_type, token, (start_row, start_col), _, _ in tokens:
+        if pending:
+            if tok_type == tokenize.STRING:
+                # implicitly concatenated strings are all part of the docstring.
+                pending.append((token, start_row, start_col))
+                continue
+
+            if tok_type in _NON_CODE_TOKENS:
+                continue
+
+            # the docstring statement has to end right after the string(s).
+            is_docstring = tok_type in (tokenize.NEWLINE, tokenize.ENDMARKER) or token == ';'
+            for string in pending:
+                yield string + (is_docstring,)
+            pending = []
+
+        if expect_docstring:
+            if tok_type in _SKIP_TOKENS:
+                if tok_type in _STATEMENT_START_TOKENS:
+                    at_statement_start = True
+                continue
+
+            expect_docstring = False
+            if tok_type == tokenize.STRING and is_docstring_literal(token):
+                pending.append((token, start_row, start_col))
+                at_statement_start = False
+                continue
+
+        if tok_type in _NON_CODE_TOKENS:
+            continue
+
+        if tok_type == tokenize.STRING:
+            yield token, start_row, start_col, False
+
+        elif tok_type == tokenize.OP:
+            if token in _OPEN_BRACKETS:
+                depth += 1
+            elif token in _CLOSE_BRACKETS:
+                depth -= 1
+            elif depth == 0 and token == ':' and in_header:
+                # the colon ending the header; the body starts right after it.
+                in_header = False
+                expect_docstring = True
+                at_statement_start = True
+                continue
+            elif depth == 0 and token == ';':
+                at_statement_start = True
+                continue
+
+        elif tok_type == tokenize.NAME and at_statement_start:
+            if token in _DEFINITION_KEYWORDS:
+                in_header = True
+            elif token == 'async':
+                # 'async def' -- the def is still at the start of the statement.
+                continue
+
+        at_statement_start = tok_type in _STATEMENT_START_TOKENS
+
+    for string in pending:
+        yield string + (True,)
@@ -0,0 +1,473 @@
+"""Quote checking on the token stream, independent of pylint.
+
+This holds the quote classification used by the pylint checker, so the
+same checks can run directly on the output of the tokenize module without
+pylint or astroid -- see the `pylint-quotes` command line tool.
+"""
+
+from __future__ import absolute_import
+
+import collections
+import contextlib
+import functools
+import io
+import mmap
+import tokenize
+
+from pylint_quotes import docstrings
+from pylint_quotes import scanner as _scanner
+
+CONFIG_OPTS = ('single', 'double')
+SMART_CONFIG_OPTS = tuple('%s-avoid-escape' % c for c in CONFIG_OPTS)
+
+QUOTES = ('\'', '"')
+
+SINGLE_QUOTE_OPTS = dict(zip(CONFIG_OPTS, QUOTES))
+SMART_QUOTE_OPTS = dict(zip(CONFIG_OPTS + SMART_CONFIG_OPTS, QUOTES + QUOTES))
+TRIPLE_QUOTE_OPTS = dict(zip(CONFIG_OPTS, [q * 3 for q in QUOTES]))
+
+# the ways of finding the strings of a source: a single regex pass (see
+# `pylint_quotes.scanner`), which falls back to tokenizing it, or always
+# tokenizing it.
+SCANNERS = ('regex', 'tokenize')
+
+_QUOTE_CHARS = frozenset(QUOTES)
+# the triple quote, keyed by its quote character.
+_TRIPLE_QUOTES = {q: q * 3 for q in QUOTES}
+
+MSGS = {
+    'C4001': (
+        'Invalid string quote %s, should be %s',
+        'invalid-string-quote',
+        'Used when the string quote character does not match the '
+        'value configured in the `string-quote` option.'
+    ),
+    'C4002': (
+        'Invalid triple quote %s, should be %s',
+        'invalid-triple-quote',
+        'Used when the triple quote characters do not match the '
+        'value configured in the `triple-quote` option.'
+    ),
+    'C4003': (
+        'Invalid docstring quote %s, should be %s',
+        'invalid-docstring-quote',
+        'Used when the docstring quote characters do not match the '
+        'value configured in the `docstring-quote` option.'
+    )
+}
+
+# message ids, keyed by message symbol.
+MSG_IDS = {symbol: msg_id for msg_id, (_, symbol, _) in MSGS.items()}
+
+QuoteConfig = collections.namedtuple(
+    'QuoteConfig', ['string_quote', 'triple_quote', 'docstring_quote']
+)
+QuoteConfig.__new__.__defaults__ = (CONFIG_OPTS[0], CONFIG_OPTS[0], CONFIG_OPTS[1])
+QuoteConfig.__doc__ = """The quote configuration to check against.
+
+Each field takes the same values as the checker option of the same name.
+"""
+
+
+class Violation(collections.namedtuple(
+        'Violation', ['symbol', 'row', 'col', 'quote', 'correct_quote'])):
+    """A string whose quotes do not match the configuration.
+
+    Attributes:
+        symbol: the symbol of the message for the violation, e.g.
+            'invalid-string-quote'.
+        row: the row the string starts on.
+        col: the column the string starts on.
+        quote: the quote characters that were found.
+        correct_quote: the quote characters that are required.
+    """
+
+    __slots__ = ()
+
+    @property
+    def msg_id(self):
+        """str: the id of the message for the violation, e.g. 'C4001'."""
+        return MSG_IDS[self.symbol]
+
+    @property
+    def msg(self):
+        """str: the text of the message for the violation."""
+        return MSGS[self.msg_id][0] % (self.quote, self.correct_quote)
+
+
+def get_quote(token):
+    """Get the quote characters which open a string token.
+
+    Prefix markers like u, b, r are ignored.
+
+    Args:
+        token: the whole un-parsed string token.
+
+    Returns:
+        tuple: the index of the opening quote in the token, and the quote
+        characters -- three characters for a triple quote, otherwise one.
+    """
+    for i, char in enumerate(token):
+        if char in QUOTES:
+            break
+
+    # only slice out the quote characters, not the rest of the string.
+    # pylint: disable=undefined-loop-variable
+    norm_quote = token[i:i + 3]
+
+    # triple-quote strings
+    if len(norm_quote) == 3 and norm_quote in TRIPLE_QUOTE_OPTS.values():
+        return i, norm_quote
+    return i, norm_quote[0]
+
+
+def get_preferred_quote(token, start, string_quote):
+    """Get the quote a string literal should use.
+
+    Args:
+        token: the whole un-parsed string token.
+        start: the index of the opening quote in the token.
+        string_quote: the `string-quote` option value.
+
+    Returns:
+        str: the quote character the string literal should use.
+    """
+    preferred_quote = SMART_QUOTE_OPTS.get(string_quote)
+
+    # Smart case.
+    if string_quote in SMART_CONFIG_OPTS:
+        other_quote = next(q for q in QUOTES if q != preferred_quote)
+        # If using the other quote avoids escaping, we switch to the other quote.
+        if preferred_quote in token[start + 1:-1] and other_quote not in token[start + 1:-1]:
+            preferred_quote = other_quote
+
+    return preferred_quote
+
+
+class QuoteClassifier:
+    """The quote checks for a single configuration, compiled ahead of time.
+
+    The preferred and alternate quotes of each kind of string are resolved
+    from the configuration once, so classifying a token needs no option
+    lookups, and the checks only ever index into the token -- the string
+    body is never sliced out. Use `QuoteClassifier.compile` to get the
+    classifier for a configuration.
+
+    Attributes:
+        string_quote: the preferred quote of single quoted strings.
+        alternate_quote: the other quote, which `*-avoid-escape`
+            configurations switch to when it avoids escaping.
+        smart: whether the configuration is an `*-avoid-escape` one.
+        triple_quote: the required quote of triple quoted strings.
+        docstring_quote: the required quote of docstrings.
+    """
+
+    __slots__ = ('string_quote', 'alternate_quote', 'smart', 'triple_quote', 'docstring_quote')
+
+    def __init__(self, config):
+        self.string_quote = SMART_QUOTE_OPTS[config.string_quote]
+        self.alternate_quote = QUOTES[1] if self.string_quote == QUOTES[0] else QUOTES[0]
+        self.smart = config.string_quote in SMART_CONFIG_OPTS
+        self.triple_quote = TRIPLE_QUOTE_OPTS[config.triple_quote]
+        self.docstring_quote = TRIPLE_QUOTE_OPTS[config.docstring_quote]
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def compile(config):
+        """Get the classifier for a configuration.
+
+        Classifiers are cached, so each configuration is only compiled once.
+
+        Args:
+            config: the QuoteConfig to compile.
+
+        Returns:
+            QuoteClassifier: the classifier for the configuration.
+        """
+        return QuoteClassifier(config)
+
+    @staticmethod
+    def opening(token):
+        """Get the quote characters which open a string token.
+
+        The same as `get_quote`, except that the quote is always one of the
+        QUOTES or TRIPLE_QUOTE_OPTS constants, never a slice of the token.
+
+        Args:
+            token: the whole un-parsed string token.
+
+        Returns:
+            tuple: the index of the opening quote in the token, and the quote
+            characters.
+        """
+        # string prefixes are at most two characters long.
+        start = 0 if token[0] in _QUOTE_CHARS else 1 if token[1] in _QUOTE_CHARS else 2
+        quote = token[start]
+        # a triple quoted string is at least six quotes long; a shorter
+        # token opened by a pair of quotes is an empty string.
+        if len(token) > start + 5 and token[start + 1] == quote and token[start + 2] == quote:
+            return start, _TRIPLE_QUOTES[quote]
+        return start, quote
+
+    def preferred(self, token, start):
+        """Get the quote a single quoted string token should use.
+
+        Args:
+            token: the whole un-parsed string token.
+            start: the index of the opening quote in the token.
+
+        Returns:
+            str: the quote character the string should use.
+        """
+        if not self.smart:
+            return self.string_quote
+
+        # switch to the alternate quote if that avoids escaping.
+        end = len(token) - 1
+        if token.find(self.string_quote, start + 1, end) != -1 \
+                and token.find(self.alternate_quote, start + 1, end) == -1:
+            return self.alternate_quote
+        return self.string_quote
+
+    def check(self, token, row, col, is_docstring):
+        """Check a single string token.
+
+        Args:
+            token: the whole un-parsed string token.
+            row: the row the token starts on.
+            col: the column the token starts on.
+            is_docstring: whether the token is a docstring.
+
+        Returns:
+            Violation: the violation for the token, or None if it is valid.
+        """
+        start, quote = self.opening(token)
+
+        if len(quote) == 3:
+            if is_docstring:
+                if quote != self.docstring_quote:
+                    return Violation(
+                        'invalid-docstring-quote', row, col, quote, self.docstring_quote)
+            elif quote != self.triple_quote:
+                return Violation('invalid-triple-quote', row, col, quote, self.triple_quote)
+            return None
+
+        correct_quote = self.preferred(token, start)
+        if quote != correct_quote:
+            return Violation('invalid-string-quote', row, col, quote, correct_quote)
+        return None
+
+
+def check_string(token, row, col, is_docstring, config):
+    """Check a single string token against the configuration.
+
+    Args:
+        token: the whole un-parsed string token.
+        row: the row the token starts on.
+        col: the column the token starts on.
+        is_docstring: whether the token is a docstring.
+        config: the QuoteConfig to check against.
+
+    Returns:
+        Violation: the violation for the token, or None if it is valid.
+    """
+    return QuoteClassifier.compile(config).check(token, row, col, is_docstring)
+
+
+def check_tokens(tokens, config, lines=None):
+    """Check the strings of a token stream against the configuration.
+
+    Args:
+        tokens: the tokens from the token stream to check.
+        config: the QuoteConfig to check against.
+        lines: the lines to check (e.g. a diff.LineRanges), as an object with
+            an `overlaps(first, last)` method. Strings which do not touch any
+            of the lines are skipped. If None (default), all strings are checked.
+
+    Yields:
+        Violation: each violation found, in token order.
+    """
+    return check_strings(docstrings.iter_strings(tokens), config, lines)
+
+
+def check_strings(strings, config, lines=None):
+    """Check classified strings against the configuration.
+
+    Args:
+        strings: the (token, row, col, is docstring) of each string, as
+            from `docstrings.iter_strings`.
+        config: the QuoteConfig to check against.
+        lines: the lines to restrict the check to; see `check_tokens`.
+
+    Yields:
+        Violation: each violation found, in the order of the strings.
+    """
+    check = QuoteClassifier.compile(config).check
+    for token, row, col, is_docstring in strings:
+        if lines is not None and not lines.overlaps(row, row + token.count('\n')):
+            continue
+        violation = check(token, row, col, is_docstring)
+        if violation:
+            yield violation
+
+
+@contextlib.contextmanager
+def map_file(path):
+    """Map a file into memory read-only, rather than reading it in.
+
+    Its pages are read in by the OS as they are touched, and are not
+    copied into the process; the source is only copied a line at a time
+    as it is tokenized.
+
+    Args:
+        path: the path to the file.
+
+    Yields:
+        mmap.mmap: the file contents, or empty bytes for an empty file
+        (which cannot be mapped).
+
+    Raises:
+        OSError: the file could not be read.
+    """
+    with open(path, 'rb') as f:
+        try:
+            content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            yield b''
+            return
+    with content:
+        yield content
+
+
+class _MappedLines:
+    """Read the lines of a memory-mapped file, unmapping the pages already
+    read as it goes, so they do not stay part of the resident set of the
+    process for the rest of the check.
+
+    The pages stay in the OS page cache; they are only dropped from the
+    mapping, and read back from the cache if touched again.
+    """
+
+    __slots__ = ('content', 'released')
+
+    # how much of the file is read past the last unmapped page before the
+    # pages read are unmapped; a multiple of the page size.
+    RELEASE_SIZE = 1 << 20
+
+    def __init__(self, content):
+        self.content = content
+        self.released = 0
+        content.seek(0)
+
+    def readline(self):
+        """Read the next line.
+
+        Returns:
+            bytes: the line, or empty bytes at the end of the file.
+        """
+        line = self.content.readline()
+        position = self.content.tell()
+        if position - self.released >= self.RELEASE_SIZE:
+            end = position - position % mmap.PAGESIZE
+            self.content.madvise(mmap.MADV_DONTNEED, self.released, end - self.released)
+            self.released = end
+        return line
+
+
+def _readline(content):
+    """Get a readline function over source in memory, which does not copy
+    the source as a whole.
+
+    Args:
+        content: the source, as bytes or an mmap.
+
+    Returns:
+        callable: the readline function, returning a line of bytes per call.
+    """
+    if isinstance(content, mmap.mmap):
+        if hasattr(mmap, 'MADV_DONTNEED'):
+            return _MappedLines(content).readline
+        content.seek(0)
+        return content.readline
+    # the buffer of the bytes is shared until written to.
+    return io.BytesIO(content).readline
+
+
+def check_file(path, config, lines=None, scanner='regex'):
+    """Check the strings of a python source file against the configuration.
+
+    The file is memory-mapped rather than read in (see `map_file`), and
+    its encoding is detected the same way the interpreter does it.
+
+    Args:
+        path: the path to the file to check.
+        config: the QuoteConfig to check against.
+        lines: the lines to restrict the check to; see `check_tokens`.
+        scanner: how to find the strings of the file; one of SCANNERS.
+
+    Returns:
+        list[Violation]: the violations found, in token order.
+
+    Raises:
+        OSError: the file could not be read.
+        SyntaxError: the file could not be decoded.
+        tokenize.TokenError: the file could not be tokenized.
+    """
+    with map_file(path) as content:
+        return check_bytes(content, config, lines, scanner)
+
+
+def check_bytes(content, config, lines=None, scanner='regex'):
+    """Check the strings of python source, given as bytes, against the
+    configuration.
+
+    The source encoding is detected the same way the interpreter does it.
+
+    Args:
+        content: the source to check, as bytes or an mmap (e.g. from
+            `map_file`).
+        config: the QuoteConfig to check against.
+        lines: the lines to restrict the check to; see `check_tokens`.
+        scanner: how to find the strings of the source; one of SCANNERS.
+            With 'regex' (default), sources the scanner cannot handle are
+            tokenized instead, so the result is the same either way.
+
+    Returns:
+        list[Violation]: the violations found, in token order.
+
+    Raises:
+        SyntaxError: the source could not be decoded.
+        tokenize.TokenError: the source could not be tokenized.
+    """
+    if scanner == 'regex':
+        try:
+            return list(check_strings(_scanner.iter_strings(content), config, lines))
+        except _scanner.ScanError:
+            pass
+    return list(check_tokens(tokenize.tokenize(_readline(content)), config, lines))
+
+
+def find_strings(content, scanner='regex'):
+    """Find the strings of python source, given as bytes, the same way the
+    checks find them.
+
+    Args:
+        content: the source, as bytes or an mmap.
+        scanner: how to find the strings of the source; one of SCANNERS.
+            With 'regex' (default), sources the scanner cannot handle are
+            tokenized instead.
+
+    Returns:
+        list[tuple]: the (token, row, col, is_docstring) of each string, in
+        token order (see `docstrings.iter_strings`).
+
+    Raises:
+        SyntaxError: the source could not be decoded.
+        tokenize.TokenError: the source could not be tokenized.
+    """
+    if scanner == 'regex':
+        try:
+            return list(_scanner.iter_strings(content))
+        except _scanner.ScanError:
+            pass
+    return list(docstrings.iter_strings(tokenize.tokenize(_readline(content))))
@@ -0,0 +1,224 @@
+"""Rewrite the quotes of strings which violate the configuration.
+
+The strings of a source are found the same way the checks find them (see
+`engine.check_bytes`), and each violating one is rewritten in place from
+its token position: the prefix (`r`, `b`, `u`, `f`, ...) is kept, and the
+content is re-escaped for the new quotes. A string whose content cannot be
+re-escaped without changing its value -- e.g. a raw string or an f-string
+containing the new quote -- is left as it is.
+
+Every rewritten string is checked to parse to the same expression as the
+original, and the whole rewritten source to tokenize and parse to the same
+AST, before a file is written. All edits to a file are written at once,
+to a temporary file which then replaces it.
+"""
+
+from __future__ import absolute_import
+
+import ast
+import io
+import os
+import shutil
+import tempfile
+import tokenize
+
+from pylint_quotes import engine
+
+
+def _escape(body, quote, keep):
+    """Escape the unescaped occurrences of a quote in the content of a
+    string.
+
+    Args:
+        body: the content of the string, between its quotes.
+        quote: the quote character to escape.
+        keep: the quote character whose escapes are kept as they are;
+            escapes of `quote` itself are always kept, and those of any
+            other quote are dropped.
+
+    Returns:
+        str: the escaped content.
+    """
+    out = []
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char == '\\':
+            escaped = body[i + 1:i + 2]
+            if escaped in engine.QUOTES and escaped != quote and escaped != keep:
+                # an escaped quote which no longer needs to be.
+                out.append(escaped)
+            else:
+                out.append(body[i:i + 2])
+            i += 2
+            continue
+        out.append('\\' + char if char == quote else char)
+        i += 1
+    return ''.join(out)
+
+
+def requote(token, quote):
+    """Rewrite a string token to use other quotes, without changing its value.
+
+    Args:
+        token: the whole un-parsed string token.
+        quote: the quote to use, e.g. `'` or `\"\"\"`; a triple quote for a
+            triple quoted token, a single quote character otherwise.
+
+    Returns:
+        str: the rewritten token, or None if its content cannot be
+        re-escaped for the quote without changing its value.
+    """
+    start, old = engine.QuoteClassifier.opening(token)
+    prefix = token[:start].lower()
+    body = token[start + len(old):len(token) - len(old)]
+    char = quote[0]
+
+    if len(quote) == 3:
+        # only a run of three quotes, or one right before the closing ones,
+        # would end the string early.
+        if quote in body or body.endswith(char):
+            if 'r' in prefix or 'f' in prefix:
+                return None
+            body = _escape(body, char, keep=old[0])
+    elif 'r' in prefix:
+        # escapes are part of the value of a raw string.
+        if char in body:
+            return None
+    elif 'f' in prefix and char in body:
+        # the quote could be in a replacement field, which cannot be escaped.
+        return None
+    else:
+        body = _escape(body, char, keep=char)
+
+    return token[:start] + quote + body + quote
+
+
+class FixError(Exception):
+    """The fixed source does not parse to the same AST as the original."""
+
+
+def _same_value(token, fixed):
+    """Check that two string tokens parse to the same expression."""
+    try:
+        return ast.dump(ast.parse(token, mode='eval')) == ast.dump(ast.parse(fixed, mode='eval'))
+    except SyntaxError:
+        return False
+
+
+def fix_source(content, config, lines=None, scanner='regex'):
+    """Rewrite the strings of a source which violate the configuration.
+
+    Args:
+        content: the source, as bytes.
+        config: the engine.QuoteConfig to check against.
+        lines: the lines to restrict the fixes to; see engine.check_tokens.
+        scanner: how to find the strings of the source; one of
+            engine.SCANNERS.
+
+    Returns:
+        tuple: the fixed source as bytes, the engine.Violation list of the
+        strings which were rewritten, and the violations left in the fixed
+        source.
+
+    Raises:
+        SyntaxError: the source could not be decoded or parsed.
+        tokenize.TokenError: the source could not be tokenized.
+        FixError: the fixed source did not parse to the same AST.
+    """
+    strings = engine.find_strings(content, scanner)
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(content).readline)
+    text = content.decode(encoding)
+    line_starts = [0]
+    position = text.find('\n')
+    while position != -1:
+        line_starts.append(position + 1)
+        position = text.find('\n', position + 1)
+
+    check = engine.QuoteClassifier.compile(config).check
+    edits = []
+    fixed = []
+    for token, row, col, is_docstring in strings:
+        if lines is not None and not lines.overlaps(row, row + token.count('\n')):
+            continue
+        violation = check(token, row, col, is_docstring)
+        if violation is None:
+            continue
+        replacement = requote(token, violation.correct_quote)
+        if replacement is not None and _same_value(token, replacement):
+            start = line_starts[row - 1] + col
+            edits.append((start, start + len(token), replacement))
+            fixed.append(violation)
+
+    if not edits:
+        return content, [], engine.check_bytes(content, config, lines, scanner)
+
+    parts = []
+    position = 0
+    for start, end, replacement in edits:
+        parts.append(text[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(text[position:])
+    fixed_content = ''.join(parts).encode(encoding)
+
+    # re-tokenize the fixed source, which has to parse to the same AST.
+    remaining = engine.check_bytes(fixed_content, config, lines, scanner)
+    if ast.dump(ast.parse(fixed_content)) != ast.dump(ast.parse(content)):
+        raise FixError('fixing the quotes would change the AST')
+    return fixed_content, fixed, remaining
+
+
+def write_atomic(path, content):
+    """Replace the content of a file in one go, so it is never seen half
+    written.
+
+    The content is written to a temporary file next to it, with the same
+    permissions, which then replaces it. A symlink is followed, so the file
+    it points to is replaced rather than the link.
+
+    Args:
+        path: the path to the file.
+        content: the new content, as bytes.
+
+    Raises:
+        OSError: the file could not be written.
+    """
+    path = os.path.realpath(path)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def fix_file(path, config, lines=None, scanner='regex'):
+    """Rewrite the strings of a file which violate the configuration.
+
+    Args:
+        path: the path to the file.
+        config: the engine.QuoteConfig to check against.
+        lines: the lines to restrict the fixes to; see engine.check_tokens.
+        scanner: how to find the strings of the file; one of
+            engine.SCANNERS.
+
+    Returns:
+        tuple: the engine.Violation list of the strings which were
+        rewritten, and the violations left in the file.
+
+    Raises:
+        OSError: the file could not be read or written.
+        SyntaxError: the file could not be decoded or parsed.
+        tokenize.TokenError: the file could not be tokenized.
+        FixError: the fixed file did not parse to the same AST.
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+    fixed_content, fixed, remaining = fix_source(content, config, lines, scanner)
+    if fixed:
+        write_atomic(path, fixed_content)
+    return fixed, remaining
@@ -0,0 +1,292 @@
+"""Resumable migration of a whole tree to the configured quotes.
+
+Each file is fixed the same way as with `pylint-quotes check --fix` (see
+`pylint_quotes.fix`), by a pool of worker processes. Files are handed out
+biggest first (see `runner.schedule`), and their results are taken in the
+order they finish.
+
+Progress is recorded in a journal: a file of JSON lines, the first one
+holding the configuration being migrated to, then one for each file once
+it is done, written and flushed as soon as it is. A run given the journal
+of an interrupted one skips the files it already finished, unless they
+changed since -- their size or modification time differs from the one
+recorded -- or they could not be fixed. A file which was fixed but not
+recorded before the interruption is simply fixed again, which leaves it as
+it is.
+"""
+
+from __future__ import absolute_import
+
+import collections
+import concurrent.futures
+import json
+import os
+import time
+
+from pylint_quotes import engine, fix, prefilter, runner
+from pylint_quotes.__version__ import __version__
+
+# the errors a file can fail to be fixed with: those it can fail to be
+# checked with, or the fixed file not parsing to the same AST.
+FIX_ERRORS = runner.CHECK_ERRORS + (fix.FixError,)
+
+FileMigration = collections.namedtuple('FileMigration', 'result fixed size mtime_ns')
+"""The outcome of migrating a single file.
+
+Attributes:
+    result: the runner.CheckResult for the file, with the violations left
+        once it was fixed.
+    fixed: the number of strings which were rewritten.
+    size: the size of the file once it was fixed, or None if it could not
+        be.
+    mtime_ns: the modification time of the file once it was fixed, in
+        nanoseconds, or None if it could not be.
+"""
+
+
+class Journal:
+    """The record of the files a migration is done with.
+
+    Attributes:
+        path: the path of the journal file.
+        config: the engine.QuoteConfig being migrated to.
+        entries: the last entry recorded for each file, keyed by its
+            absolute path.
+    """
+
+    __slots__ = ('path', 'config', 'entries', '_file')
+
+    def __init__(self, path, config):
+        """Open a journal, creating it if it does not exist.
+
+        Args:
+            path: the path of the journal file.
+            config: the engine.QuoteConfig being migrated to.
+
+        Raises:
+            OSError: the journal could not be read or created.
+            ValueError: the journal is not one, or is for another
+                configuration.
+        """
+        self.path = path
+        self.config = config
+        self.entries = {}
+
+        try:
+            with open(path, 'r') as f:
+                lines = f.read().split('\n')
+        except FileNotFoundError:
+            lines = []
+
+        if lines and lines[0]:
+            try:
+                header = json.loads(lines[0])
+            except ValueError:
+                header = None
+            if not isinstance(header, dict) or 'config' not in header:
+                raise ValueError('{} is not a migration journal'.format(path))
+            if header['config'] != list(config):
+                raise ValueError('{} is the journal of a migration to {}'.format(
+                    path, ', '.join(header['config'])))
+            # the last line is empty, or left incomplete by an interruption.
+            for line in lines[1:-1]:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self.entries[entry['path']] = entry
+
+        self._file = open(path, 'a')
+        if not lines or not lines[0]:
+            self._write({'pylint-quotes': __version__, 'config': list(config)})
+        elif lines[-1]:
+            # start the next entry on a line of its own.
+            self._file.write('\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the journal file."""
+        self._file.close()
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, sort_keys=True) + '\n')
+        self._file.flush()
+
+    def is_done(self, path):
+        """Check whether a file is done with, and has not changed since.
+
+        Args:
+            path: the path of the file.
+
+        Returns:
+            bool: True if the file was fixed and is as it was left.
+        """
+        entry = self.entries.get(os.path.abspath(path))
+        if entry is None or entry.get('error'):
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+
+    def record(self, migration):
+        """Record that a file is done with.
+
+        Args:
+            migration: the FileMigration of the file.
+        """
+        result = migration.result
+        entry = {
+            'path': os.path.abspath(result.path),
+            'size': migration.size,
+            'mtime_ns': migration.mtime_ns,
+            'fixed': migration.fixed,
+            'remaining': len(result.violations),
+            'error': result.error[4] if result.error else None,
+        }
+        self.entries[entry['path']] = entry
+        self._write(entry)
+
+
+class MigrationSummary:
+    """The totals of a migration run.
+
+    Attributes:
+        files: the number of files migrated by the run.
+        changed: the number of files which were rewritten.
+        rewritten: the number of strings which were rewritten.
+        remaining: the number of violations left, in the files migrated by
+            the run and in those resumed from the journal.
+        errors: the number of files which could not be fixed.
+        resumed: the number of files skipped as done in the journal.
+        elapsed: the time the run took, in seconds.
+    """
+
+    __slots__ = ('files', 'changed', 'rewritten', 'remaining', 'errors', 'resumed', 'elapsed')
+
+    def __init__(self):
+        self.files = 0
+        self.changed = 0
+        self.rewritten = 0
+        self.remaining = 0
+        self.errors = 0
+        self.resumed = 0
+        self.elapsed = 0.0
+
+    @property
+    def files_per_second(self):
+        """float: the number of files migrated per second."""
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def rewritten_per_second(self):
+        """float: the number of strings rewritten per second."""
+        return self.rewritten / self.elapsed if self.elapsed else 0.0
+
+    def add(self, migration):
+        """Count the outcome of migrating a file.
+
+        Args:
+            migration: the FileMigration of the file.
+        """
+        self.files += 1
+        self.changed += bool(migration.fixed)
+        self.rewritten += migration.fixed
+        self.remaining += len(migration.result.violations)
+        self.errors += bool(migration.result.error)
+
+
+def migrate_path(path, config, scanner='regex'):
+    """Fix a single file, capturing any failure to read, fix or write it.
+
+    Args:
+        path: the path to the file.
+        config: the engine.QuoteConfig to migrate to.
+        scanner: how to find the strings of the file; one of
+            engine.SCANNERS.
+
+    Returns:
+        FileMigration: the outcome of migrating the file.
+    """
+    try:
+        with engine.map_file(path) as content:
+            if prefilter.could_violate(content, config):
+                fixed_content, fixed, remaining = fix.fix_source(
+                    bytes(content), config, scanner=scanner,
+                )
+            else:
+                fixed, remaining = [], []
+        if fixed:
+            fix.write_atomic(path, fixed_content)
+        stat = os.stat(path)
+    except FIX_ERRORS as e:
+        return FileMigration(runner.error_result(path, e), 0, None, None)
+    return FileMigration(
+        runner.CheckResult(path, remaining), len(fixed), stat.st_size, stat.st_mtime_ns,
+    )
+
+
+# the options are those of the migrate command.
+def migrate(  # pylint: disable=too-many-arguments
+        paths, config, jobs=1, journal=None, summary=None, scanner='regex'):
+    """Fix the files, in parallel if more than one job is requested.
+
+    Args:
+        paths: the paths of the files to fix.
+        config: the engine.QuoteConfig to migrate to.
+        jobs: the number of worker processes to use. If 0, one worker per
+            CPU is used. With 1 (default), files are fixed in this process.
+        journal: the Journal to skip the files already done with, and to
+            record those done by this run in. If None (default), every file
+            is fixed and nothing is recorded.
+        summary: a MigrationSummary, updated in place as the files are
+            done with.
+        scanner: how to find the strings of each file; one of
+            engine.SCANNERS.
+
+    Yields:
+        FileMigration: the outcome for each file not skipped, in the order
+        they are done with.
+    """
+    if summary is None:
+        summary = MigrationSummary()
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    start = time.perf_counter()
+
+    todo = []
+    for path in paths:
+        if journal is not None and journal.is_done(path):
+            summary.resumed += 1
+            summary.remaining += journal.entries[os.path.abspath(path)]['remaining']
+        else:
+            todo.append(path)
+
+    def done(migration):
+        if journal is not None:
+            journal.record(migration)
+        summary.add(migration)
+        summary.elapsed = time.perf_counter() - start
+        return migration
+
+    try:
+        if jobs == 1 or len(todo) < 2:
+            for path in todo:
+                yield done(migrate_path(path, config, scanner))
+            return
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(migrate_path, path, config, scanner)
+                for path in runner.schedule(todo)
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                yield done(future.result())
+    finally:
+        summary.elapsed = time.perf_counter() - start
@@ -0,0 +1,55 @@
+"""The state of the checker for the module it is checking."""
+
+from __future__ import absolute_import
+
+from pylint_quotes.triple_quotes import TripleQuoteIndex
+
+
+class ModuleState:
+    """The state of checking a single module.
+
+    A fresh state is started for each module, when its tokens are processed,
+    and dropped once the module is left. Nothing about a module is kept on
+    the class or shared between checker instances, so each instance can
+    check modules independently of the others -- e.g. one per thread.
+
+    Attributes:
+        triple_quotes: the TripleQuoteIndex of the triple quotes waiting to
+            be matched to docstrings by the AST walk.
+        skipped: the symbols of the messages disabled for the whole module.
+        disabled_lines: the diff.LineRanges each message is disabled on, for
+            messages only disabled on some lines, keyed by symbol.
+        baseline: the baseline.Matcher of the violations of the module
+            recorded in the baseline, or None if there are none.
+        summary: the QuoteSummary the violations of the module are counted
+            in, or None if a message is added for each.
+    """
+
+    __slots__ = ('triple_quotes', 'skipped', 'disabled_lines', 'baseline', 'summary')
+
+    def __init__(self, skipped=frozenset(), disabled_lines=None):
+        self.triple_quotes = TripleQuoteIndex()
+        self.skipped = skipped
+        self.disabled_lines = disabled_lines or {}
+        self.baseline = None
+        self.summary = None
+
+    @property
+    def restricted(self):
+        """bool: whether any message is disabled for any part of the module."""
+        return bool(self.skipped or self.disabled_lines)
+
+    def is_disabled(self, symbol, row):
+        """Check whether a message is disabled on a row.
+
+        Args:
+            symbol: the symbol of the message.
+            row: the row the message would be added on.
+
+        Returns:
+            bool: True if the message would not be reported on the row.
+        """
+        if symbol in self.skipped:
+            return True
+        lines = self.disabled_lines.get(symbol)
+        return lines is not None and lines.overlaps(row, row)
@@ -0,0 +1,148 @@
+"""Lint many sources at once on a pool of threads, in-process.
+
+Each thread runs its own StringQuoteChecker, and each module is checked
+with its own checker state (see `module_state.ModuleState`), so
+sources can be linted concurrently without sharing anything but the
+configuration. This is meant for embedding the checks in a long-running,
+threaded service; the results are the same as checking the sources one
+after the other.
+
+Unlike `pylint_quotes.runner`, this runs the pylint checker itself, so
+the 'ast' docstring detection mode is available too.
+"""
+
+from __future__ import absolute_import
+
+import concurrent.futures
+import io
+import threading
+import tokenize
+
+import astroid
+from astroid import nodes
+
+from pylint_quotes import engine
+from pylint_quotes.checker import StringQuoteChecker
+
+
+class _Collector:
+    """The part of the linter interface the checker reports messages through.
+
+    Attributes:
+        violations: the engine.Violation for each message added.
+    """
+
+    def __init__(self):
+        self.violations = []
+
+    @staticmethod
+    def is_message_enabled(msg_descr, line=None):  # pylint: disable=unused-argument
+        """Every message is enabled, as no configuration is read."""
+        return True
+
+    # pylint: disable=too-many-arguments,unused-argument
+    def add_message(self, msgid, line=None, node=None, args=None, confidence=None, col_offset=None):
+        """Record a message from the checker."""
+        self.violations.append(engine.Violation(msgid, line, col_offset, args[0], args[1]))
+
+
+class SourceLinter:
+    """Lints sources with the plugin's checker, on a pool of threads.
+
+    Args:
+        config: the engine.QuoteConfig to check against. If None (default),
+            the default configuration is used.
+        docstring_detection: the `docstring-detection` option value.
+        max_workers: the number of threads to use. With 1, sources are
+            linted in the calling thread. If None (default), the thread pool
+            executor's default is used.
+    """
+
+    def __init__(self, config=None, docstring_detection='tokens', max_workers=None):
+        self.config = config or engine.QuoteConfig()
+        self.docstring_detection = docstring_detection
+        self.max_workers = max_workers
+        self._local = threading.local()
+
+    def _checker(self):
+        """Get the checker of the current thread, creating it on first use."""
+        checker = getattr(self._local, 'checker', None)
+        if checker is None:
+            checker = StringQuoteChecker(_Collector())
+            checker.config.string_quote = self.config.string_quote
+            checker.config.triple_quote = self.config.triple_quote
+            checker.config.docstring_quote = self.config.docstring_quote
+            checker.config.docstring_detection = self.docstring_detection
+            checker.open()
+            self._local.checker = checker
+        return checker
+
+    def lint(self, source):
+        """Lint a single source.
+
+        Args:
+            source: the module source, as text.
+
+        Returns:
+            list[engine.Violation]: the violations found, in the order the
+            checker reported them.
+
+        Raises:
+            tokenize.TokenError: the source could not be tokenized.
+            astroid.AstroidSyntaxError: the source could not be parsed, with
+                'ast' docstring detection.
+        """
+        checker = self._checker()
+        collector = checker.linter
+        collector.violations = []
+
+        checker.process_tokens(tokenize.generate_tokens(io.StringIO(source).readline))
+        module = None
+        if self.docstring_detection == 'ast':
+            module = astroid.parse(source)
+            # the same order pylint's walk visits the definitions in.
+            checker.visit_module(module)
+            for node in module.nodes_of_class((nodes.ClassDef, nodes.FunctionDef)):
+                if isinstance(node, nodes.ClassDef):
+                    checker.visit_classdef(node)
+                else:
+                    checker.visit_functiondef(node)
+        checker.leave_module(module)
+
+        return collector.violations
+
+    def lint_many(self, sources):
+        """Lint many sources, concurrently.
+
+        Args:
+            sources: the module sources, as text.
+
+        Yields:
+            list[engine.Violation]: the violations found in each source, in
+            the order of `sources`.
+        """
+        if self.max_workers == 1:
+            for source in sources:
+                yield self.lint(source)
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for violations in executor.map(self.lint, sources):
+                yield violations
+
+
+def lint_sources(sources, config=None, docstring_detection='tokens', max_workers=None):
+    """Lint many sources at once on a pool of threads.
+
+    Args:
+        sources: the module sources, as text.
+        config: the engine.QuoteConfig to check against. If None (default),
+            the default configuration is used.
+        docstring_detection: the `docstring-detection` option value.
+        max_workers: the number of threads to use; see SourceLinter.
+
+    Returns:
+        list[list[engine.Violation]]: the violations found in each source, in
+        the order of `sources`.
+    """
+    return list(SourceLinter(config, docstring_detection, max_workers).lint_many(sources))
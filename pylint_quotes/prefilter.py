@@ -0,0 +1,117 @@
+"""Prove files clean from their bytes, without tokenizing them.
+
+A string can only violate the configuration if the file contains the
+quote characters of a violation somewhere. With `string-quote=single`,
+for example, an invalid string quote needs a string opened with a single
+double quote, which leaves a run of double quotes that is not made of
+whole triple quotes, and an invalid triple or docstring quote needs three
+quotes in a row other than the configured ones. Finding none of these
+anywhere in the file -- comments included -- proves it clean, so its
+tokenization and classification can be skipped.
+
+Files which are skipped are not tokenized, so a file which would not
+tokenize is only reported as such if it could also hold a violation.
+"""
+
+from __future__ import absolute_import
+
+import functools
+import re
+
+from pylint_quotes.engine import (QUOTES, SMART_CONFIG_OPTS, SMART_QUOTE_OPTS,
+                                  TRIPLE_QUOTE_OPTS, map_file)
+from pylint_quotes.scanner import is_ascii_compatible
+
+# an encoding declaration, as found by the interpreter.
+_CODING_COOKIE = re.compile(br'^[ \t\f]*#.*?coding[:=][ \t]*([-\w.]+)', re.MULTILINE)
+
+
+def _single_quoted_pattern(quote):
+    """Compile a pattern finding where a string could be opened with a
+    single (not triple) quote.
+
+    Such a string puts a run of the quote in the source which is not a
+    whole number of triple quotes, or follows a backslash: alone or empty,
+    after nothing else or after a closing triple quote, the run is 1, 2, 4
+    or 5 quotes long, and after a triple quote ending in an escaped quote
+    it follows the backslash. Only the first such string has to be found,
+    so the one before it cannot be a single quoted string too.
+    """
+    quote = re.escape(quote.encode('ascii'))
+    return re.compile(
+        br'\\' + quote
+        + br'|(?<!' + quote + br')(?:' + quote * 3 + br')*' + quote + br'{1,2}(?!' + quote + br')'
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def suspect_patterns(config):
+    """Get the patterns of which a file has to contain a match to be able
+    to violate a configuration.
+
+    Args:
+        config: the engine.QuoteConfig to check against.
+
+    Returns:
+        tuple[re.Pattern]: the compiled bytes patterns; a file matching
+        none of them cannot violate the configuration.
+    """
+    string_quote = SMART_QUOTE_OPTS[config.string_quote]
+    other_quote = QUOTES[1] if string_quote == QUOTES[0] else QUOTES[0]
+
+    # a string opened with the other quote.
+    patterns = [_single_quoted_pattern(other_quote)]
+    if config.string_quote in SMART_CONFIG_OPTS:
+        # a string opened with the preferred quote, which has to escape it
+        # to contain it, and would then be better off with the other one.
+        patterns.append(re.compile(re.escape(b'\\' + string_quote.encode('ascii'))))
+
+    # a triple quote which is not the one configured for triple quoted
+    # strings or docstrings.
+    for triple in TRIPLE_QUOTE_OPTS.values():
+        if (triple != TRIPLE_QUOTE_OPTS[config.triple_quote]
+                or triple != TRIPLE_QUOTE_OPTS[config.docstring_quote]):
+            patterns.append(re.compile(re.escape(triple.encode('ascii'))))
+
+    return tuple(patterns)
+
+
+def could_violate(content, config):
+    """Check whether source could violate a configuration.
+
+    Args:
+        content: the source, as bytes or any bytes-like object (e.g. an
+            mmap).
+        config: the engine.QuoteConfig to check against.
+
+    Returns:
+        bool: False if the source is proven clean, otherwise True.
+    """
+    # the encoding can only be declared on the first two lines.
+    head_end = content.find(b'\n', content.find(b'\n') + 1)
+    cookie = _CODING_COOKIE.search(content[:head_end if head_end != -1 else 512])
+    if cookie and not is_ascii_compatible(cookie.group(1).decode('ascii')):
+        return True
+
+    for pattern in suspect_patterns(config):
+        if pattern.search(content):
+            return True
+    return False
+
+
+def file_could_violate(path, config):
+    """Check whether a file could violate a configuration, scanning it
+    memory-mapped rather than reading it in.
+
+    Args:
+        path: the path to the file.
+        config: the engine.QuoteConfig to check against.
+
+    Returns:
+        bool: False if the file is proven clean, otherwise True.
+
+    Raises:
+        OSError: the file could not be read.
+    """
+    with map_file(path) as content:
+        return could_violate(content, config)
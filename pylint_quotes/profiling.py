@@ -0,0 +1,210 @@
+"""The timings and counters of the checker, for `quote-profile`."""
+
+from __future__ import absolute_import
+
+import functools
+import heapq
+import time
+import tokenize
+
+from pylint_quotes import engine
+
+
+class QuoteProfile:
+    """The timings and counters of the checker for a run.
+
+    They are only collected with `quote-profile` enabled, and written to
+    the linter stats when the checker is closed, each under a `quote_` key:
+    the times and counts are summed over the checked modules, and over the
+    worker processes of a parallel run, with the time taken on each module
+    kept by module name.
+
+    Attributes:
+        times: the time spent in each of the PHASES, in seconds.
+        counts: the number of each of the COUNTERS seen.
+        module_times: the time spent on each module, in seconds, keyed by
+            module name.
+    """
+
+    # the checker methods which are timed, and what they are reported as.
+    PHASES = (
+        ('process_tokens', 'process_tokens'),
+        ('docstrings', '_process_for_docstring'),
+        ('leave_module', 'leave_module'),
+    )
+    COUNTERS = ('modules', 'string_tokens', 'triple_quotes', 'messages')
+
+    __slots__ = ('times', 'counts', 'module_times', '_module_time')
+
+    def __init__(self):
+        self.times = {phase: 0.0 for phase, _ in self.PHASES}
+        self.counts = dict.fromkeys(self.COUNTERS, 0)
+        self.module_times = {}
+        self._module_time = 0.0
+
+    def instrument(self, checker):
+        """Time and count the work of a checker in this profile.
+
+        The profiled methods are shadowed on the checker instance by timed
+        ones, so that nothing is timed or counted unless `quote-profile` is
+        set (see `restore`).
+
+        Args:
+            checker: the checker.StringQuoteChecker to profile.
+        """
+        timer = time.perf_counter
+
+        def timed(phase, method):
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                start = timer()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    self.add_time(phase, timer() - start)
+            return wrapper
+
+        for phase, name in self.PHASES:
+            setattr(checker, name, timed(phase, getattr(checker, name)))
+
+        process_tokens = checker.process_tokens
+        leave_module = checker.leave_module
+        add_message = checker.add_message
+
+        @functools.wraps(process_tokens)
+        def start_module(tokens):
+            self.start_module(tokens)
+            process_tokens(tokens)
+
+        @functools.wraps(leave_module)
+        def end_module(node):
+            leave_module(node)
+            self.end_module(getattr(checker.linter, 'current_name', None) or node.name)
+
+        @functools.wraps(add_message)
+        def count_message(*args, **kwargs):
+            self.counts['messages'] += 1
+            add_message(*args, **kwargs)
+
+        checker.process_tokens = start_module
+        checker.leave_module = end_module
+        checker.add_message = count_message
+
+    @classmethod
+    def restore(cls, checker):
+        """Stop timing a checker, dropping the methods `instrument` shadowed.
+
+        Args:
+            checker: the checker.StringQuoteChecker.
+        """
+        for _, name in cls.PHASES + (('', 'add_message'),):
+            checker.__dict__.pop(name, None)
+
+    @classmethod
+    def stat_keys(cls):
+        """Get the linter stats keys of the times and counts, in report order.
+
+        Returns:
+            list[str]: the keys.
+        """
+        return ['quote_{}_time'.format(phase) for phase, _ in cls.PHASES] + [
+            'quote_{}'.format(counter) for counter in cls.COUNTERS
+        ]
+
+    def add_time(self, phase, elapsed):
+        """Count time spent in a phase on the current module.
+
+        Args:
+            phase: the name of the phase.
+            elapsed: the time spent, in seconds.
+        """
+        self.times[phase] += elapsed
+        self._module_time += elapsed
+
+    def start_module(self, tokens):
+        """Start profiling a module, counting its strings.
+
+        Args:
+            tokens: the tokens of the module.
+        """
+        self._module_time = 0.0
+        counts = self.counts
+        counts['modules'] += 1
+        for tok_type, token, _, _, _ in tokens:
+            if tok_type == tokenize.STRING:
+                counts['string_tokens'] += 1
+                if len(engine.QuoteClassifier.opening(token)[1]) == 3:
+                    counts['triple_quotes'] += 1
+
+    def end_module(self, name):
+        """Stop profiling a module, recording the time spent on it.
+
+        Args:
+            name: the name of the module.
+        """
+        self.module_times[name] = self.module_times.get(name, 0.0) + self._module_time
+        self._module_time = 0.0
+
+    def merge(self, other):
+        """Add the times and counts of another profile to this one.
+
+        Args:
+            other: the QuoteProfile to add, e.g. from a worker process.
+        """
+        for phase in self.times:
+            self.times[phase] += other.times[phase]
+        for counter in self.counts:
+            self.counts[counter] += other.counts[counter]
+        for name, elapsed in other.module_times.items():
+            self.module_times[name] = self.module_times.get(name, 0.0) + elapsed
+
+    def slowest(self, n=10):
+        """Get the modules which took the longest.
+
+        Args:
+            n: the number of modules to get.
+
+        Returns:
+            list[tuple]: the (name, seconds) of the modules, slowest first.
+        """
+        return heapq.nlargest(n, self.module_times.items(), key=lambda item: item[1])
+
+    def values(self):
+        """Get the times and counts, in the order of `stat_keys`.
+
+        Returns:
+            list: the times, in seconds, then the counts.
+        """
+        return [self.times[phase] for phase, _ in self.PHASES] + [
+            self.counts[counter] for counter in self.COUNTERS
+        ]
+
+    def record(self, stats):
+        """Add the times and counts to the linter stats.
+
+        Args:
+            stats: the linter stats dict.
+        """
+        for key, value in zip(self.stat_keys(), self.values()):
+            stats[key] = stats.get(key, 0) + value
+        stats.setdefault('quote_module_times', {}).update(self.module_times)
+
+    @classmethod
+    def from_stats(cls, stats):
+        """Get the profile recorded in the linter stats.
+
+        Args:
+            stats: the linter stats dict.
+
+        Returns:
+            QuoteProfile: the profile, or None if none was recorded.
+        """
+        if not isinstance(stats, dict) or 'quote_modules' not in stats:
+            return None
+        profile = cls()
+        for phase, _ in cls.PHASES:
+            profile.times[phase] = stats['quote_{}_time'.format(phase)]
+        for counter in cls.COUNTERS:
+            profile.counts[counter] = stats['quote_{}'.format(counter)]
+        profile.module_times = dict(stats.get('quote_module_times', {}))
+        return profile
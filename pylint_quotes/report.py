@@ -0,0 +1,317 @@
+"""Writers of the results of the standalone checks.
+
+Each writer is given the runner.CheckResult of each file as it is checked,
+and streams out its messages: nothing about a file is kept once it is
+written, so a run with millions of violations takes no more memory than
+one with a few. The text of the messages is gathered in a buffer and
+written out in bulk once it reaches `buffer_size` characters, rather than
+with a write call per message.
+
+There is a writer for each output format (see `WRITERS`):
+
+- 'text': pylint's default message format, one message per line.
+- 'jsonl': a JSON object per line for each message, with the `path`,
+  `msg_id`, `symbol`, `line`, `column`, the `quote` found and the
+  `correct_quote` expected. A file which could not be checked has a
+  `message` instead of the quotes, which are null.
+- 'sarif': a SARIF 2.1.0 log with a single run, whose results are written
+  as they come between the head and the tail of the document, rather than
+  building the document as a whole.
+
+Lines are 1-based and columns 0-based, the same as the checks report them,
+except for SARIF, whose columns are 1-based.
+"""
+
+from __future__ import absolute_import
+
+import json
+import os
+import pathlib
+import urllib.parse
+
+from pylint_quotes import engine
+from pylint_quotes.__version__ import __title__, __url__, __version__
+
+MSG_TEMPLATE = '{path}:{line}:{column}: {msg_id}: {msg} ({symbol})'
+
+# the number of characters the writers buffer before writing them out.
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+SARIF_VERSION = '2.1.0'
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+
+# SARIF levels, keyed by the category of a pylint message id.
+SARIF_LEVELS = {'C': 'note', 'R': 'note', 'W': 'warning', 'E': 'error', 'F': 'error'}
+
+# the quote messages, in the order of the rules of a SARIF log.
+RULE_IDS = sorted(engine.MSGS)
+RULE_INDEXES = {msg_id: i for i, msg_id in enumerate(RULE_IDS)}
+
+
+def format_result(result):
+    """Get the pylint-style output lines for the result of checking a file.
+
+    Args:
+        result: the runner.CheckResult for the file.
+
+    Returns:
+        list[str]: a line for each message about the file.
+    """
+    if result.error:
+        msg_id, symbol, line, column, msg = result.error
+        return [MSG_TEMPLATE.format(
+            path=result.path, line=line, column=column,
+            msg_id=msg_id, msg=msg, symbol=symbol,
+        )]
+    return [
+        MSG_TEMPLATE.format(
+            path=result.path, line=v.row, column=v.col,
+            msg_id=v.msg_id, msg=v.msg, symbol=v.symbol,
+        )
+        for v in result.violations
+    ]
+
+
+class _JSONStrings(dict):
+    """The JSON encoding of strings, encoded once each.
+
+    The quotes, symbols and message ids of the violations only take a
+    handful of values, so they are not encoded again for every message.
+    """
+
+    __slots__ = ()
+
+    def __missing__(self, value):
+        encoded = self[value] = json.dumps(value)
+        return encoded
+
+
+class ResultWriter:
+    """Write the messages of the results of a run to a stream.
+
+    A writer is used as a context manager, which writes the head of the
+    output on entry, and its tail and whatever is left in the buffer on
+    exit:
+
+        with JsonLinesWriter(out) as writer:
+            for result in results:
+                writer.write(result)
+
+    Attributes:
+        out: the text stream to write to.
+        buffer_size: the number of characters to buffer before writing them
+            out.
+    """
+
+    __slots__ = ('out', 'buffer_size', '_buffer', '_buffered')
+
+    def __init__(self, out, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.out = out
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._buffered = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.finish()
+
+    def start(self):
+        """Write the head of the output."""
+
+    def finish(self):
+        """Write the tail of the output, and flush the buffer."""
+        self.flush()
+
+    def write(self, result):
+        """Write the messages of the result of checking a file.
+
+        Args:
+            result: the runner.CheckResult for the file.
+        """
+        chunks = self.format(result)
+        if chunks:
+            self._buffer.extend(chunks)
+            self._buffered += sum(map(len, chunks))
+            if self._buffered >= self.buffer_size:
+                self.flush()
+
+    def format(self, result):
+        """Get the text of the messages of the result of checking a file.
+
+        Args:
+            result: the runner.CheckResult for the file.
+
+        Returns:
+            list[str]: the text to write, in chunks.
+        """
+        raise NotImplementedError
+
+    def flush(self):
+        """Write out the buffer."""
+        if self._buffer:
+            self.out.write(''.join(self._buffer))
+            self._buffer = []
+            self._buffered = 0
+
+
+class TextWriter(ResultWriter):
+    """Write the messages in pylint's default message format."""
+
+    __slots__ = ()
+
+    def format(self, result):
+        return [line + '\n' for line in format_result(result)]
+
+
+class JsonLinesWriter(ResultWriter):
+    """Write a JSON object per line for each message."""
+
+    __slots__ = ('_strings',)
+
+    # the same text as json.dumps of the record, without building the
+    # record and encoding each of its values for every message.
+    TEMPLATE = (
+        '{{"path": {}, "msg_id": {}, "symbol": {}, "line": {}, "column": {}, '
+        '"quote": {}, "correct_quote": {}}}\n'
+    )
+
+    def __init__(self, out, buffer_size=DEFAULT_BUFFER_SIZE):
+        super().__init__(out, buffer_size)
+        self._strings = _JSONStrings()
+
+    def format(self, result):
+        path = json.dumps(result.path)
+        if result.error:
+            msg_id, symbol, line, column, message = result.error
+            return [json.dumps({
+                'path': result.path, 'msg_id': msg_id, 'symbol': symbol,
+                'line': line, 'column': column,
+                'quote': None, 'correct_quote': None, 'message': message,
+            }) + '\n']
+
+        strings = self._strings
+        template = self.TEMPLATE
+        return [
+            template.format(
+                path, strings[v.msg_id], strings[v.symbol], v.row, v.col,
+                strings[v.quote], strings[v.correct_quote],
+            )
+            for v in result.violations
+        ]
+
+
+def artifact_uri(path):
+    """Get the URI of a file in a SARIF log.
+
+    Args:
+        path: the path of the file.
+
+    Returns:
+        str: a file URI if the path is absolute, or else a relative
+        reference with '/' separators.
+    """
+    if os.path.isabs(path):
+        return pathlib.Path(path).as_uri()
+    return urllib.parse.quote(path.replace(os.sep, '/'))
+
+
+class SarifWriter(ResultWriter):
+    """Write a SARIF log, streaming its results."""
+
+    __slots__ = ('_first', '_strings')
+
+    TEMPLATE = (
+        '{{"ruleId": {}, "ruleIndex": {}, "level": "note", "message": {{"text": {}}}, '
+        '"locations": [{{"physicalLocation": {{"artifactLocation": {{"uri": {}}}, '
+        '"region": {{"startLine": {}, "startColumn": {}}}}}}}], '
+        '"properties": {{"quote": {}, "correctQuote": {}}}}}'
+    )
+
+    def __init__(self, out, buffer_size=DEFAULT_BUFFER_SIZE):
+        super().__init__(out, buffer_size)
+        self._first = True
+        self._strings = _JSONStrings()
+
+    @staticmethod
+    def rules():
+        """Get the rules of the SARIF log.
+
+        Returns:
+            list[dict]: a SARIF reportingDescriptor for each quote message,
+            in the order of `RULE_IDS`.
+        """
+        return [
+            {
+                'id': msg_id,
+                'name': engine.MSGS[msg_id][1],
+                'shortDescription': {'text': engine.MSGS[msg_id][0] % ('{0}', '{1}')},
+                'fullDescription': {'text': engine.MSGS[msg_id][2]},
+                'messageStrings': {'default': {'text': engine.MSGS[msg_id][0] % ('{0}', '{1}')}},
+                'defaultConfiguration': {'level': SARIF_LEVELS[msg_id[0]]},
+            }
+            for msg_id in RULE_IDS
+        ]
+
+    def start(self):
+        # everything up to the results, left open to stream them into.
+        head = json.dumps({
+            '$schema': SARIF_SCHEMA,
+            'version': SARIF_VERSION,
+            'runs': [{
+                'tool': {'driver': {
+                    'name': __title__, 'version': __version__, 'informationUri': __url__,
+                    'rules': self.rules(),
+                }},
+                'columnKind': 'unicodeCodePoints',
+                'results': [],
+            }],
+        }, indent=1)
+        self._buffer.append(head[:head.rindex('[]') + 1] + '\n')
+
+    def finish(self):
+        self._buffer.append('\n   ]\n  }\n ]\n}\n')
+        self.flush()
+
+    def format(self, result):
+        uri = json.dumps(artifact_uri(result.path))
+        if result.error:
+            msg_id, symbol, line, column, message = result.error
+            chunks = [json.dumps({
+                'ruleId': msg_id, 'level': SARIF_LEVELS[msg_id[0]], 'message': {'text': message},
+                'locations': [{'physicalLocation': {
+                    'artifactLocation': {'uri': artifact_uri(result.path)},
+                    'region': {'startLine': line, 'startColumn': column + 1},
+                }}],
+                'properties': {'symbol': symbol},
+            })]
+        else:
+            strings = self._strings
+            template = self.TEMPLATE
+            chunks = [
+                template.format(
+                    strings[v.msg_id], RULE_INDEXES[v.msg_id], strings[v.msg], uri,
+                    v.row, v.col + 1, strings[v.quote], strings[v.correct_quote],
+                )
+                for v in result.violations
+            ]
+        if not chunks:
+            return chunks
+
+        # results are separated by commas, so the first one has none.
+        separator = ',\n    '
+        text = separator.join(chunks)
+        if self._first:
+            self._first = False
+            return ['    ', text]
+        return [separator, text]
+
+
+# the writer of each output format.
+WRITERS = {
+    'text': TextWriter,
+    'jsonl': JsonLinesWriter,
+    'sarif': SarifWriter,
+}
@@ -0,0 +1,372 @@
+"""Runner for the standalone quote checks.
+
+Files are checked independently of each other, so they can be spread over
+a pool of worker processes. To keep one large file from being the last
+thing left running, the biggest jobs are handed out first: files are
+ordered by how long they took on the previous run when that is known
+(see `load_durations`), and by their size otherwise.
+
+Results are still yielded in the order the paths were given, so the
+output of a parallel run is identical to that of a serial one. A parallel
+run can instead yield each result as soon as its worker is done with it,
+so the results finished early are not held waiting on a slower one.
+
+With a `cache.ResultCache`, files whose content was already checked
+against the same configuration are not tokenized again. Checks restricted
+to part of a file (see `pylint_quotes.diff`) do not use the cache.
+
+With a `baseline.Baseline`, the violations recorded in it are dropped
+from the result of each file, after the cache, so cached results do not
+depend on the baseline.
+
+Files are memory-mapped rather than read in (see `engine.map_file`).
+Before checking them, the bytes of each file are scanned for the quotes a
+violation would need (see `pylint_quotes.prefilter`); files without any
+are reported clean without being tokenized or looked up in the cache.
+"""
+
+from __future__ import absolute_import
+
+import concurrent.futures
+import json
+import os
+import time
+import tokenize
+
+from pylint_quotes import baseline as quote_baseline
+from pylint_quotes import engine, prefilter
+
+# pylint exit status bits.
+FATAL_STATUS = 1
+ERROR_STATUS = 2
+CONVENTION_STATUS = 16
+
+# the errors a file can fail to be checked with: it could not be read,
+# decoded or tokenized.
+CHECK_ERRORS = (OSError, SyntaxError, tokenize.TokenError)
+
+
+class CheckResult:
+    """The outcome of checking a single file.
+
+    Attributes:
+        path: the path of the file that was checked.
+        violations: the quote violations found in the file.
+        error: a (msg_id, symbol, line, column, message) tuple describing why
+            the file could not be checked, or None if it was checked.
+        cached: whether the violations came from the result cache, or None
+            if no cache was used.
+        skipped: whether the file was proven clean by the pre-filter,
+            without being tokenized.
+        baselined: the number of violations left out of `violations` for
+            being recorded in the baseline.
+    """
+
+    __slots__ = ('path', 'violations', 'error', 'cached', 'skipped', 'baselined')
+
+    # an argument for each of the attributes.
+    def __init__(  # pylint: disable=too-many-arguments
+            self, path, violations=(), error=None, cached=None, skipped=False, baselined=0):
+        self.path = path
+        self.violations = violations
+        self.error = error
+        self.cached = cached
+        self.skipped = skipped
+        self.baselined = baselined
+
+    @property
+    def status(self):
+        """int: the pylint exit status bits for the result."""
+        if self.error:
+            return FATAL_STATUS if self.error[0].startswith('F') else ERROR_STATUS
+        return CONVENTION_STATUS if self.violations else 0
+
+
+# the check options are those of `run`, for a single file.
+def check_path(  # pylint: disable=too-many-arguments
+        path, config, cache=None, lines=None, prefilter_files=True, scanner='regex',
+        fingerprints=None):
+    """Check a single file, capturing any failure to read or tokenize it.
+
+    Args:
+        path: the path to the file to check.
+        config: the engine.QuoteConfig to check against.
+        cache: the cache.ResultCache to look up and store the result in. If
+            None (default), no cache is used.
+        lines: the lines to restrict the check to; see engine.check_tokens.
+            The cache is not used when set.
+        prefilter_files: whether to skip the file if its bytes prove it
+            clean (default True); see `pylint_quotes.prefilter`.
+        scanner: how to find the strings of the file; one of
+            engine.SCANNERS.
+        fingerprints: the fingerprints recorded for the file in the
+            baseline, whose violations are not reported. If None (default),
+            all of them are.
+
+    Returns:
+        CheckResult: the result of checking the file.
+    """
+    try:
+        with engine.map_file(path) as content:
+            if prefilter_files and not prefilter.could_violate(content, config):
+                return CheckResult(path, [], skipped=True)
+            if cache is None or lines is not None:
+                result = CheckResult(path, engine.check_bytes(content, config, lines, scanner))
+            else:
+                key = cache.key(content, config)
+                violations = cache.get(key)
+                if violations is not None:
+                    result = CheckResult(path, violations, cached=True)
+                else:
+                    violations = engine.check_bytes(content, config, scanner=scanner)
+                    cache.put(key, violations)
+                    result = CheckResult(path, violations, cached=False)
+
+            if fingerprints and result.violations:
+                result.violations, result.baselined = quote_baseline.filter_violations(
+                    result.violations, content, fingerprints, scanner,
+                )
+        return result
+    except CHECK_ERRORS as e:
+        return error_result(path, e)
+
+
+def error_result(path, error):
+    """Get the result for a file which could not be checked.
+
+    Args:
+        path: the path of the file.
+        error: the exception raised while checking the file; one of
+            CHECK_ERRORS.
+
+    Returns:
+        CheckResult: the result describing the error.
+    """
+    if isinstance(error, SyntaxError):
+        return CheckResult(path, error=(
+            'E0001', 'syntax-error', error.lineno or 1, error.offset or 0, error.msg
+        ))
+    if isinstance(error, tokenize.TokenError):
+        msg, (line, column) = error.args
+        return CheckResult(path, error=(
+            'E0001', 'syntax-error', line, column, msg
+        ))
+    return CheckResult(path, error=(
+        'F0001', 'fatal', 1, 0, str(error)
+    ))
+
+
+def iter_python_files(paths):
+    """Expand the given paths to the python files they contain.
+
+    Files are used as given. Directories are searched recursively for
+    '.py' files, skipping hidden directories and '__pycache__'.
+
+    Args:
+        paths: the file and directory paths to expand.
+
+    Yields:
+        str: the path of each python file, in sorted order for each
+        directory.
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(
+                d for d in dirs if not d.startswith('.') and d != '__pycache__'
+            )
+            for name in sorted(files):
+                if name.endswith('.py'):
+                    yield os.path.join(root, name)
+
+
+def under_paths(path, limits):
+    """Check whether a path is one of, or inside one of, the given paths.
+
+    Args:
+        path: the path to check.
+        limits: the file and directory paths to check against.
+
+    Returns:
+        bool: True if the path is under any of the limits.
+    """
+    path = os.path.abspath(path)
+    for limit in limits:
+        limit = os.path.abspath(limit)
+        if path == limit or path.startswith(limit.rstrip(os.sep) + os.sep):
+            return True
+    return False
+
+
+def load_durations(path):
+    """Load the per-file check durations recorded on a previous run.
+
+    Args:
+        path: the path to the durations file. It does not need to exist.
+
+    Returns:
+        dict: the duration, in seconds, keyed by file path.
+    """
+    try:
+        with open(path, 'r') as f:
+            durations = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return durations if isinstance(durations, dict) else {}
+
+
+def save_durations(path, durations):
+    """Record the per-file check durations of a run for the next one.
+
+    Args:
+        path: the path to the durations file.
+        durations: the duration, in seconds, keyed by file path.
+    """
+    tmp = '{}.{}.tmp'.format(path, os.getpid())
+    with open(tmp, 'w') as f:
+        json.dump(durations, f, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def schedule(paths, durations=None):
+    """Order the paths so the most expensive files are checked first.
+
+    Files with a recorded duration are ranked by it. The others are ranked
+    by their size, scaled by the average time per byte of the files with a
+    recorded duration, so both can be compared.
+
+    Args:
+        paths: the paths of the files to check.
+        durations: the durations recorded on a previous run, in seconds,
+            keyed by file path. If None (default), files are ranked by size.
+
+    Returns:
+        list[str]: the paths, most expensive first.
+    """
+    durations = durations or {}
+
+    sizes = {}
+    for path in paths:
+        try:
+            sizes[path] = os.path.getsize(path)
+        except OSError:
+            sizes[path] = 0
+
+    timed_size = sum(sizes[p] for p in paths if p in durations)
+    timed_duration = sum(durations[p] for p in paths if p in durations)
+    rate = timed_duration / timed_size if timed_size and timed_duration else 1.0
+
+    def cost(path):
+        if path in durations:
+            return durations[path]
+        return sizes[path] * rate
+
+    return sorted(paths, key=cost, reverse=True)
+
+
+# the arguments are passed on to check_path.
+def _check_timed(  # pylint: disable=too-many-arguments
+        path, config, cache, lines, prefilter_files, scanner, fingerprints):
+    """Check a single file, timing how long the check takes.
+
+    Args:
+        path: the path to the file to check.
+        config: the engine.QuoteConfig to check against.
+        cache: the cache.ResultCache to use, or None.
+        lines: the lines to restrict the check to, or None.
+        prefilter_files: whether to pre-filter the file.
+        scanner: how to find the strings of the file.
+        fingerprints: the fingerprints of the file in the baseline, or None.
+
+    Returns:
+        tuple: the CheckResult for the file, and the time taken to check
+        it, in seconds.
+    """
+    start = time.perf_counter()
+    result = check_path(path, config, cache, lines, prefilter_files, scanner, fingerprints)
+    return result, time.perf_counter() - start
+
+
+# the check options are each given by keyword, as on the command line.
+def run(  # pylint: disable=too-many-arguments
+        paths, config, jobs=1, durations=None, cache=None, lines=None, prefilter_files=True,
+        scanner='regex', baseline=None, ordered=True):
+    """Check the files, in parallel if more than one job is requested.
+
+    Args:
+        paths: the paths of the files to check.
+        config: the engine.QuoteConfig to check against.
+        jobs: the number of worker processes to use. If 0, one worker per
+            CPU is used. With 1 (default), files are checked in this process.
+        durations: a dict of the durations recorded on a previous run, used
+            to schedule the files. It is updated in place with the
+            durations of this run.
+        cache: the cache.ResultCache to use. If None (default), no cache
+            is used. Its hit and miss counts are updated for the whole run,
+            including lookups made by worker processes.
+        lines: the lines to restrict the check of each file to, keyed by
+            path (see engine.check_tokens). Files without an entry are
+            checked in full. If None (default), all files are checked in full.
+        prefilter_files: whether to skip files whose bytes prove them clean
+            (default True).
+        scanner: how to find the strings of each file; one of
+            engine.SCANNERS.
+        baseline: the baseline.Baseline of the violations not to report. If
+            None (default), all of them are. Only the fingerprints of each
+            file are sent to the worker checking it.
+        ordered: whether to yield the results in the order of `paths`
+            (default True). If False, a parallel run yields the result of
+            each file once, as soon as it is checked.
+
+    Yields:
+        CheckResult: the result for each file.
+    """
+    paths = list(paths)
+    if durations is None:
+        durations = {}
+    if lines is None:
+        lines = {}
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+
+    def fingerprints(path):
+        return baseline.fingerprints(path) if baseline is not None else None
+
+    if jobs == 1 or len(paths) < 2:
+        for path in paths:
+            result, durations[path] = _check_timed(
+                path, config, cache, lines.get(path), prefilter_files, scanner, fingerprints(path),
+            )
+            yield result
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {}
+        for path in schedule(set(paths), durations):
+            futures[path] = executor.submit(
+                _check_timed, path, config, cache, lines.get(path), prefilter_files, scanner,
+                fingerprints(path),
+            )
+
+        if ordered:
+            # wait on the results in path order, so each is yielded as soon
+            # as all the paths before it are done.
+            done = (futures[path] for path in paths)
+        else:
+            # drop the futures as they are done, so their results are not
+            # kept once yielded.
+            done = concurrent.futures.as_completed(futures.values())
+            futures = None
+        for future in done:
+            result, durations[result.path] = future.result()
+
+            # the workers count cache lookups on their own copy of the cache.
+            if result.cached is not None:
+                if result.cached:
+                    cache.hits += 1
+                else:
+                    cache.misses += 1
+            yield result
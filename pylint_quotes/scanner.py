@@ -0,0 +1,321 @@
+"""A single regex pass over python source, finding its string literals.
+
+The tokenize module produces a token for every name, operator and newline
+of the source, while the quote checks only look at its strings. This scans
+the raw bytes of the source with one compiled regex instead, matching
+string literals, comments, brackets, colons and semicolons, line ends and
+indentation, and runs of any other code as a whole. It produces a reduced
+token stream with just enough in it for `docstrings.iter_strings` to
+classify the strings the same way it does for the full token stream, and
+only decodes the strings themselves.
+
+Anything the scanner cannot handle unambiguously -- an unterminated
+string, a stray backslash or carriage return, inconsistent indentation,
+unbalanced brackets, an encoding which is not a superset of ASCII, or
+bytes which do not decode -- raises `ScanError`, and the source should be
+tokenized instead, which also reports any error in it the same way.
+"""
+
+from __future__ import absolute_import
+
+import codecs
+import re
+import sys
+import tokenize
+
+from pylint_quotes import docstrings
+
+# python 3.12 tokenizes f-strings into parts, rather than as strings.
+_SPLIT_FSTRINGS = sys.version_info >= (3, 12)
+
+_STRING_PREFIXES = frozenset(('', 'r', 'u', 'b', 'br', 'rb', 'f', 'fr', 'rf'))
+
+_TABSIZE = 8
+
+# a byte of a name; bytes past ASCII are only valid in names.
+_WORD = br'[\w\x80-\xff]'
+
+_TOKEN = re.compile(
+    # a string literal, with anything which could be its prefix.
+    br'(?P<string>' + _WORD + br"""*(?:
+        '''[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*'''
+        |\"\"\"[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*\"\"\"
+        |'(?!'')[^'\\\r\n]*(?:\\(?:\r\n|.)[^'\\\r\n]*)*'
+        |"(?!"")[^"\\\r\n]*(?:\\(?:\r\n|.)[^"\\\r\n]*)*"
+    ))"""
+    br'|(?P<space>[ \t\f]+)'
+    # any other code, up to a name which could prefix a string.
+    br'|(?P<code>(?:[^\w\x80-\xff\s\'"#\\()\[\]{}:;\x00]|[ \t\f]'
+    br'|' + _WORD + br'+(?!' + _WORD + br'|[\'"]))+)'
+    br'|(?P<newline>\r?\n)'
+    br'|(?P<comment>\#[^\r\n]*)'
+    br'|(?P<op>[()\[\]{}:;])'
+    br'|(?P<continuation>\\\r?\n)'
+    br'|(?P<error>.)',
+    re.DOTALL | re.VERBOSE,
+)
+
+# a definition keyword at the start of a run of code.
+_KEYWORD = re.compile(br'(async|def|class)(?!' + _WORD + br')[ \t\f]*')
+
+_NON_ASCII = re.compile(br'[\x80-\xff]')
+
+# the size of the chunks the source is validated in.
+_DECODE_CHUNK = 1 << 20
+
+
+class ScanError(Exception):
+    """The source has a construct the scanner does not handle; it has to be
+    tokenized instead.
+    """
+
+
+def is_ascii_compatible(encoding):
+    """Check whether the quotes, backslashes and line ends of source in an
+    encoding can only be encoded as their ASCII bytes.
+
+    Args:
+        encoding: the name of the encoding.
+
+    Returns:
+        bool: True if the encoding is a superset of ASCII; False otherwise.
+    """
+    try:
+        name = codecs.lookup(encoding).name
+    except LookupError:
+        return False
+    return name in ('utf-8', 'utf-8-sig', 'ascii') or name.startswith(('iso8859-', 'cp125'))
+
+
+def _validate(content, encoding):
+    """Check that source decodes, a chunk at a time."""
+    if not _NON_ASCII.search(content):
+        return
+    decoder = codecs.getincrementaldecoder(encoding)()
+    try:
+        for offset in range(0, len(content), _DECODE_CHUNK):
+            decoder.decode(content[offset:offset + _DECODE_CHUNK])
+        decoder.decode(b'', True)
+    except UnicodeDecodeError as e:
+        raise ScanError('the source does not decode') from e
+
+
+def _indent_column(indent):
+    """Get the column of an indentation, measured the way tokenize does."""
+    column = 0
+    for char in indent:
+        if char == 0x20:
+            column += 1
+        elif char == 0x09:
+            column = (column // _TABSIZE + 1) * _TABSIZE
+        else:
+            column = 0
+    return column
+
+
+def _indentation_tokens(indents, column, row):
+    """Get the INDENT or DEDENT tokens before the first token of a logical
+    line, updating the columns of the open blocks.
+
+    Args:
+        indents: the columns of the open blocks.
+        column: the column of the first token of the line.
+        row: the row of the line.
+
+    Yields:
+        tuple: each token, as a 5-tuple like those of the tokenize module.
+
+    Raises:
+        ScanError: the dedent does not match an open block.
+    """
+    if column > indents[-1]:
+        indents.append(column)
+        yield tokenize.INDENT, '', (row, 0), None, None
+    while column < indents[-1]:
+        indents.pop()
+        if column > indents[-1]:
+            raise ScanError('inconsistent dedent on line {}'.format(row))
+        yield tokenize.DEDENT, '', (row, 0), None, None
+
+
+def _string_tokens(match, content, row, line_start, encoding):
+    """Get the tokens of a string literal matched by the scanner.
+
+    Args:
+        match: the match of the string, with anything which could be its
+            prefix.
+        content: the source.
+        row: the row the string starts on.
+        line_start: the offset of the start of that row in the source.
+        encoding: the encoding of the source.
+
+    Yields:
+        tuple: the STRING token, after a NAME token for what precedes the
+        quote if it is not a string prefix.
+
+    Raises:
+        ScanError: the string is an f-string which tokenize would split.
+    """
+    token = match.group()
+    start = match.start()
+    prefix_end = token.find(token[-1:])
+    prefix = token[:prefix_end].decode('ascii', 'replace').lower()
+    if prefix not in _STRING_PREFIXES:
+        # a name followed by a string, rather than a prefix.
+        yield tokenize.NAME, token[:prefix_end].decode(encoding), (row, 0), None, None
+        token = token[prefix_end:]
+        start += prefix_end
+    elif _SPLIT_FSTRINGS and 'f' in prefix:
+        raise ScanError('f-string on line {}'.format(row))
+
+    col = len(content[line_start:start].decode(encoding))
+    yield tokenize.STRING, token.decode(encoding), (row, col), None, None
+
+
+def _code_tokens(code, row):
+    """Get the NAME tokens of a run of code: one for each definition
+    keyword it starts with, and an empty one for the rest of it.
+    """
+    keyword = _KEYWORD.match(code)
+    offset = 0
+    while keyword:
+        yield tokenize.NAME, keyword.group(1).decode('ascii'), (row, 0), None, None
+        offset = keyword.end()
+        keyword = _KEYWORD.match(code, offset)
+    if offset < len(code):
+        yield tokenize.NAME, '', (row, 0), None, None
+
+
+def _bracket_depth(token, depth, row):
+    """Get the bracket depth after an OP token.
+
+    Raises:
+        ScanError: the OP closes a bracket which is not open.
+    """
+    if token in b'([{':
+        return depth + 1
+    if token in b')]}':
+        if depth == 0:
+            raise ScanError('unbalanced bracket on line {}'.format(row))
+        return depth - 1
+    return depth
+
+
+def scan_tokens(content, encoding, indents=None):
+    """Scan source into the reduced token stream `docstrings.iter_strings`
+    needs.
+
+    Strings are the only tokens with their actual text and position. Other
+    code is a NAME with the definition keyword it starts with (or empty
+    text), brackets, colons and semicolons are OP tokens, and the NEWLINE,
+    INDENT and DEDENT tokens are the ones tokenize would produce. Comments
+    and NL tokens are left out.
+
+    Args:
+        content: the source, as bytes or an mmap.
+        encoding: the encoding of the source, as detected by
+            `tokenize.detect_encoding`; it has to be a superset of ASCII.
+        indents: the columns of the blocks the source starts in, e.g. to
+            scan part of a module from the start of one of its lines. If
+            None (default), the source starts at the start of a module.
+
+    Yields:
+        tuple: each token, as a 5-tuple like those of the tokenize module.
+
+    Raises:
+        ScanError: the source has to be tokenized instead.
+    """
+    string_encoding = 'utf-8' if encoding == 'utf-8-sig' else encoding
+    pos = 3 if encoding == 'utf-8-sig' else 0
+    row, line_start = 1, pos
+    depth = 0
+    indents = list(indents) if indents else [0]
+    # whether the logical line has any code yet.
+    has_code = False
+    continued = False
+
+    for match in _TOKEN.finditer(content, pos):
+        kind = match.lastgroup
+        if kind in ('space', 'comment'):
+            continue
+
+        if kind in ('newline', 'continuation'):
+            continued = kind == 'continuation'
+            if continued and not has_code:
+                raise ScanError('line continuation at the start of a line')
+            if not continued and has_code and depth == 0:
+                yield tokenize.NEWLINE, '\n', (row, 0), None, None
+                has_code = False
+            row += 1
+            line_start = match.end()
+            continue
+
+        if kind == 'error':
+            raise ScanError('unexpected {!r} on line {}'.format(match.group(), row))
+
+        if not has_code:
+            # the first token of a logical line; indent or dedent to it.
+            has_code = True
+            yield from _indentation_tokens(
+                indents, _indent_column(content[line_start:match.start()]), row)
+
+        if kind == 'string':
+            yield from _string_tokens(match, content, row, line_start, string_encoding)
+            token = match.group()
+            newlines = token.count(b'\n')
+            if newlines:
+                row += newlines
+                line_start = match.start() + token.rfind(b'\n') + 1
+
+        elif kind == 'code':
+            yield from _code_tokens(match.group(), row)
+
+        else:
+            op = match.group()
+            depth = _bracket_depth(op, depth, row)
+            yield tokenize.OP, op.decode('ascii'), (row, 0), None, None
+
+    if depth or continued:
+        raise ScanError('EOF in multi-line statement')
+    yield from _end_tokens(row, has_code, indents)
+
+
+def _end_tokens(row, has_code, indents):
+    """Get the tokens tokenize produces at the end of the source: the
+    NEWLINE ending its last logical line, the DEDENT closing each open
+    block and the ENDMARKER.
+    """
+    if has_code:
+        yield tokenize.NEWLINE, '', (row, 0), None, None
+    for _ in indents[1:]:
+        yield tokenize.DEDENT, '', (row, 0), None, None
+    yield tokenize.ENDMARKER, '', (row, 0), None, None
+
+
+def iter_strings(content):
+    """Find the strings of python source, as `docstrings.iter_strings` does
+    for its tokens.
+
+    The source encoding is detected the same way the interpreter does it.
+    The source is scanned as the strings are consumed, so `ScanError` can
+    be raised after some of them were yielded.
+
+    Args:
+        content: the source, as bytes or an mmap.
+
+    Yields:
+        tuple: (token, start row, start column, is docstring) for each
+        string in the source.
+
+    Raises:
+        ScanError: the source has to be tokenized instead.
+        SyntaxError: the encoding declaration is invalid.
+    """
+    head_end = content.find(b'\n', content.find(b'\n') + 1)
+    lines = iter(content[:head_end + 1 if head_end != -1 else len(content)].splitlines(True))
+    encoding, _ = tokenize.detect_encoding(lambda: next(lines, b''))
+    if not is_ascii_compatible(encoding):
+        raise ScanError('{} is not a superset of ASCII'.format(encoding))
+    _validate(content, encoding)
+    for string in docstrings.iter_strings(scan_tokens(content, encoding)):
+        yield string
@@ -0,0 +1,197 @@
+"""Check the staged contents of files, straight from the git index.
+
+For a pre-commit check, the content that matters is what is staged, not
+what is in the working tree -- a file can be partly staged. Rather than
+stashing the working tree or writing the staged content to temporary
+files, the staged blobs are listed from the index and their contents are
+streamed from a single long-lived `git cat-file --batch` process.
+
+A blob's id is a hash of its content, so results are cached by blob id:
+a blob which was already checked with the same configuration is not read
+from git again.
+"""
+
+from __future__ import absolute_import
+
+import os
+import subprocess
+
+from pylint_quotes import baseline as quote_baseline
+from pylint_quotes import engine, prefilter, runner
+
+# file modes of regular files in the index; symlinks and submodules are skipped.
+_FILE_MODES = ('100644', '100755')
+
+
+class BlobNotFoundError(FileNotFoundError):
+    """There is no blob with the given id in the repository."""
+
+
+class BlobReader:
+    """Reads blob contents from a single `git cat-file --batch` process.
+
+    Use as a context manager, so the process is closed when done.
+    """
+
+    def __init__(self, cwd=None):
+        # the process outlives __init__: it is closed by close() or __exit__.
+        self._process = subprocess.Popen(  # pylint: disable=consider-using-with
+            ['git', 'cat-file', '--batch'], cwd=cwd,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Stop the cat-file process."""
+        if self._process.poll() is None:
+            self._process.stdin.close()
+            self._process.wait()
+        self._process.stdout.close()
+
+    def read(self, sha):
+        """Read the content of a blob.
+
+        Args:
+            sha: the blob id.
+
+        Returns:
+            bytes: the blob content.
+
+        Raises:
+            BlobNotFoundError: there is no blob with the given id.
+        """
+        self._process.stdin.write(sha.encode('ascii') + b'\n')
+        self._process.stdin.flush()
+
+        header = self._process.stdout.readline().split()
+        if len(header) != 3 or header[1] != b'blob':
+            raise BlobNotFoundError('no blob {} in the repository'.format(sha))
+
+        size = int(header[2])
+        content = self._process.stdout.read(size)
+        # each blob is followed by a newline.
+        self._process.stdout.read(1)
+        return content
+
+
+def staged_blobs(cwd=None):
+    """List the python files with staged changes, and their staged blob ids.
+
+    Added, copied, modified and renamed files are listed; deleted files,
+    symlinks and submodules are not.
+
+    Args:
+        cwd: the directory of the repository to look in. If None (default),
+            the current directory is used.
+
+    Returns:
+        list[tuple]: the (path, blob id) of each file, with paths relative to
+        the repository root.
+    """
+    output = subprocess.run(
+        ['git', 'diff', '--cached', '--raw', '-z', '--no-abbrev', '--no-renames',
+         '--diff-filter=ACMR', '--', '*.py'],
+        cwd=cwd, check=True, stdout=subprocess.PIPE,
+    ).stdout.decode('utf-8', 'surrogateescape')
+
+    # each entry is ':<old mode> <new mode> <old sha> <new sha> <status>'
+    # followed by the path, NUL separated.
+    fields = output.split('\0')
+    blobs = []
+    for info, path in zip(fields[::2], fields[1::2]):
+        _, mode, _, sha, _ = info.lstrip(':').split(' ')
+        if mode in _FILE_MODES:
+            blobs.append((path, sha))
+    return blobs
+
+
+# the check options are those of `runner.run`, for the staged content.
+def check_staged(  # pylint: disable=too-many-arguments
+        config, cache=None, root=None, paths=(), prefilter_files=True, scanner='regex',
+        baseline=None):
+    """Check the staged content of the python files with staged changes.
+
+    Args:
+        config: the engine.QuoteConfig to check against.
+        cache: the cache.ResultCache to look up and store results in, keyed
+            by blob id. If None (default), no cache is used.
+        root: the repository root. If None (default), the current directory
+            is assumed to be in the repository.
+        paths: the paths to limit the check to. If empty (default), all
+            files with staged changes are checked.
+        prefilter_files: whether to skip blobs whose bytes prove them clean
+            (default True); see `pylint_quotes.prefilter`.
+        scanner: how to find the strings of each blob; one of
+            engine.SCANNERS.
+        baseline: the baseline.Baseline of the violations not to report. If
+            None (default), all of them are.
+
+    Yields:
+        runner.CheckResult: the result for each file, with its path relative
+        to the current directory, in path order.
+    """
+    blobs = []
+    for path, sha in staged_blobs(cwd=root):
+        if root:
+            path = os.path.join(root, path)
+        if paths and not runner.under_paths(path, paths):
+            continue
+        blobs.append((os.path.relpath(path), sha))
+
+    with BlobReader(cwd=root) as reader:
+        for path, sha in sorted(blobs):
+            try:
+                result = _check_blob(reader, path, sha, config, cache, prefilter_files, scanner)
+                fingerprints = baseline.fingerprints(path) if baseline is not None else None
+                if fingerprints and result.violations:
+                    result.violations, result.baselined = quote_baseline.filter_violations(
+                        result.violations, reader.read(sha), fingerprints, scanner,
+                    )
+            except runner.CHECK_ERRORS as e:
+                result = runner.error_result(path, e)
+            yield result
+
+
+# the check options are passed on from check_staged.
+def _check_blob(  # pylint: disable=too-many-arguments
+        reader, path, sha, config, cache, prefilter_files, scanner):
+    """Check the staged content of a single file.
+
+    Args:
+        reader: the BlobReader to read the blob with.
+        path: the path of the file.
+        sha: the id of the blob.
+        config: the engine.QuoteConfig to check against.
+        cache: the cache.ResultCache to use, or None.
+        prefilter_files: whether to skip the blob if its bytes prove it clean.
+        scanner: how to find the strings of the blob.
+
+    Returns:
+        runner.CheckResult: the result for the file.
+
+    Raises:
+        OSError: the blob could not be read.
+        SyntaxError: the blob could not be decoded.
+        tokenize.TokenError: the blob could not be tokenized.
+    """
+    key = None
+    if cache is not None:
+        key = cache.blob_key(sha, config)
+        violations = cache.get(key)
+        if violations is not None:
+            return runner.CheckResult(path, violations, cached=True)
+
+    content = reader.read(sha)
+    if prefilter_files and not prefilter.could_violate(content, config):
+        return runner.CheckResult(path, [], skipped=True)
+    violations = engine.check_bytes(content, config, scanner=scanner)
+
+    if key is None:
+        return runner.CheckResult(path, violations)
+    cache.put(key, violations)
+    return runner.CheckResult(path, violations, cached=False)
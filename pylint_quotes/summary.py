@@ -0,0 +1,165 @@
+"""The quote violations of a module, counted for `quote-summary`."""
+
+from __future__ import absolute_import
+
+import json
+import os
+import shutil
+
+from pylint_quotes.engine import MSG_IDS
+
+
+class QuoteSummary:
+    """The quote violations of a module, counted rather than added as
+    messages one by one.
+
+    Attributes:
+        counts: the number of violations of each message, keyed by symbol.
+        first: the (row, col) of the first violation of each message, keyed
+            by symbol.
+        violations: the (symbol, row, col, quote, correct_quote) of each
+            violation, for the summary file, or None if there is none.
+    """
+
+    __slots__ = ('counts', 'first', 'violations')
+
+    def __init__(self, keep_violations=False):
+        self.counts = {}
+        self.first = {}
+        self.violations = [] if keep_violations else None
+
+    # the arguments are the fields of an engine.Violation.
+    def add(self, symbol, row, col, quote, correct_quote):  # pylint: disable=too-many-arguments
+        """Count a violation.
+
+        Args:
+            symbol: the symbol of the message for the violation.
+            row: the row the string starts on.
+            col: the column the string starts on.
+            quote: the quote characters that were found.
+            correct_quote: the quote characters that are required.
+        """
+        count = self.counts.get(symbol)
+        if count is None:
+            self.counts[symbol] = 1
+            self.first[symbol] = (row, col)
+        else:
+            self.counts[symbol] = count + 1
+            # triple quotes are checked out of order with ast detection.
+            if (row, col) < self.first[symbol]:
+                self.first[symbol] = (row, col)
+        if self.violations is not None:
+            self.violations.append((symbol, row, col, quote, correct_quote))
+
+    def location(self):
+        """Get where the first violation of the module is.
+
+        Returns:
+            tuple: the (row, col) of the first violation, or None if there
+            are none.
+        """
+        return min(self.first.values()) if self.first else None
+
+    def describe(self):
+        """Get the text of the summary message.
+
+        Returns:
+            str: the count and first location of the violations of each
+            message, in the order of their first violations.
+        """
+        return ', '.join(
+            '{} {} (first at line {}, column {})'.format(
+                self.counts[symbol], symbol, *self.first[symbol])
+            for symbol in sorted(self.first, key=self.first.get)
+        )
+
+    def json_lines(self, path, module):
+        """Get the violations as JSON lines, for the summary file.
+
+        Args:
+            path: the path of the module.
+            module: the name of the module.
+
+        Returns:
+            str: a JSON object for each violation, one per line, in the order
+            of the strings.
+        """
+        return ''.join(
+            json.dumps({
+                'path': path, 'module': module, 'msg_id': MSG_IDS[symbol], 'symbol': symbol,
+                'line': row, 'column': col, 'quote': quote, 'correct_quote': correct_quote,
+            }) + '\n'
+            for symbol, row, col, quote, correct_quote
+            in sorted(self.violations, key=lambda v: (v[1], v[2]))
+        )
+
+
+class SummaryFile:
+    """The file the quote violations of a run are written to, for
+    `quote-summary-file`.
+
+    A serial run writes the file itself. In a parallel run, each worker
+    process writes its own part next to it, started afresh when the process
+    first opens it and appended to for every file after, and the parts are
+    joined into the file once the workers are done (see `join`).
+
+    Attributes:
+        path: the path of the file.
+        part: the path of the part written by this process in a parallel
+            run, or None.
+    """
+
+    __slots__ = ('path', 'part', '_file')
+
+    def __init__(self, path):
+        self.path = path
+        self.part = None
+        self._file = None
+
+    def open(self, parallel=False):
+        """Open the file, or the part of this process in a parallel run,
+        unless it is open already.
+
+        Args:
+            parallel: whether the run is spread over worker processes.
+        """
+        if self._file is not None:
+            return
+        if not parallel:
+            self._file = open(self.path, 'w', encoding='utf-8')
+            return
+
+        part = '{}.{}.part'.format(self.path, os.getpid())
+        mode = 'a' if part == self.part else 'w'
+        self.part = part
+        self._file = open(part, mode, encoding='utf-8')
+
+    def write(self, text):
+        """Write to the file, if it is open.
+
+        Args:
+            text: the text to write.
+        """
+        if self._file is not None:
+            self._file.write(text)
+
+    def close(self):
+        """Close the file, if it is open."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def join(path, parts):
+        """Join the parts written by the worker processes of a parallel run
+        into the file, removing them.
+
+        Args:
+            path: the path of the file.
+            parts: the paths of the parts, in order.
+        """
+        with open(path, 'wb') as summary_file:
+            for part in parts:
+                with open(part, 'rb') as f:
+                    shutil.copyfileobj(f, summary_file)
+                os.remove(part)
@@ -0,0 +1,118 @@
+"""The triple quotes of a module, waiting to be matched to its docstrings.
+
+With `docstring-detection=ast`, the triple quotes found while tokenizing a
+module are only known to be docstrings or not once the AST walk gets to the
+definitions they could document, so they are tracked until then.
+"""
+
+from __future__ import absolute_import
+
+import bisect
+
+
+class TripleQuoteRecord:
+    """A triple quote found during tokenization.
+
+    Only what the checks need is kept -- not the text of the string, which
+    can be large (e.g. embedded SQL or templates) and would otherwise stay
+    alive until the end of the module.
+
+    Attributes:
+        quote: the triple quote characters, one of the TRIPLE_QUOTE_OPTS
+            values.
+        row: the row the string starts on.
+        col: the column the string starts on.
+    """
+
+    __slots__ = ('quote', 'row', 'col')
+
+    def __init__(self, quote, row, col):
+        self.quote = quote
+        self.row = row
+        self.col = col
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, TripleQuoteRecord)
+            and (self.quote, self.row, self.col) == (other.quote, other.row, other.col)
+        )
+
+    def __repr__(self):
+        return 'TripleQuoteRecord({!r}, {!r}, {!r})'.format(self.quote, self.row, self.col)
+
+
+class TripleQuoteIndex:
+    """Row-ordered index of the triple quotes found during tokenization.
+
+    Records are keyed by the row they start on. Since tokens arrive in
+    source order, the rows are kept in a sorted list alongside the record
+    mapping, which lets docstring lookups bisect to the first tracked row
+    of a node instead of scanning every line the node spans.
+
+    Removed rows are only dropped from the mapping and skipped over by
+    lookups. Docstrings are consumed in the same order the AST is walked,
+    and a node's docstring precedes its children, so lookups rarely have
+    to step past a consumed row.
+    """
+
+    def __init__(self):
+        self._records = {}
+        self._rows = []
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, row):
+        return row in self._records
+
+    def add(self, row, record):
+        """Track a triple quote record starting on the given row.
+
+        Args:
+            row: the row the triple quote starts on.
+            record: the tokenization record for the triple quote.
+        """
+        rows = self._rows
+        if not rows or row > rows[-1]:
+            rows.append(row)
+        else:
+            # the row may still be in the list if its previous record
+            # was consumed, so only insert it if it is not there yet.
+            i = bisect.bisect_left(rows, row)
+            if i == len(rows) or rows[i] != row:
+                rows.insert(i, row)
+        self._records[row] = record
+
+    def get(self, row):
+        """Get the record tracked for the given row, if any."""
+        return self._records.get(row)
+
+    def pop(self, row):
+        """Stop tracking the given row and return its record, if any."""
+        return self._records.pop(row, None)
+
+    def values(self):
+        """Get the tracked records in row order."""
+        return [self._records[row] for row in self._rows if row in self._records]
+
+    def first_row(self, start, end=None):
+        """Find the first tracked row in the range [start, end].
+
+        Args:
+            start: the first row to consider.
+            end: the last row to consider. If None (default), the range is
+                open-ended.
+
+        Returns:
+            int: the first tracked row in the range, or None if there is none.
+        """
+        rows = self._rows
+        i = bisect.bisect_left(rows, start)
+
+        # skip over rows whose records were already consumed.
+        while i < len(rows) and rows[i] not in self._records:
+            i += 1
+
+        if i < len(rows) and (end is None or rows[i] <= end):
+            return rows[i]
+        return None
@@ -0,0 +1,339 @@
+"""Survey of the quotes a codebase already uses.
+
+Each string of a file is classified the same way the checks classify it
+(see `engine.find_strings`), and counted by the quote it uses: single
+quoted strings, triple quoted strings and docstrings, along with the
+strings an `*-avoid-escape` configuration would switch quotes for. For each
+of the quote options, the number of violations every value of the option
+would report is counted too, so the configuration with the fewest can be
+recommended; each option is independent of the others, since no string is
+checked by more than one.
+
+On a large tree, a random sample of the files can be surveyed instead, and
+the survey stopped as soon as the recommendation is statistically stable:
+for each option, the difference between the violations of the best value
+and the runner-up is measured per file, and the survey stops once its mean
+is above zero with the requested confidence.
+"""
+
+from __future__ import absolute_import
+
+import math
+import os
+import random
+
+from pylint_quotes import engine, runner
+
+# the quote options, and the values each can take.
+OPTIONS = (
+    ('string-quote', engine.CONFIG_OPTS + engine.SMART_CONFIG_OPTS),
+    ('triple-quote', engine.CONFIG_OPTS),
+    ('docstring-quote', engine.CONFIG_OPTS),
+)
+
+# the rank of each value of each option, to break ties by: the default
+# first, then in order.
+_ORDER = {
+    option: {value: (value != default, i) for i, value in enumerate(values)}
+    for (option, values), default in zip(OPTIONS, engine.QuoteConfig())
+}
+
+
+class QuoteUsage:
+    """The quotes used by the strings of a file, or of a set of files.
+
+    Attributes:
+        files: the number of files counted.
+        strings: the number of single quoted strings, keyed by quote.
+        escapes: the number of single quoted strings which only contain
+            one kind of quote, which an `*-avoid-escape` configuration would
+            want quoted with the other.
+        triples: the number of triple quoted strings which are not
+            docstrings, keyed by quote.
+        docstrings: the number of triple quoted docstrings, keyed by quote.
+        violations: the number of violations each value of each option
+            would report, keyed by option, then value.
+    """
+
+    __slots__ = ('files', 'strings', 'escapes', 'triples', 'docstrings', 'violations')
+
+    def __init__(self):
+        self.files = 0
+        self.strings = dict.fromkeys(engine.QUOTES, 0)
+        self.escapes = 0
+        self.triples = dict.fromkeys(engine.TRIPLE_QUOTE_OPTS.values(), 0)
+        self.docstrings = dict.fromkeys(engine.TRIPLE_QUOTE_OPTS.values(), 0)
+        self.violations = {option: dict.fromkeys(values, 0) for option, values in OPTIONS}
+
+    def add(self, other):
+        """Add the counts of another usage to this one.
+
+        Args:
+            other: the QuoteUsage to add.
+        """
+        self.files += other.files
+        self.escapes += other.escapes
+        for counts, other_counts in ((self.strings, other.strings), (self.triples, other.triples),
+                                     (self.docstrings, other.docstrings)):
+            for quote, n in other_counts.items():
+                counts[quote] += n
+        for option, values in other.violations.items():
+            for value, n in values.items():
+                self.violations[option][value] += n
+
+    def recommend(self):
+        """Get the configuration which would report the fewest violations.
+
+        Returns:
+            engine.QuoteConfig: the configuration. On a tie, the default
+            value of an option is used, or else the earliest.
+        """
+        return engine.QuoteConfig(*(
+            min(values, key=lambda value, option=option: (
+                self.violations[option][value], _ORDER[option][value],
+            ))
+            for option, values in OPTIONS
+        ))
+
+
+def count_strings(strings):
+    """Count the quotes used by the strings of a file.
+
+    Args:
+        strings: the (token, row, col, is_docstring) of each string, as
+            yielded by `docstrings.iter_strings`.
+
+    Returns:
+        QuoteUsage: the usage of the file.
+    """
+    classifiers = {
+        value: engine.QuoteClassifier.compile(engine.QuoteConfig(string_quote=value))
+        for value in OPTIONS[0][1]
+    }
+    usage = QuoteUsage()
+    usage.files = 1
+    string_violations = usage.violations['string-quote']
+
+    for token, _, _, is_docstring in strings:
+        start, quote = engine.QuoteClassifier.opening(token)
+        if len(quote) == 3:
+            (usage.docstrings if is_docstring else usage.triples)[quote] += 1
+            continue
+
+        usage.strings[quote] += 1
+        body = token[start + 1:-1]
+        if ('\'' in body) != ('"' in body):
+            usage.escapes += 1
+        for value, classifier in classifiers.items():
+            if classifier.preferred(token, start) != quote:
+                string_violations[value] += 1
+
+    for option, counts in (('triple-quote', usage.triples), ('docstring-quote', usage.docstrings)):
+        for value, quote in engine.TRIPLE_QUOTE_OPTS.items():
+            usage.violations[option][value] = sum(counts.values()) - counts[quote]
+    return usage
+
+
+def count_file(path, scanner='regex'):
+    """Count the quotes used by the strings of a file.
+
+    Args:
+        path: the path to the file.
+        scanner: how to find the strings of the file; one of
+            engine.SCANNERS.
+
+    Returns:
+        QuoteUsage: the usage of the file.
+
+    Raises:
+        OSError: the file could not be read.
+        SyntaxError: the file could not be decoded.
+        tokenize.TokenError: the file could not be tokenized.
+    """
+    with engine.map_file(path) as content:
+        return count_strings(engine.find_strings(content, scanner))
+
+
+def z_score(confidence):
+    """Get the two-sided z-score of a confidence level.
+
+    Args:
+        confidence: the confidence level, between 0 and 1.
+
+    Returns:
+        float: the number of standard errors a normally distributed
+        estimate is within with that confidence.
+    """
+    low, high = 0.0, 10.0
+    for _ in range(60):
+        mid = (low + high) / 2
+        if math.erf(mid / math.sqrt(2)) < confidence:
+            low = mid
+        else:
+            high = mid
+    return high
+
+
+class Survey:
+    """The quote usage of a tree, file by file.
+
+    Attributes:
+        modules: the QuoteUsage of each file surveyed, keyed by path.
+        total: the QuoteUsage of all the files surveyed.
+        errors: the files which could not be surveyed, as runner.CheckResult
+            errors.
+        population: the number of files the surveyed ones were drawn from.
+    """
+
+    __slots__ = ('modules', 'total', 'errors', 'population', '_moments')
+
+    def __init__(self, population=0):
+        self.modules = {}
+        self.total = QuoteUsage()
+        self.errors = []
+        self.population = population
+        # the sums of the violations of each pair of values of each option,
+        # over the files, for the variance of the differences between them.
+        self._moments = {
+            option: {(a, b): 0 for a in values for b in values}
+            for option, values in OPTIONS
+        }
+
+    def add(self, path, usage):
+        """Count the usage of a file.
+
+        Args:
+            path: the path of the file.
+            usage: the QuoteUsage of the file.
+        """
+        self.modules[path] = usage
+        self.total.add(usage)
+        for option, moments in self._moments.items():
+            violations = usage.violations[option]
+            for a, b in moments:
+                moments[a, b] += violations[a] * violations[b]
+
+    def packages(self):
+        """Get the quote usage of each directory of surveyed files.
+
+        Returns:
+            dict: the QuoteUsage of the files directly in each directory,
+            keyed by path, in sorted order.
+        """
+        packages = {}
+        for path in sorted(self.modules):
+            directory = os.path.dirname(path)
+            if directory not in packages:
+                packages[directory] = QuoteUsage()
+            packages[directory].add(self.modules[path])
+        return packages
+
+    def margin(self, option, z):
+        """Get how far ahead the recommended value of an option is.
+
+        Values which would have reported the same violations as the
+        recommended one on every file surveyed -- e.g. `single` and
+        `single-avoid-escape` when no string contains a quote -- are not
+        told apart from it.
+
+        Args:
+            option: the name of the option.
+            z: the z-score of the confidence to measure the margin at.
+
+        Returns:
+            float: the smallest mean difference per file between the
+            violations of any other value and the recommended one, less `z`
+            standard errors of it; at least zero if the recommendation is
+            stable.
+        """
+        n = len(self.modules)
+        if not n:
+            return -math.inf
+        totals = self.total.violations[option]
+        best = min(totals, key=lambda value: (totals[value], _ORDER[option][value]))
+        moments = self._moments[option]
+
+        # the files are drawn without replacement from a finite population,
+        # so none of it is left to chance once all of them are surveyed.
+        correction = 1.0
+        if self.population > 1:
+            correction = math.sqrt(max(self.population - n, 0) / (self.population - 1))
+
+        margins = []
+        for other in totals:
+            mean = (totals[other] - totals[best]) / n
+            square = (moments[other, other] - 2 * moments[other, best] + moments[best, best]) / n
+            if not square:
+                # the same violations on every file.
+                continue
+            if not correction:
+                margins.append(mean)
+            elif n > 1:
+                variance = max(square - mean * mean, 0.0) * n / (n - 1)
+                margins.append(mean - z * math.sqrt(variance / n) * correction)
+            else:
+                margins.append(-math.inf)
+        return min(margins) if margins else 0.0
+
+    def is_stable(self, z):
+        """Check whether the recommendation of every option is stable.
+
+        Args:
+            z: the z-score of the confidence to check at.
+
+        Returns:
+            bool: True if more files are unlikely to change it.
+        """
+        return all(self.margin(option, z) >= 0 for option, _ in OPTIONS)
+
+
+# the sampling options are each given by keyword, as on the command line.
+def survey(  # pylint: disable=too-many-arguments
+        paths, sample=None, stop_early=False, confidence=0.99, min_files=50, seed=None,
+        scanner='regex'):
+    """Survey the quote usage of the files.
+
+    Args:
+        paths: the paths of the files to survey.
+        sample: the number of files to draw at random from the paths. If
+            None (default), all of them are surveyed.
+        stop_early: whether to stop as soon as the recommendation of every
+            option is stable (default False). The files are then surveyed in
+            a random order.
+        confidence: the confidence level the recommendation has to be
+            stable at, between 0 and 1 (default 0.99).
+        min_files: the number of files to survey before first checking
+            whether the recommendation is stable (default 50); it is checked
+            again each time the number of files doubles.
+        seed: the seed of the random order of the files. If None (default),
+            a different order is drawn on every run.
+        scanner: how to find the strings of each file; one of
+            engine.SCANNERS.
+
+    Returns:
+        Survey: the usage of the surveyed files.
+    """
+    paths = list(paths)
+    result = Survey(len(paths))
+    if sample is not None or stop_early:
+        rng = random.Random(seed)
+        paths = rng.sample(paths, min(sample, len(paths)) if sample is not None else len(paths))
+
+    # the recommendation is only tested each time the number of files
+    # doubles, and the chance of a wrong one split between the tests, so
+    # testing more than once does not make stopping on a fluke any likelier.
+    checkpoint = min_files
+    risk = (1 - confidence) / 2
+
+    for path in paths:
+        try:
+            result.add(path, count_file(path, scanner))
+        except runner.CHECK_ERRORS as e:
+            result.errors.append(runner.error_result(path, e))
+            continue
+        if stop_early and len(result.modules) >= checkpoint:
+            if result.is_stable(z_score(1 - risk)):
+                break
+            checkpoint *= 2
+            risk /= 2
+    return result
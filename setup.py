@@ -25,6 +25,11 @@ setup(
     ],
     python_requires=">=3.6",
     packages=['pylint_quotes'],
+    entry_points={
+        'console_scripts': [
+            'pylint-quotes=pylint_quotes.cli:main',
+        ],
+    },
     zip_safe=False,
     classifiers=(
         'Intended Audience :: Developers',
@@ -0,0 +1,106 @@
+"""Tests for checking sources held in memory.
+"""
+
+import glob
+import os
+import tokenize
+
+import pytest
+
+import pylint_quotes
+from pylint_quotes import engine, pool
+
+from utils import read_source
+
+HERE = os.path.dirname(__file__)
+SOURCE_FILES = sorted(glob.glob(os.path.join(HERE, '..', 'example', 'foo', '*.py'))) + sorted(
+    glob.glob(os.path.join(os.path.dirname(tokenize.__file__), '*.py'))
+)[:20]
+
+SOURCE = '''\
+\'\'\'Module.\'\'\'
+
+
+def fn():
+    """Function."""
+    return "a", 'b', """c"""
+'''
+
+
+@pytest.mark.parametrize('string_quote', engine.CONFIG_OPTS + engine.SMART_CONFIG_OPTS)
+@pytest.mark.parametrize('scanner', engine.SCANNERS)
+def test_matches_plugin(string_quote, scanner):
+    sources = [read_source(path) for path in SOURCE_FILES] + [SOURCE]
+    config = engine.QuoteConfig(string_quote=string_quote, triple_quote='double')
+
+    expected = pool.lint_sources(sources, config, max_workers=1)
+
+    assert any(expected)
+    assert [pylint_quotes.check_source(source, config, scanner) for source in sources] == expected
+    assert [result.violations for result in pylint_quotes.check_many(sources, config, scanner)] == expected
+
+
+def test_check_source():
+    assert pylint_quotes.check_source(SOURCE) == [
+        pylint_quotes.Violation('invalid-docstring-quote', 1, 0, '\'\'\'', '"""'),
+        pylint_quotes.Violation('invalid-string-quote', 6, 11, '"', '\''),
+        pylint_quotes.Violation('invalid-triple-quote', 6, 21, '"""', '\'\'\''),
+    ]
+    assert pylint_quotes.check_source(SOURCE, {'string-quote': 'double', 'docstring_quote': 'single'}) == [
+        pylint_quotes.Violation('invalid-docstring-quote', 5, 4, '"""', '\'\'\''),
+        pylint_quotes.Violation('invalid-string-quote', 6, 16, '\'', '"'),
+        pylint_quotes.Violation('invalid-triple-quote', 6, 21, '"""', '\'\'\''),
+    ]
+
+
+@pytest.mark.parametrize('scanner', engine.SCANNERS)
+def test_encoding_declaration(scanner):
+    text = '# -*- coding: latin-1 -*-\nx = "\xe9" + "\xe9"\n'
+    expected = [
+        pylint_quotes.Violation('invalid-string-quote', 2, 4, '"', '\''),
+        pylint_quotes.Violation('invalid-string-quote', 2, 10, '"', '\''),
+    ]
+
+    # the declaration applies to bytes, but not to text.
+    assert pylint_quotes.check_source(text.encode('latin-1'), scanner=scanner) == expected
+    assert pylint_quotes.check_source(text, scanner=scanner) == expected
+
+
+@pytest.mark.parametrize('config', [{'string-quote': 'both'}, {'quote': 'single'}])
+def test_invalid_config(config):
+    with pytest.raises(ValueError):
+        pylint_quotes.check_source('', config)
+    with pytest.raises(ValueError):
+        pylint_quotes.check_many([], config)
+
+
+@pytest.mark.parametrize('config', [[('string-quote', 'single')], 'single', 1])
+def test_config_not_a_mapping(config):
+    with pytest.raises(TypeError, match='must be a QuoteConfig or a mapping'):
+        pylint_quotes.check_source('', config)
+    with pytest.raises(TypeError, match='must be a QuoteConfig or a mapping'):
+        pylint_quotes.check_many([], config)
+
+
+def test_check_many(monkeypatch):
+    compiled = []
+    original = engine.QuoteClassifier.compile
+
+    def compile_config(config):
+        compiled.append(config)
+        return original(config)
+
+    monkeypatch.setattr(engine.QuoteClassifier, 'compile', staticmethod(compile_config))
+
+    results = pylint_quotes.check_many(iter([SOURCE, ('broken', 'x = """a\n'), ('clean', b'x = \'a\'\n')]))
+
+    assert [(r.path, len(r.violations), r.error and r.error[:2]) for r in results] == [
+        (None, 3, None), ('broken', 0, ('E0001', 'syntax-error')), ('clean', 0, None),
+    ]
+    # the configuration is compiled once for the whole batch.
+    assert compiled == [engine.QuoteConfig()]
+
+
+def test_check_source_error():
+    with pytest.raises(tokenize.TokenError):
+        pylint_quotes.check_source('x = (\n')
@@ -7,7 +7,7 @@ import pytest
 from pylint_quotes.checker import StringQuoteChecker
 from pylint.testutils import Message, set_config
 
-from utils import TRI_Q_DOUB, TRI_Q_SING, StringQuoteCheckerTestCase
+from utils import TRI_Q_DOUB, TRI_Q_SING, StringQuoteCheckerTestCase, ast_detection_only
 
 
 @pytest.mark.skipif(sys.version_info < (3, 5), reason='requires python3.5 or python3.6')
@@ -103,6 +103,7 @@ async def fn3(x):
         self.check_async_function(test_str)
 
     @set_config(docstring_quote='single')
+    @ast_detection_only
     def test_single_line_double_quote_docstring_with_cfg_single_multiple_def(self):
 
         test_str = '''
@@ -221,6 +222,7 @@ async def fn3(x):
         self.check_async_function(test_str)
 
     @set_config(docstring_quote='single')
+    @ast_detection_only
     def test_multi_line_double_quote_docstring_with_cfg_single_multiple_def(self):
 
         test_str = '''
@@ -315,6 +317,7 @@ async def fn(x):  #@
         self.check_async_function(test_str)
 
     @set_config(docstring_quote='single')
+    @ast_detection_only
     def test_single_line_double_quote_docstring_with_cfg_single_def_contents_03(self):
 
         test_str = '''
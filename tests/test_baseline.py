@@ -0,0 +1,165 @@
+"""Tests for the baseline of the violations a codebase already has.
+"""
+
+import json
+import os
+
+import astroid
+import pytest
+from pylint.testutils import UnittestLinter, _tokenize_str as tokenize_str
+
+from pylint_quotes import cli, engine, runner
+from pylint_quotes.baseline import Baseline, Matcher, filter_violations
+from pylint_quotes.checker import StringQuoteChecker
+
+from utils import walk
+
+SOURCE = '''\
+\'\'\'Module.\'\'\'
+
+
+def fn():
+    """Function."""
+    return ["a", "a", 'b']
+
+
+def other():
+    """Other."""
+    return 'c'
+'''
+
+
+def _run(capsys, *argv):
+    status = cli.main(list(argv))
+    return status, capsys.readouterr().out.splitlines()
+
+
+def _write_baseline(capsys, tmp_path, path):
+    baseline = str(tmp_path / 'baseline.json')
+    status, lines = _run(capsys, 'check', '--baseline', baseline, '--update-baseline', str(path))
+    assert (status, lines) == (0, [])
+    return baseline
+
+
+def test_fingerprint():
+    def fingerprints(source, col=4):
+        matcher = Matcher.from_tokens(tokenize_str(source))
+        return [matcher.fingerprint('C4001', '"', 2, col), matcher.fingerprint('C4001', '"', 2, col)]
+
+    first, second = fingerprints('import os\nx = "a"\n')
+    assert first != second
+    # neither the row nor the indentation matter, only the code around the
+    # string on its lines, and how many times it was seen before.
+    assert fingerprints('def f():\n    x = "a"\n', 8)[0] == first
+    assert fingerprints('import os\ny = "a"\n')[0] != first
+    assert fingerprints('import os\nx = ("a")\n', 5)[0] != first
+
+
+def test_filter_violations():
+    content = b'x = """a\nb""" + "c"\ny = """a\nb"""\n'
+    violations = engine.check_bytes(content, engine.QuoteConfig())
+    matcher = Matcher.from_tokens(tokenize_str(content.decode()))
+    fingerprints = {matcher.fingerprint(v.msg_id, v.quote, v.row, v.col) for v in violations[:2]}
+
+    # the tokens and the source are fingerprinted the same way.
+    assert filter_violations(violations, content, fingerprints) == (violations[2:], 2)
+
+
+def test_save_load(tmp_path):
+    path = str(tmp_path / 'baseline.json')
+    baseline = Baseline.load(path)
+    assert len(baseline) == 0
+
+    baseline.update(str(tmp_path / 'a' / 'mod.py'), [1, 2 ** 64 - 1])
+    baseline.update(str(tmp_path / 'b.py'), [3])
+    baseline.update(str(tmp_path / 'b.py'), [])
+    baseline.save(path)
+
+    loaded = Baseline.load(path)
+    assert list(json.loads((tmp_path / 'baseline.json').read_text())['files']) == ['a/mod.py']
+    assert len(loaded) == 2
+    assert loaded.fingerprints(str(tmp_path / 'a' / 'mod.py')) == {1, 2 ** 64 - 1}
+    assert loaded.fingerprints(str(tmp_path / 'b.py')) == frozenset()
+    assert loaded.is_current(path)
+
+
+@pytest.mark.parametrize('content', ['[]', '{"version": 0, "files": {}}', '{"version": 1, "files": []}'])
+def test_load_invalid(tmp_path, content):
+    path = tmp_path / 'baseline.json'
+    path.write_text(content)
+
+    with pytest.raises(ValueError):
+        Baseline.load(str(path))
+
+
+def test_cli_only_reports_new_violations(tmp_path, capsys, monkeypatch):
+    path = tmp_path / 'mod.py'
+    path.write_text(SOURCE)
+    baseline = _write_baseline(capsys, tmp_path, path)
+
+    status, lines = _run(capsys, 'check', '--baseline', baseline, str(path))
+    assert (status, lines) == (0, [])
+
+    # lines moving around the strings, and the baseline used from another
+    # directory, do not matter, but another copy of a line does.
+    line = '    return ["a", "a", \'b\']\n'
+    path.write_text('# comment\n\n' + SOURCE.replace(line, line * 2))
+    monkeypatch.chdir(tmp_path)
+    status = cli.main(['check', '--baseline', baseline, '-j', '2', 'mod.py'])
+    out, err = capsys.readouterr()
+    assert status == runner.CONVENTION_STATUS
+    assert out.splitlines() == [
+        'mod.py:9:12: C4001: Invalid string quote ", should be \' (invalid-string-quote)',
+        'mod.py:9:17: C4001: Invalid string quote ", should be \' (invalid-string-quote)',
+    ]
+    assert 'baseline: 3 violations suppressed' in err
+
+
+def test_cli_update_baseline_errors(tmp_path):
+    for argv in (['--update-baseline'], ['--update-baseline', '--baseline', 'x', '--fix']):
+        with pytest.raises(SystemExit):
+            cli.main(['check'] + argv + [str(tmp_path)])
+
+    path = tmp_path / 'baseline.json'
+    path.write_text('{}')
+    with pytest.raises(SystemExit):
+        cli.main(['check', '--baseline', str(path), str(tmp_path)])
+
+
+def test_cli_fix_baseline_error(tmp_path):
+    source = tmp_path / 'mod.py'
+    source.write_text('x = "a"\n')
+    baseline = tmp_path / 'baseline.json'
+    cli.main(['check', '--baseline', str(baseline), '--update-baseline', str(source)])
+
+    with pytest.raises(SystemExit, match='--fix cannot be used with --baseline'):
+        cli.main(['check', '--fix', '--baseline', str(baseline), str(source)])
+    # the string recorded in the baseline is not rewritten.
+    assert source.read_text() == 'x = "a"\n'
+
+
+@pytest.mark.parametrize('detection', ['tokens', 'ast'])
+def test_plugin(tmp_path, capsys, detection):
+    path = tmp_path / 'mod.py'
+    path.write_text(SOURCE)
+    baseline = _write_baseline(capsys, tmp_path, path)
+    source = SOURCE + 'x = "d"\n'
+
+    linter = UnittestLinter()
+    linter.current_file = str(path)
+    checker = StringQuoteChecker(linter)
+    checker.config.docstring_detection = detection
+    checker.config.quote_baseline = baseline
+    checker.open()
+    checker.process_tokens(tokenize_str(source))
+    walk(checker, astroid.parse(source))
+
+    assert [(m.msg_id, m.line) for m in linter.release_messages()] == [('invalid-string-quote', 12)]
+
+    # the baseline is only loaded again once it changes.
+    loaded = checker._baseline
+    checker.open()
+    assert checker._baseline is loaded
+    os.utime(baseline, ns=(0, 0))
+    checker.open()
+    assert checker._baseline is not loaded
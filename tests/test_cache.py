@@ -0,0 +1,118 @@
+"""Tests for the on-disk result cache.
+"""
+
+import os
+import time
+
+from pylint.testutils import UnittestLinter, _tokenize_str as tokenize_str
+
+from pylint_quotes import engine, runner
+from pylint_quotes.cache import ResultCache
+from pylint_quotes.checker import StringQuoteChecker
+
+SOURCE = '"""Doc."""\nx = "a"\n'
+VIOLATIONS = [engine.Violation('invalid-string-quote', 2, 4, '"', "'")]
+
+
+def _entries(directory):
+    return sorted(
+        os.path.join(root, name)
+        for root, _, files in os.walk(directory) for name in files
+    )
+
+
+def test_key():
+    config = engine.QuoteConfig()
+    key = ResultCache.key(b'x = 1\n', config)
+
+    assert key == ResultCache.key(b'x = 1\n', engine.QuoteConfig())
+    assert key != ResultCache.key(b'x = 2\n', config)
+    assert key != ResultCache.key(b'x = 1\n', config._replace(string_quote='double'))
+
+
+def test_get_put(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = cache.key(SOURCE.encode(), engine.QuoteConfig())
+
+    assert cache.get(key) is None
+
+    cache.put(key, VIOLATIONS)
+
+    assert cache.get(key) == VIOLATIONS
+    assert (cache.hits, cache.misses) == (1, 1)
+    # no temporary files are left behind.
+    assert [p for p in _entries(str(tmp_path)) if not p.endswith('.json')] == []
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = cache.key(SOURCE.encode(), engine.QuoteConfig())
+    cache.put(key, VIOLATIONS)
+
+    path, = _entries(str(tmp_path))
+    with open(path, 'w') as f:
+        f.write('[["invalid-string-quote"')
+
+    assert cache.get(key) is None
+
+
+def test_evict_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    keys = [cache.key(str(i).encode(), engine.QuoteConfig()) for i in range(4)]
+    for i, key in enumerate(keys):
+        cache.put(key, VIOLATIONS)
+        path = cache._path(key)
+        os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+
+    # reading the oldest entry makes it the most recently used.
+    assert cache.get(keys[0]) == VIOLATIONS
+
+    entry_size = os.path.getsize(cache._path(keys[0]))
+    cache.max_size = entry_size * 2
+
+    assert cache.evict() == 2
+    assert cache.get(keys[0]) == VIOLATIONS
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is None
+    assert cache.get(keys[3]) == VIOLATIONS
+
+
+def test_runner_cache(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / 'src' / 'mod{}.py'.format(i)
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(SOURCE)
+        paths.append(str(path))
+    config = engine.QuoteConfig()
+
+    cache = ResultCache(str(tmp_path / 'cache'))
+    first = [r.violations for r in runner.run(paths, config, cache=cache)]
+
+    # the files have the same content, so only the first is a miss.
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    cache = ResultCache(str(tmp_path / 'cache'))
+    second = [r.violations for r in runner.run(paths, config, jobs=2, cache=cache)]
+
+    assert (cache.hits, cache.misses) == (3, 0)
+    assert first == second == [VIOLATIONS] * 3
+
+
+def test_plugin_cache(tmp_path):
+    path = tmp_path / 'mod.py'
+    path.write_text(SOURCE)
+
+    def _check():
+        linter = UnittestLinter()
+        linter.current_file = str(path)
+        checker = StringQuoteChecker(linter)
+        checker.config.quote_cache_dir = str(tmp_path / 'cache')
+        checker.open()
+        checker.process_tokens(tokenize_str(SOURCE))
+        checker.close()
+        messages = [(m.msg_id, m.line, m.args) for m in linter.release_messages()]
+        return messages, (checker._cache.hits, checker._cache.misses)
+
+    assert _check() == ([('invalid-string-quote', 2, ('"', "'"))], (0, 1))
+    assert _check() == ([('invalid-string-quote', 2, ('"', "'"))], (1, 0))
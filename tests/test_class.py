@@ -4,7 +4,7 @@
 from pylint_quotes.checker import StringQuoteChecker
 from pylint.testutils import Message, set_config
 
-from utils import TRI_Q_DOUB, TRI_Q_SING, StringQuoteCheckerTestCase
+from utils import TRI_Q_DOUB, TRI_Q_SING, StringQuoteCheckerTestCase, ast_detection_only
 
 
 class TestClassStringQuoteChecker(StringQuoteCheckerTestCase):
@@ -96,6 +96,7 @@ class TestClass3(object):
         self.check_class(test_str)
 
     @set_config(docstring_quote='single')
+    @ast_detection_only
     def test_single_line_double_quote_docstring_with_cfg_single_multiple_cls(self):
 
         test_str = '''
@@ -214,6 +215,7 @@ class TestClass3(object):
         self.check_class(test_str)
 
     @set_config(docstring_quote='single')
+    @ast_detection_only
     def test_multi_line_double_quote_docstring_with_cfg_single_multiple_cls(self):
 
         test_str = '''
@@ -290,6 +292,7 @@ class TestClass(object):  #@
         self.check_class(test_str)
 
     @set_config(docstring_quote='single')
+    @ast_detection_only
     def test_single_line_double_quote_docstring_with_cfg_single_cls_contents_02(self):
 
         test_str = '''
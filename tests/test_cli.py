@@ -0,0 +1,136 @@
+"""Tests for the standalone pylint-quotes command line interface.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from pylint_quotes import cli, runner
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+EXAMPLE_DIR = os.path.join(HERE, '..', 'example')
+
+EXAMPLE_OUTPUT = [
+    'foo/__init__.py:3:12: C4001: Invalid string quote ", should be \' (invalid-string-quote)',
+    'foo/other.py:1:0: C4003: Invalid docstring quote \'\'\', should be """ (invalid-docstring-quote)',
+    'foo/other.py:10:15: C4002: Invalid triple quote """, should be \'\'\' (invalid-triple-quote)',
+    'foo/utils.py:5:4: C4003: Invalid docstring quote \'\'\', should be """ (invalid-docstring-quote)',
+    'foo/utils.py:10:4: C4003: Invalid docstring quote \'\'\', should be """ (invalid-docstring-quote)',
+    'foo/utils.py:15:11: C4001: Invalid string quote ", should be \' (invalid-string-quote)',
+]
+
+
+def _run(capsys, *argv):
+    status = cli.main(list(argv))
+    return status, capsys.readouterr().out.splitlines()
+
+
+def test_check_example(capsys, monkeypatch):
+    monkeypatch.chdir(EXAMPLE_DIR)
+
+    status, lines = _run(capsys, 'check', 'foo')
+
+    assert status == runner.CONVENTION_STATUS
+    assert lines == [line.replace('/', os.sep, 1) for line in EXAMPLE_OUTPUT]
+
+
+def test_check_options(tmp_path, capsys):
+    path = tmp_path / 'mod.py'
+    path.write_text('"""Doc."""\nx = "a"\ny = \'\'\'b\'\'\'\n')
+
+    status, lines = _run(
+        capsys, 'check', '--string-quote', 'double', '--triple-quote', 'double', str(path)
+    )
+
+    assert status == runner.CONVENTION_STATUS
+    assert lines == [
+        '{}:3:4: C4002: Invalid triple quote \'\'\', should be """ (invalid-triple-quote)'.format(path),
+    ]
+
+
+def test_check_rcfile(tmp_path, capsys):
+    path = tmp_path / 'mod.py'
+    path.write_text('"""Doc."""\nx = "a"\n')
+    rcfile = tmp_path / 'pylintrc'
+    rcfile.write_text('[STRING_QUOTES]\nstring-quote=double\ndocstring-quote=single\n')
+
+    status, lines = _run(capsys, 'check', '--rcfile', str(rcfile), str(path))
+
+    assert status == runner.CONVENTION_STATUS
+    assert lines == [
+        '{}:1:0: C4003: Invalid docstring quote """, should be \'\'\' (invalid-docstring-quote)'.format(path),
+    ]
+
+    # the command line takes precedence over the rcfile.
+    status, lines = _run(
+        capsys, 'check', '--rcfile', str(rcfile), '--docstring-quote', 'double', str(path)
+    )
+
+    assert status == 0
+    assert lines == []
+
+
+def test_check_rcfile_invalid_value(tmp_path):
+    rcfile = tmp_path / 'pylintrc'
+    rcfile.write_text('[MASTER]\nstring-quote=backtick\n')
+
+    with pytest.raises(SystemExit):
+        cli.main(['check', '--rcfile', str(rcfile), str(tmp_path)])
+
+
+def test_check_clean(tmp_path, capsys):
+    (tmp_path / 'mod.py').write_text('"""Doc."""\nx = \'a\'\n')
+
+    assert _run(capsys, 'check', str(tmp_path)) == (0, [])
+
+
+def test_check_syntax_error(tmp_path, capsys):
+    path = tmp_path / 'mod.py'
+    path.write_text('x = """unterminated\n')
+
+    status, lines = _run(capsys, 'check', str(path))
+
+    assert status == runner.ERROR_STATUS
+    assert len(lines) == 1
+    assert lines[0].startswith('{}:1:4: E0001: '.format(path))
+    assert lines[0].endswith('(syntax-error)')
+
+
+def test_check_missing_file(tmp_path, capsys):
+    path = tmp_path / 'missing.py'
+
+    status, lines = _run(capsys, 'check', str(path))
+
+    assert status == runner.FATAL_STATUS
+    assert len(lines) == 1
+    assert lines[0].startswith('{}:1:0: F0001: '.format(path))
+
+
+def test_does_not_import_pylint():
+    code = (
+        'import sys\n'
+        'from pylint_quotes import cli\n'
+        'cli.main(["check", sys.argv[1]])\n'
+        'print(sorted(m for m in sys.modules if m.split(".")[0] in ("pylint", "astroid")))\n'
+    )
+    out = subprocess.run(
+        [sys.executable, '-c', code, EXAMPLE_DIR],
+        stdout=subprocess.PIPE, universal_newlines=True, check=True,
+    ).stdout
+
+    assert out.splitlines()[-1] == '[]'
+
+
+def test_check_jobs(capsys, monkeypatch, tmp_path):
+    monkeypatch.chdir(EXAMPLE_DIR)
+    durations = tmp_path / 'durations.json'
+
+    status, lines = _run(capsys, 'check', '--jobs', '2', '--durations-file', str(durations), 'foo')
+
+    assert status == runner.CONVENTION_STATUS
+    assert lines == [line.replace('/', os.sep, 1) for line in EXAMPLE_OUTPUT]
+    assert sorted(runner.load_durations(str(durations))) == [
+        os.path.join('foo', name) for name in ('__init__.py', 'other.py', 'utils.py')
+    ]
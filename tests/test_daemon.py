@@ -0,0 +1,199 @@
+"""Tests for the daemon answering editors.
+"""
+
+import glob
+import io
+import json
+import os
+import random
+import socket
+import threading
+import time
+import tokenize
+
+import pytest
+
+from pylint_quotes import cli, daemon, engine
+
+STDLIB_FILES = sorted(glob.glob(os.path.join(os.path.dirname(tokenize.__file__), '*.py')))
+
+SOURCE = '''\
+"""Module."""
+
+
+def f(x):
+    \'\'\'Function.\'\'\'
+    if x:
+        return "a"
+    return \'b\'
+
+
+class C:
+    """Class."""
+
+    def g(self):
+        return \'\'\'c
+d\'\'\', "it's"
+'''
+
+
+def _check(server, text, path='mod.py'):
+    return server.check(path, text)
+
+
+def _expected(text, config=engine.QuoteConfig()):
+    return [(v.row, v.col, v.msg_id) for v in engine.check_bytes(text.encode('utf-8'), config)]
+
+
+def _found(result):
+    return [(d['line'], d['column'], d['msg_id']) for d in result['diagnostics']]
+
+
+def test_check():
+    config = engine.QuoteConfig('single', 'double', 'double')
+    result = _check(daemon.Daemon(config), SOURCE)
+
+    assert result['error'] is None
+    assert result['diagnostics'] == [
+        {
+            'msg_id': 'C4003', 'symbol': 'invalid-docstring-quote',
+            'message': 'Invalid docstring quote \'\'\', should be """',
+            'line': 5, 'column': 4, 'end_line': 5, 'end_column': 19,
+        },
+        {
+            'msg_id': 'C4001', 'symbol': 'invalid-string-quote', 'message': 'Invalid string quote ", should be \'',
+            'line': 7, 'column': 15, 'end_line': 7, 'end_column': 18,
+        },
+        {
+            'msg_id': 'C4002', 'symbol': 'invalid-triple-quote',
+            'message': 'Invalid triple quote \'\'\', should be """',
+            'line': 15, 'column': 15, 'end_line': 16, 'end_column': 4,
+        },
+        {
+            'msg_id': 'C4001', 'symbol': 'invalid-string-quote', 'message': 'Invalid string quote ", should be \'',
+            'line': 16, 'column': 6, 'end_line': 16, 'end_column': 12,
+        },
+    ]
+    assert _found(result) == _expected(SOURCE, config)
+
+
+@pytest.mark.parametrize('edit, rescanned', [
+    # a statement is rescanned from the statement before it (the body of
+    # the if statement could be a docstring otherwise) up to the next one.
+    (('return "a"', 'return "ab"'), 2),
+    # a docstring is rescanned from the header of its function.
+    (('\'\'\'Function.\'\'\'', '\'\'\'Functions.\'\'\''), 2),
+    # lines added shift the rest.
+    (('    return \'b\'\n', '    return \'b\'\n    x = "y"\n\n'), 5),
+    # a triple quoted string opened swallows the rest of the module.
+    (('return "a"', 'return """a'), None),
+])
+def test_incremental(edit, rescanned):
+    server = daemon.Daemon(engine.QuoteConfig())
+    _check(server, SOURCE)
+
+    text = SOURCE.replace(*edit)
+    result = _check(server, text)
+
+    fresh = _check(daemon.Daemon(engine.QuoteConfig()), text)
+    assert result == fresh
+    if rescanned is not None:
+        assert server.files['mod.py'].rescanned == rescanned
+        assert _found(result) == _expected(text)
+    else:
+        assert result['error']['symbol'] == 'syntax-error'
+
+    # going back to the original rescans from the last version without an
+    # error, or the one before.
+    assert _check(server, SOURCE) == _check(daemon.Daemon(engine.QuoteConfig()), SOURCE)
+
+
+def test_random_edits():
+    rng = random.Random(0)
+    config = engine.QuoteConfig('double-avoid-escape', 'double', 'single')
+    for path in rng.sample(STDLIB_FILES, 10):
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        server = daemon.Daemon(config)
+        assert _found(_check(server, text)) == _expected(text, config)
+        for _ in range(30):
+            pos = rng.randrange(len(text) + 1)
+            if rng.random() < 0.3:
+                text = text[:pos] + text[pos + 1:]
+            else:
+                text = text[:pos] + rng.choice(['x', ' ', '\n', '\n    ', ':', '(', ')', '"', '\'', '"""', '#']) \
+                    + text[pos:]
+            state = server.check_text(path, text)
+            fresh = daemon.Daemon(config).check_text(path, text)
+            assert (state.entries, state.points, state.error) == (fresh.entries, fresh.points, fresh.error), path
+
+
+def _request(method, request_id=1, **params):
+    return json.dumps({'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params})
+
+
+@pytest.mark.parametrize('line, code', [
+    ('{', daemon.PARSE_ERROR),
+    ('[]', daemon.INVALID_REQUEST),
+    ('{"jsonrpc": "2.0", "id": 1}', daemon.INVALID_REQUEST),
+    (_request('lint'), daemon.METHOD_NOT_FOUND),
+    (_request('check', path='a.py'), daemon.INVALID_PARAMS),
+    ('{"jsonrpc": "2.0", "id": 1, "method": "forget", "params": [1]}', daemon.INVALID_PARAMS),
+])
+def test_protocol_errors(line, code):
+    response = json.loads(daemon.Daemon(engine.QuoteConfig()).handle_line(line))
+
+    assert response['error']['code'] == code
+
+
+@pytest.mark.parametrize('params', [{}, {'params': {'path': 1}}, {'params': [1]}])
+def test_notification_errors_not_answered(params):
+    request = dict({'jsonrpc': '2.0', 'method': 'forget'}, **params)
+
+    assert daemon.Daemon(engine.QuoteConfig()).handle_line(json.dumps(dict(request, method='nope'))) is None
+    assert daemon.Daemon(engine.QuoteConfig()).handle_line(json.dumps(request)) is None
+
+
+def test_serve_stdio():
+    stdin = io.BytesIO('\n'.join([
+        _request('check', 1, path='a.py', text='x = "a"\n'),
+        '',
+        # notifications are not answered.
+        json.dumps({'jsonrpc': '2.0', 'method': 'forget', 'params': {'path': 'a.py'}}),
+        _request('forget', 2, path='a.py'),
+        _request('shutdown', 3),
+        _request('check', 4, path='a.py', text=''),
+    ]).encode('utf-8'))
+    stdout = io.BytesIO()
+
+    daemon.serve_stdio(daemon.Daemon(engine.QuoteConfig()), stdin, stdout)
+
+    responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [r['id'] for r in responses] == [1, 2, 3]
+    assert _found(responses[0]['result']) == [(1, 4, 'C4001')]
+    assert responses[1]['result'] is False
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='needs Unix sockets')
+def test_serve_socket(tmp_path):
+    path = str(tmp_path / 'daemon.sock')
+    thread = threading.Thread(target=cli.main, args=(['serve', '--socket', path, '--string-quote', 'double'],))
+    thread.start()
+    for _ in range(100):
+        if os.path.exists(path):
+            break
+        time.sleep(0.05)
+
+    with socket.socket(socket.AF_UNIX) as client:
+        client.connect(path)
+        stream = client.makefile('rwb')
+        stream.write(_request('check', 1, path='a.py', text='x = \'a\'\n').encode('utf-8') + b'\n')
+        stream.write(_request('shutdown', 2).encode('utf-8') + b'\n')
+        stream.flush()
+        responses = [json.loads(stream.readline()) for _ in range(2)]
+
+    thread.join(5)
+    assert not thread.is_alive()
+    assert not os.path.exists(path)
+    assert _found(responses[0]['result']) == [(1, 4, 'C4001')]
+    assert responses[1] == {'jsonrpc': '2.0', 'id': 2, 'result': None}
@@ -0,0 +1,185 @@
+"""Tests for restricting quote checks to the lines changed in a diff.
+"""
+
+import io
+import os
+import subprocess
+
+import pytest
+
+from pylint_quotes import cli, diff, engine
+
+DIFF = '''\
+diff --git a/pkg/mod.py b/pkg/mod.py
+index 1111111..2222222 100644
+--- a/pkg/mod.py
++++ b/pkg/mod.py
+@@ -2,0 +3,2 @@ import os
++x = "a"
++y = "b"
+@@ -10 +12 @@ def fn():
+-    return 1
++    return "c"
+diff --git a/old.py b/old.py
+deleted file mode 100644
+--- a/old.py
++++ /dev/null
+@@ -1 +0,0 @@
+-x = 1
+diff --git a/notes.txt b/notes.txt
+--- a/notes.txt
++++ b/notes.txt
+@@ -1,3 +1,3 @@
+ context
+-old
++new
+ context
+'''
+
+
+def test_parse_unified_diff():
+    changed = diff.parse_unified_diff(DIFF.splitlines())
+
+    assert changed == {
+        'pkg/mod.py': diff.LineRanges([3, 4, 12]),
+        'notes.txt': diff.LineRanges([2]),
+    }
+    assert changed['pkg/mod.py'].ranges == [(3, 4), (12, 12)]
+
+
+@pytest.mark.parametrize('first,last,expected', [
+    (1, 2, False),
+    (1, 3, True),
+    (4, 4, True),
+    (5, 11, False),
+    (5, 20, True),
+    (13, 20, False),
+])
+def test_line_ranges_overlaps(first, last, expected):
+    assert diff.LineRanges([3, 4, 12]).overlaps(first, last) is expected
+
+
+def test_check_tokens_lines(tmp_path):
+    path = tmp_path / 'mod.py'
+    path.write_text(
+        'x = "a"\n'
+        'y = """multi\n'
+        'line"""\n'
+        'z = "b"\n'
+    )
+    config = engine.QuoteConfig()
+
+    # the triple quote starts before the changed line, but spans it.
+    violations = engine.check_file(str(path), config, diff.LineRanges([3]))
+
+    assert [v.row for v in violations] == [2]
+    assert [v.row for v in engine.check_file(str(path), config, diff.LineRanges([4]))] == [4]
+    assert [v.row for v in engine.check_file(str(path), config)] == [1, 2, 4]
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ('git', '-c', 'user.name=test', '-c', 'user.email=test@example.com') + args,
+        cwd=str(repo), check=True, stdout=subprocess.PIPE,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    _git(tmp_path, 'init', '-q')
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / 'mod.py').write_text('x = "a"\ny = "b"\n')
+    (tmp_path / 'other.py').write_text('x = "a"\n')
+    _git(tmp_path, 'add', '.')
+    _git(tmp_path, 'commit', '-q', '-m', 'initial')
+    monkeypatch.chdir(tmp_path / 'pkg')
+    return tmp_path
+
+
+def test_git_diff(repo, capsys):
+    (repo / 'pkg' / 'mod.py').write_text('x = "a"\ny = "b"\nz = "c"\n')
+    (repo / 'other.py').write_text('x = "a"\ny = "b"\n')
+
+    status = cli.main(['check', '--diff', 'HEAD'])
+    lines = capsys.readouterr().out.splitlines()
+
+    assert status == 16
+    assert lines == [
+        os.path.join('..', 'other.py') + ':2:4: C4001: Invalid string quote ", should be \' (invalid-string-quote)',
+        'mod.py:3:4: C4001: Invalid string quote ", should be \' (invalid-string-quote)',
+    ]
+
+    # the paths limit which changed files are checked.
+    status = cli.main(['check', '--diff', 'HEAD', '.'])
+    lines = capsys.readouterr().out.splitlines()
+
+    assert lines == [
+        'mod.py:3:4: C4001: Invalid string quote ", should be \' (invalid-string-quote)',
+    ]
+
+
+def test_diff_stdin(repo, capsys, monkeypatch):
+    (repo / 'pkg' / 'mod.py').write_text('x = "a"\ny = "b"\nz = "c"\n')
+    patch = subprocess.run(
+        ['git', 'diff', 'HEAD'], cwd=str(repo), check=True,
+        stdout=subprocess.PIPE, universal_newlines=True,
+    ).stdout
+    monkeypatch.setattr('sys.stdin', io.StringIO(patch))
+
+    status = cli.main(['check', '--diff', '-'])
+    lines = capsys.readouterr().out.splitlines()
+
+    assert status == 16
+    assert lines == [
+        'mod.py:3:4: C4001: Invalid string quote ", should be \' (invalid-string-quote)',
+    ]
+
+
+def test_git_diff_bad_revision(repo):
+    with pytest.raises(SystemExit):
+        cli.main(['check', '--diff', 'no-such-revision'])
+
+
+def test_parse_quoted_paths():
+    changed = diff.parse_unified_diff([
+        '+++ "b/caf\\303\\251.py"',
+        '@@ -0,0 +1 @@',
+        '+x = "a"',
+        '+++ "b/tab\\there \\"quoted\\".py"',
+        '@@ -0,0 +1 @@',
+        '+x = "a"',
+        '+++ b/with space.py\t',
+        '@@ -0,0 +1 @@',
+        '+x = "a"',
+    ])
+
+    assert changed == {
+        'caf\xe9.py': diff.LineRanges([1]),
+        'tab\there "quoted".py': diff.LineRanges([1]),
+        'with space.py': diff.LineRanges([1]),
+    }
+
+
+@pytest.mark.parametrize('config,path', [
+    # non-ASCII paths are quoted.
+    ('core.quotePath=true', 'caf\xe9.py'),
+    # the prefixes are 'c/', 'i/' and 'w/' rather than 'a/' and 'b/'.
+    ('diff.mnemonicPrefix=true', 'mod.py'),
+    # there are no prefixes, so a 'b/' directory would be stripped.
+    ('diff.noprefix=true', os.path.join('b', 'mod.py')),
+])
+def test_git_diff_config(repo, capsys, config, path):
+    (repo / path).parent.mkdir(exist_ok=True)
+    (repo / path).write_text('x = 1\n', encoding='utf-8')
+    _git(repo, 'add', '.')
+    _git(repo, 'commit', '-q', '-m', 'add')
+    _git(repo, 'config', *config.split('='))
+    (repo / path).write_text('x = "a"\n', encoding='utf-8')
+
+    status = cli.main(['check', '--diff', 'HEAD'])
+    lines = capsys.readouterr().out.splitlines()
+
+    assert status == 16
+    assert lines == [
+        os.path.join('..', path) + ':1:4: C4001: Invalid string quote ", should be \' (invalid-string-quote)',
+    ]
@@ -0,0 +1,106 @@
+"""Tests that strings are not checked for messages disabled for a module.
+"""
+
+import pytest
+from pylint.reporters import CollectingReporter
+
+from pylint_quotes import engine
+
+from utils import SYMBOLS, lint
+
+SOURCE = '''\
+"""Module."""
+
+
+def fn():
+    """Function."""
+    # pylint: disable=invalid-string-quote
+    x = "a"
+    return x, """b"""
+
+
+def other():
+    \'\'\'Other.\'\'\'
+    return "c"
+'''
+
+ALL_MESSAGES = [
+    (7, 'invalid-string-quote'),
+    (8, 'invalid-triple-quote'),
+    (12, 'invalid-docstring-quote'),
+    (13, 'invalid-string-quote'),
+]
+
+
+@pytest.fixture
+def classified(monkeypatch):
+    """Record the single quoted strings the checker evaluates the string
+    quote policy for.
+    """
+    calls = []
+    preferred = engine.QuoteClassifier.preferred
+
+    def _preferred(self, token, start):
+        calls.append(token)
+        return preferred(self, token, start)
+
+    monkeypatch.setattr(engine.QuoteClassifier, 'preferred', _preferred)
+    return calls
+
+
+def _lint(tmp_path, source, *args):
+    path = tmp_path / 'mod.py'
+    path.write_text(source)
+    reporter = CollectingReporter()
+    lint([str(path)], *args, reporter=reporter)
+    return sorted((m.line, m.symbol) for m in reporter.messages)
+
+
+@pytest.mark.parametrize('detection', ['tokens', 'ast'])
+def test_disabled_lines(tmp_path, classified, detection):
+    messages = _lint(tmp_path, SOURCE, '--docstring-detection=' + detection)
+
+    assert messages == [m for m in ALL_MESSAGES if m != (7, 'invalid-string-quote')]
+    # the string on the disabled line is not checked.
+    assert '"a"' not in classified
+
+
+def test_disabled_lines_with_useless_suppression(tmp_path, classified):
+    messages = _lint(tmp_path, SOURCE, '--enable=useless-suppression')
+
+    # the disabled line is still checked, so the pragma is known to be used.
+    assert messages == [m for m in ALL_MESSAGES if m != (7, 'invalid-string-quote')]
+    assert '"a"' in classified
+
+
+@pytest.mark.parametrize('detection', ['tokens', 'ast'])
+def test_disabled_by_pragma(tmp_path, classified, detection):
+    source = '# pylint: disable={}\n'.format(SYMBOLS) + SOURCE
+
+    assert _lint(tmp_path, source, '--docstring-detection=' + detection) == []
+    assert classified == []
+
+
+@pytest.mark.parametrize('detection', ['tokens', 'ast'])
+def test_disabled_by_config(tmp_path, classified, detection):
+    messages = _lint(tmp_path, SOURCE, '--disable=' + SYMBOLS, '--docstring-detection=' + detection)
+
+    assert messages == []
+    assert classified == []
+
+
+@pytest.mark.parametrize('detection', ['tokens', 'ast'])
+def test_some_disabled_by_config(tmp_path, detection):
+    messages = _lint(
+        tmp_path, SOURCE,
+        '--disable=invalid-string-quote,invalid-docstring-quote', '--docstring-detection=' + detection,
+    )
+
+    assert messages == [(8, 'invalid-triple-quote')]
+
+
+@pytest.mark.parametrize('detection', ['tokens', 'ast'])
+def test_enabled(tmp_path, detection):
+    source = SOURCE.replace('    # pylint: disable=invalid-string-quote\n', '    # no pragma\n')
+
+    assert _lint(tmp_path, source, '--docstring-detection=' + detection) == ALL_MESSAGES
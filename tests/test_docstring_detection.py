@@ -0,0 +1,132 @@
+"""Tests for detecting docstrings from the token stream, cross-checked
+against the AST-based detection.
+"""
+
+import glob
+import os
+import tokenize
+
+import astroid
+import pytest
+from pylint.testutils import UnittestLinter, _tokenize_str as tokenize_str
+
+from pylint_quotes import docstrings
+from pylint_quotes.checker import StringQuoteChecker
+
+from utils import read_source, walk
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+EXAMPLE_FILES = sorted(glob.glob(os.path.join(HERE, '..', 'example', 'foo', '*.py')))
+STDLIB_FILES = sorted(glob.glob(os.path.join(os.path.dirname(tokenize.__file__), '*.py')))[:20]
+
+SOURCES = [
+    '"""Module docstring."""\n',
+    "'''Module docstring.'''\nx = 1\n",
+    '#!/usr/bin/env python\n# comment\n\n"""Module docstring."""\n\nx = """not a docstring"""\n',
+    'x = 1\n"""Not a docstring."""\n',
+    '"""Not a docstring.""".strip()\n',
+    'def fn(x):\n    """Function docstring."""\n',
+    'def fn(x):\n    """Function docstring."""\n    return """not a docstring"""\n',
+    'def fn(\n    x,\n    y=(1, 2),\n) -> "int":\n\n    # comment\n    """Function docstring."""\n    return x\n',
+    'def fn(x): """One-line body docstring."""\n',
+    'def fn(x): return """not a docstring"""\n',
+    'async def fn(x):\n    """Async function docstring."""\n    await x\n',
+    '@decorator\ndef fn(x):\n    """Decorated function docstring."""\n',
+    'class Cls:\n    """Class docstring."""\n',
+    'class Cls(Base, metaclass=Meta):\n    """Class docstring."""\n\n    x = """not a docstring"""\n',
+    'class Cls:\n    x = 1\n    """Not a docstring."""\n',
+    ('class Outer:\n    """Outer docstring."""\n\n'
+     '    class Inner:\n        """Inner docstring."""\n\n'
+     '        def method(self):\n            """Method docstring."""\n'
+     '            def nested():\n                """Nested docstring."""\n'
+     '            return """not a docstring"""\n\n'
+     '    def other(self):\n        return 1\n'),
+    'def fn():\n    x = 1\n\ndef other():\n    """Other docstring."""\n',
+    'def fn():\n    b"""Not a docstring."""\n',
+    'def fn():\n    r"""Raw docstring."""\n',
+    'x = 1; """Not a docstring."""\n',
+    'def fn():\n    """Docstring."""; x = 1\n',
+    'def fn():\n    if x:\n        """Not a docstring."""\n',
+    'def fn():\n    """Docstring."""  # comment\n',
+]
+
+
+def _messages(source, detection, triple_quote, docstring_quote):
+    """Run the checker over a full module and get the messages it adds."""
+    linter = UnittestLinter()
+    checker = StringQuoteChecker(linter)
+    checker.config.docstring_detection = detection
+    checker.config.triple_quote = triple_quote
+    checker.config.docstring_quote = docstring_quote
+    checker.open()
+
+    checker.process_tokens(tokenize_str(source))
+    walk(checker, astroid.parse(source))
+
+    return sorted(
+        (m.line, m.msg_id, m.args) for m in linter.release_messages()
+    )
+
+
+@pytest.mark.parametrize('triple_quote,docstring_quote', [
+    ('single', 'double'),
+    ('double', 'single'),
+])
+@pytest.mark.parametrize('source', SOURCES)
+def test_tokens_match_ast(source, triple_quote, docstring_quote):
+    assert _messages(source, 'tokens', triple_quote, docstring_quote) == \
+        _messages(source, 'ast', triple_quote, docstring_quote)
+
+
+@pytest.mark.parametrize('path', EXAMPLE_FILES + STDLIB_FILES, ids=os.path.basename)
+def test_tokens_match_ast_files(path):
+    source = read_source(path)
+    assert _messages(source, 'tokens', 'single', 'double') == \
+        _messages(source, 'ast', 'single', 'double')
+
+
+def test_iter_strings_classification():
+    source = (
+        '"""Module docstring."""\n'
+        'x = "string"\n'
+        'def fn():\n'
+        '    """Function docstring."""\n'
+        '    return """not a docstring"""\n'
+    )
+
+    strings = list(docstrings.iter_strings(tokenize_str(source)))
+
+    assert strings == [
+        ('"""Module docstring."""', 1, 0, True),
+        ('"string"', 2, 4, False),
+        ('"""Function docstring."""', 4, 4, True),
+        ('"""not a docstring"""', 5, 11, False),
+    ]
+
+
+@pytest.mark.parametrize('token,expected', [
+    ('"""doc"""', True),
+    ('r"""doc"""', True),
+    ('U"""doc"""', True),
+    ('b"""doc"""', False),
+    ('Rb"""doc"""', False),
+    ('f"""doc"""', False),
+])
+def test_is_docstring_literal(token, expected):
+    assert docstrings.is_docstring_literal(token) is expected
+
+
+def test_tokens_single_quoted_docstring():
+    # the AST-based detection matches a node's docstring to the first triple
+    # quote in the node, so it takes the later triple quote for the docstring
+    # when the docstring itself is not triple quoted.
+    source = (
+        'def fn():\n'
+        '    "Function docstring."\n'
+        '    return """not a docstring"""\n'
+    )
+
+    assert _messages(source, 'tokens', 'single', 'double') == [
+        (2, 'invalid-string-quote', ('"', "'")),
+        (3, 'invalid-triple-quote', ('"""', "'''")),
+    ]
@@ -0,0 +1,113 @@
+"""Tests that the standalone engine agrees with the pylint checker.
+"""
+
+import glob
+import os
+import tokenize
+
+import pytest
+from pylint.testutils import UnittestLinter, _tokenize_str as tokenize_str
+
+from pylint_quotes import engine
+from pylint_quotes.checker import StringQuoteChecker
+
+from utils import read_source
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FILES = (
+    sorted(glob.glob(os.path.join(HERE, '..', 'example', 'foo', '*.py'))) +
+    sorted(glob.glob(os.path.join(os.path.dirname(tokenize.__file__), '*.py')))[:20]
+)
+
+CONFIGS = [
+    engine.QuoteConfig(),
+    engine.QuoteConfig('double', 'double', 'single'),
+    engine.QuoteConfig('single-avoid-escape', 'single', 'double'),
+    engine.QuoteConfig('double-avoid-escape', 'double', 'double'),
+]
+
+
+def _plugin_messages(source, config):
+    linter = UnittestLinter()
+    checker = StringQuoteChecker(linter)
+    for key, value in config._asdict().items():
+        setattr(checker.config, key, value)
+    checker.open()
+    checker.process_tokens(tokenize_str(source))
+    return [(m.msg_id, m.line, m.args) for m in linter.release_messages()]
+
+
+@pytest.mark.parametrize('config', CONFIGS, ids=lambda c: '-'.join(c))
+@pytest.mark.parametrize('path', FILES, ids=os.path.basename)
+def test_engine_matches_plugin(path, config):
+    violations = engine.check_file(path, config)
+
+    assert [(v.symbol, v.row, (v.quote, v.correct_quote)) for v in violations] == \
+        _plugin_messages(read_source(path), config)
+
+
+def test_violation_message():
+    violation = engine.check_string('"a"', 2, 4, False, engine.QuoteConfig())
+
+    assert violation == engine.Violation('invalid-string-quote', 2, 4, '"', "'")
+    assert violation.msg_id == 'C4001'
+    assert violation.msg == 'Invalid string quote ", should be \''
+
+
+@pytest.mark.parametrize('token,is_docstring,expected', [
+    ("'a'", False, None),
+    ('"a"', False, 'invalid-string-quote'),
+    ('"it\'s"', False, None),
+    ('"""a"""', False, 'invalid-triple-quote'),
+    ("'''a'''", False, None),
+    ('"""a"""', True, None),
+    ("r'''a'''", True, 'invalid-docstring-quote'),
+])
+def test_check_string(token, is_docstring, expected):
+    config = engine.QuoteConfig(string_quote='single-avoid-escape')
+    violation = engine.check_string(token, 1, 0, is_docstring, config)
+
+    assert (violation.symbol if violation else None) == expected
+
+
+def _string_tokens():
+    for path in FILES:
+        with open(path, 'rb') as f:
+            for tok in tokenize.tokenize(f.readline):
+                if tok.type == tokenize.STRING:
+                    yield tok.string
+
+
+@pytest.mark.parametrize('string_quote', engine.CONFIG_OPTS + engine.SMART_CONFIG_OPTS)
+def test_classifier_matches_generic(string_quote):
+    classifier = engine.QuoteClassifier.compile(engine.QuoteConfig(string_quote=string_quote))
+
+    extra = ['""', "''", 'b""', "rb''", '"\'"', "'\"'", '"a\\"b"', 'f"{x}"', '""""""', "Rb'''a'''"]
+    for token in list(_string_tokens()) + extra:
+        start, quote = engine.get_quote(token)
+
+        assert classifier.opening(token) == (start, quote)
+        if len(quote) == 1:
+            assert classifier.preferred(token, start) == engine.get_preferred_quote(token, start, string_quote)
+
+
+def test_classifier_compiled_once():
+    classifier = engine.QuoteClassifier.compile(engine.QuoteConfig('double-avoid-escape'))
+
+    assert engine.QuoteClassifier.compile(engine.QuoteConfig('double-avoid-escape')) is classifier
+    assert engine.QuoteClassifier.compile(engine.QuoteConfig()) is not classifier
+
+
+def test_check_file_mapped(tmp_path, monkeypatch):
+    path = tmp_path / 'mod.py'
+    path.write_bytes(b'# coding: latin-1\n' + b'x = "\xe9"\n' * 5000)
+    (tmp_path / 'empty.py').write_bytes(b'')
+    # unmap the pages read every few pages.
+    monkeypatch.setattr(engine._MappedLines, 'RELEASE_SIZE', 4 * 4096)
+
+    violations = engine.check_file(str(path), engine.QuoteConfig())
+
+    with open(str(path), 'rb') as f:
+        assert violations == engine.check_bytes(f.read(), engine.QuoteConfig())
+    assert len(violations) == 5000
+    assert engine.check_file(str(tmp_path / 'empty.py'), engine.QuoteConfig()) == []
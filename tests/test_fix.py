@@ -0,0 +1,136 @@
+"""Tests for rewriting the quotes of strings which violate the configuration.
+"""
+
+import ast
+import glob
+import os
+import stat
+import tokenize
+
+import pytest
+
+from pylint_quotes import cli, engine, fix
+
+STDLIB_FILES = sorted(glob.glob(os.path.join(os.path.dirname(tokenize.__file__), '*.py')))[:20]
+
+
+@pytest.mark.parametrize('token, quote, expected', [
+    ('"a"', '\'', '\'a\''),
+    ('"it\'s"', '\'', '\'it\\\'s\''),
+    ('\'say "hi"\'', '"', '"say \\"hi\\""'),
+    ('\'say \\"hi\\"\'', '"', '"say \\"hi\\""'),
+    ('"a\\"b"', '\'', '\'a"b\''),
+    ('rb"a\\d"', '\'', 'rb\'a\\d\''),
+    ('U"a"', '\'', 'U\'a\''),
+    ('f"{x!r}"', '\'', 'f\'{x!r}\''),
+    ('"a\\\nb"', '\'', '\'a\\\nb\''),
+    ('\'\'\'a "b" c\'\'\'', '"""', '"""a "b" c"""'),
+    ('\'\'\'a """ b\'\'\'', '"""', '"""a \\"\\"\\" b"""'),
+    ('\'\'\'ends with "\'\'\'', '"""', '"""ends with \\""""'),
+    ('\'\'\'it\\\'s\'\'\'', '"""', '"""it\\\'s"""'),
+    ('r\'\'\'a "b" c\'\'\'', '"""', 'r"""a "b" c"""'),
+    # the content cannot be re-escaped without changing the value.
+    ('r"it\'s"', '\'', None),
+    ('f"{x[\'a\']}"', '\'', None),
+    ('r\'\'\'ends with "\'\'\'', '"""', None),
+])
+def test_requote(token, quote, expected):
+    fixed = fix.requote(token, quote)
+
+    assert fixed == expected
+    if fixed is not None and not token.startswith('f'):
+        assert ast.literal_eval(fixed) == ast.literal_eval(token)
+
+
+@pytest.mark.parametrize('config', [
+    engine.QuoteConfig(),
+    engine.QuoteConfig('double', 'double', 'double'),
+    engine.QuoteConfig('single-avoid-escape', 'double', 'single'),
+], ids=lambda c: '-'.join(c))
+def test_fix_stdlib(config):
+    n_violations = n_fixed = 0
+    for path in STDLIB_FILES:
+        with open(path, 'rb') as f:
+            content = f.read()
+        violations = engine.check_bytes(content, config)
+
+        fixed_content, fixed, remaining = fix.fix_source(content, config)
+
+        assert ast.dump(ast.parse(fixed_content)) == ast.dump(ast.parse(content))
+        assert remaining == engine.check_bytes(fixed_content, config)
+        assert len(fixed) + len(remaining) == len(violations), path
+        # a fixed source has nothing more to fix.
+        assert fix.fix_source(fixed_content, config)[1] == []
+        n_violations += len(violations)
+        n_fixed += len(fixed)
+
+    # only the odd raw string or f-string is left.
+    assert n_fixed > n_violations * 0.98
+
+
+def test_fix_lines():
+    class Lines:
+        @staticmethod
+        def overlaps(first, last):
+            return first <= 2 <= last
+
+    content = b'x = "a"\ny = "b"\nz = """c\n"""\n'
+    config = engine.QuoteConfig(triple_quote='single')
+
+    fixed_content, fixed, remaining = fix.fix_source(content, config, lines=Lines())
+
+    assert fixed_content == b'x = "a"\ny = \'b\'\nz = """c\n"""\n'
+    assert [v.row for v in fixed] == [2]
+    assert remaining == []
+
+
+def test_fix_file(tmp_path):
+    path = tmp_path / 'mod.py'
+    path.write_bytes(b'# -*- coding: latin-1 -*-\r\nx = "\xe9" + r"it\'s"\r\n')
+    os.chmod(str(path), 0o750)
+
+    fixed, remaining = fix.fix_file(str(path), engine.QuoteConfig())
+
+    assert path.read_bytes() == b'# -*- coding: latin-1 -*-\r\nx = \'\xe9\' + r"it\'s"\r\n'
+    assert [v.col for v in fixed] == [4]
+    assert [v.col for v in remaining] == [10]
+    assert stat.S_IMODE(os.stat(str(path)).st_mode) == 0o750
+    # nothing but the file itself is left behind.
+    assert os.listdir(str(tmp_path)) == ['mod.py']
+
+
+def test_fix_file_through_symlink(tmp_path):
+    real = tmp_path / 'real' / 'mod.py'
+    real.parent.mkdir()
+    real.write_text('x = "a"\n')
+    link = tmp_path / 'links' / 'mod.py'
+    link.parent.mkdir()
+    link.symlink_to(real)
+
+    fix.fix_file(str(link), engine.QuoteConfig())
+
+    # the file the link points to is fixed, and the link is left as it was.
+    assert link.is_symlink()
+    assert real.read_text() == 'x = \'a\'\n'
+    assert sorted(os.listdir(str(link.parent))) == ['mod.py']
+    assert sorted(os.listdir(str(real.parent))) == ['mod.py']
+
+
+def test_cli_fix(tmp_path, capsys):
+    (tmp_path / 'a.py').write_text('x = "a"\ny = r"it\'s"\n')
+    (tmp_path / 'b.py').write_text('"""Doc."""\n')
+
+    status = cli.main(['check', '--fix', str(tmp_path)])
+    captured = capsys.readouterr()
+
+    assert status == 16
+    # only the string which cannot be rewritten is reported.
+    assert captured.out == '{}:2:4: C4001: Invalid string quote ", should be \' (invalid-string-quote)\n'.format(
+        tmp_path / 'a.py')
+    assert 'pylint-quotes: fixed 1 strings in 1 files\n' in captured.err
+    assert (tmp_path / 'a.py').read_text() == 'x = \'a\'\ny = r"it\'s"\n'
+
+
+def test_cli_fix_staged():
+    with pytest.raises(SystemExit):
+        cli.main(['check', '--fix', '--staged'])
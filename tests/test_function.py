@@ -4,7 +4,7 @@
 from pylint_quotes.checker import StringQuoteChecker
 from pylint.testutils import Message, set_config
 
-from utils import TRI_Q_DOUB, TRI_Q_SING, StringQuoteCheckerTestCase
+from utils import TRI_Q_DOUB, TRI_Q_SING, StringQuoteCheckerTestCase, ast_detection_only
 
 
 class TestFunctionStringQuoteChecker(StringQuoteCheckerTestCase):
@@ -96,6 +96,7 @@ def fn3(x):
         self.check_function(test_str)
 
     @set_config(docstring_quote='single')
+    @ast_detection_only
     def test_single_line_double_quote_docstring_with_cfg_single_multiple_def(self):
 
         test_str = '''
@@ -214,6 +215,7 @@ def fn3(x):
         self.check_function(test_str)
 
     @set_config(docstring_quote='single')
+    @ast_detection_only
     def test_multi_line_double_quote_docstring_with_cfg_single_multiple_def(self):
 
         test_str = '''
@@ -308,6 +310,7 @@ def fn(x):  #@
         self.check_function(test_str)
 
     @set_config(docstring_quote='single')
+    @ast_detection_only
     def test_single_line_double_quote_docstring_with_cfg_single_def_contents_03(self):
 
         test_str = '''
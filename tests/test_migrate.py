@@ -0,0 +1,132 @@
+"""Tests for the resumable migration of a tree to the configured quotes.
+"""
+
+import json
+import os
+
+import pytest
+
+from pylint_quotes import cli, engine, migrate
+
+CONFIG = engine.QuoteConfig()
+
+
+def _write_tree(root, n=6):
+    paths = []
+    for i in range(n):
+        path = root / 'mod{}.py'.format(i)
+        path.write_text('"""Doc."""\nx = "a{0}"\ny = r"it\'s"\nz = \'ok\'\n'.format(i))
+        paths.append(str(path))
+    return paths
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_migrate(tmp_path, jobs):
+    paths = _write_tree(tmp_path)
+    (tmp_path / 'clean.py').write_text('x = 1\n')
+    paths.append(str(tmp_path / 'clean.py'))
+    summary = migrate.MigrationSummary()
+
+    migrations = list(migrate.migrate(paths, CONFIG, jobs=jobs, summary=summary))
+
+    assert sorted(m.result.path for m in migrations) == sorted(paths)
+    for path in paths[:-1]:
+        with open(path) as f:
+            assert f.read() == '"""Doc."""\nx = \'a{}\'\ny = r"it\'s"\nz = \'ok\'\n'.format(path[-4])
+    assert (summary.files, summary.changed, summary.rewritten, summary.remaining) == (7, 6, 6, 6)
+    assert (summary.errors, summary.resumed) == (0, 0)
+    assert summary.elapsed > 0
+    assert summary.files_per_second == summary.files / summary.elapsed
+
+
+def test_migrate_error(tmp_path):
+    (tmp_path / 'bad.py').write_text('x = ("a"\n')
+    summary = migrate.MigrationSummary()
+
+    migration, = migrate.migrate([str(tmp_path / 'bad.py')], CONFIG, summary=summary)
+
+    assert migration.result.error[0] == 'E0001'
+    assert (migration.fixed, migration.size) == (0, None)
+    assert summary.errors == 1
+
+
+def test_journal_resume(tmp_path):
+    paths = _write_tree(tmp_path)
+    journal_path = str(tmp_path / 'journal')
+
+    # interrupt the run after two files.
+    with migrate.Journal(journal_path, CONFIG) as journal:
+        migrations = migrate.migrate(paths, CONFIG, journal=journal)
+        done = [next(migrations).result.path for _ in range(2)]
+        migrations.close()
+    # a file changed since it was done with is migrated again.
+    with open(done[1], 'a') as f:
+        f.write('w = "b"\n')
+    # as is a file which was fixed, but not recorded.
+    with open(paths[2], 'w') as f:
+        f.write('x = \'a\'\n')
+
+    summary = migrate.MigrationSummary()
+    with migrate.Journal(journal_path, CONFIG) as journal:
+        migrated = [m.result.path for m in migrate.migrate(paths, CONFIG, journal=journal, summary=summary)]
+
+    assert migrated == paths[1:]
+    assert (summary.resumed, summary.files, summary.rewritten) == (1, 5, 4)
+    # the resumed file still counts towards what is left to fix.
+    assert summary.remaining == 4 + 1
+
+
+def test_journal_incomplete_line(tmp_path):
+    paths = _write_tree(tmp_path, 2)
+    journal_path = tmp_path / 'journal'
+    with migrate.Journal(str(journal_path), CONFIG) as journal:
+        list(migrate.migrate(paths, CONFIG, journal=journal))
+    content = journal_path.read_text()
+    # an interruption in the middle of writing the last entry.
+    journal_path.write_text(content[:-10])
+
+    with migrate.Journal(str(journal_path), CONFIG) as journal:
+        assert journal.is_done(paths[0])
+        assert not journal.is_done(paths[1])
+        list(migrate.migrate(paths, CONFIG, journal=journal))
+
+    entries = [json.loads(line) for line in journal_path.read_text().split('\n')[1:] if line.endswith('}')]
+    assert [e['path'] for e in entries] == [os.path.abspath(p) for p in paths]
+
+
+def test_journal_other_config(tmp_path):
+    journal_path = str(tmp_path / 'journal')
+    migrate.Journal(journal_path, CONFIG).close()
+
+    with pytest.raises(ValueError):
+        migrate.Journal(journal_path, engine.QuoteConfig('double', 'double', 'double'))
+
+    (tmp_path / 'other').write_text('not a journal\n')
+    with pytest.raises(ValueError):
+        migrate.Journal(str(tmp_path / 'other'), CONFIG)
+
+
+def test_cli_migrate(tmp_path, capsys):
+    paths = _write_tree(tmp_path, 2)
+    journal_path = str(tmp_path / 'journal')
+
+    status = cli.main(['migrate', '--journal', journal_path, '-j', '1', str(tmp_path)])
+    captured = capsys.readouterr()
+
+    assert status == 16
+    # only the strings which cannot be rewritten are reported.
+    assert captured.out == ''.join(
+        '{}:3:4: C4001: Invalid string quote ", should be \' (invalid-string-quote)\n'.format(path)
+        for path in paths
+    )
+    assert ': 2 changed, 2 strings rewritten' in captured.err
+
+    status = cli.main(['migrate', '--journal', journal_path, str(tmp_path)])
+    captured = capsys.readouterr()
+
+    assert status == 16
+    assert captured.out == ''
+    assert '2 left to fix, 0 errors, 2 resumed from the journal' in captured.err
+
+    with pytest.raises(SystemExit):
+        cli.main(['migrate', '--journal', journal_path, '--string-quote', 'double', str(tmp_path)])
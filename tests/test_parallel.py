@@ -0,0 +1,93 @@
+"""Tests that parallel pylint runs report the same totals as serial ones.
+"""
+
+import os
+
+import pytest
+
+from utils import lint, quote_checker
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+EXAMPLE_DIR = os.path.join(HERE, '..', 'example', 'foo')
+
+
+def _write_corpus(root, n_files=12):
+    root.mkdir()
+    (root / '__init__.py').write_text('"""Package."""\n')
+    for i in range(n_files):
+        (root / 'mod{}.py'.format(i)).write_text(
+            '"""Module {0}."""\n\n\n'
+            'def fn{0}():\n'
+            '    \'\'\'Function.\'\'\'\n'
+            '    return "a{0}", \'b\', """c\n{0}"""\n\n\n'
+            'class C{0}:\n'
+            '    """Class."""\n'
+            '    x = ("it\'s", \'say "hi"\')\n'.format(i)
+        )
+    return str(root)
+
+
+def _lint(path, cache_dir, *args):
+    linter, output = lint(
+        [path], '--reports=y', '--quote-profile=y', '--quote-cache-dir=' + cache_dir,
+        '--msg-template={path}:{line}:{column}:{symbol}', *args)
+    messages = sorted(line for line in output.splitlines() if line.count(':') == 3)
+    return quote_checker(linter), messages
+
+
+@pytest.fixture(params=['example', 'corpus'])
+def package(request, tmp_path):
+    if request.param == 'example':
+        return EXAMPLE_DIR
+    return _write_corpus(tmp_path / 'corpus')
+
+
+def test_parallel_matches_serial(package, tmp_path):
+    serial, serial_messages = _lint(package, str(tmp_path / 'serial-cache'))
+    parallel, parallel_messages = _lint(package, str(tmp_path / 'parallel-cache'), '--jobs=4')
+
+    assert parallel_messages == serial_messages
+    assert parallel._profile.counts == serial._profile.counts
+    assert sorted(parallel._profile.module_times) == sorted(serial._profile.module_times)
+    assert (parallel._cache.hits, parallel._cache.misses) == (serial._cache.hits, serial._cache.misses)
+
+    # every file is found in the cache on the next run.
+    cached, cached_messages = _lint(package, str(tmp_path / 'parallel-cache'), '--jobs=4')
+    assert cached_messages == serial_messages
+    assert (cached._cache.hits, cached._cache.misses) == (serial._cache.misses, 0)
+
+
+def test_parallel_cache_eviction(tmp_path):
+    package = _write_corpus(tmp_path / 'corpus')
+    cache_dir = str(tmp_path / 'cache')
+
+    checker, _ = _lint(package, cache_dir, '--jobs=4', '--quote-cache-size=0')
+
+    # the cache is trimmed once the workers are done, not after each file.
+    assert checker._cache.misses == 13
+    assert not [name for _, _, names in os.walk(cache_dir) for name in names]
+
+
+def _usage(checker):
+    counts = checker._usage
+    return (
+        counts.files, counts.strings, counts.escapes, counts.triples, counts.docstrings,
+        counts.violations,
+    )
+
+
+def test_parallel_usage(package, tmp_path):
+    serial, _ = _lint(package, str(tmp_path / 'serial-cache'), '--quote-usage=y')
+    parallel, _ = _lint(package, str(tmp_path / 'parallel-cache'), '--quote-usage=y', '--jobs=2')
+
+    assert serial._usage.files > 0
+    assert _usage(parallel) == _usage(serial)
+
+
+def test_usage_report(tmp_path):
+    package = _write_corpus(tmp_path / 'corpus', n_files=2)
+    _, report = lint([package], '--reports=y', '--quote-usage=y')
+
+    assert 'Quote usage' in report
+    assert 'fewest violations: string-quote=single-avoid-escape, triple-quote=double, ' \
+        'docstring-quote=double' in report
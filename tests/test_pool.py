@@ -0,0 +1,117 @@
+"""Tests for per-module checker state and linting sources on a thread pool.
+"""
+
+import glob
+import os
+import sys
+import tokenize
+
+import astroid
+import pytest
+from pylint.testutils import UnittestLinter, _tokenize_str as tokenize_str
+
+from pylint_quotes import engine, pool
+from pylint_quotes.checker import StringQuoteChecker
+
+from utils import read_source
+
+HERE = os.path.dirname(__file__)
+EXAMPLE_FILES = sorted(glob.glob(os.path.join(HERE, '..', 'example', 'foo', '*.py')))
+STDLIB_FILES = sorted(glob.glob(os.path.join(os.path.dirname(tokenize.__file__), '*.py')))[:12]
+
+MODULE_A = '''\
+"""Module a."""
+
+def fn():
+    \'\'\'Function.\'\'\'
+    return """triple"""
+'''
+
+MODULE_B = """\
+'''Module b.'''
+
+class C:
+    \"\"\"Class.\"\"\"
+    x = '''triple'''
+"""
+
+
+def _sources():
+    sources = [read_source(p) for p in EXAMPLE_FILES + STDLIB_FILES]
+    return sources + [MODULE_A, MODULE_B] * 20
+
+
+@pytest.fixture
+def switch_often():
+    # switch threads as often as possible, to interleave the checks.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_instances_do_not_share_state():
+    def _checker():
+        checker = StringQuoteChecker(UnittestLinter())
+        checker.config.docstring_detection = 'ast'
+        checker.open()
+        return checker
+
+    def _walk(checker, source):
+        module = astroid.parse(source)
+        checker.visit_module(module)
+        for node in module.nodes_of_class((astroid.ClassDef, astroid.FunctionDef)):
+            if isinstance(node, astroid.ClassDef):
+                checker.visit_classdef(node)
+            else:
+                checker.visit_functiondef(node)
+        checker.leave_module(module)
+        return [(m.msg_id, m.line, m.args) for m in checker.linter.release_messages()]
+
+    # one module after the other on the same checker.
+    serial = _checker()
+    serial.process_tokens(tokenize_str(MODULE_A))
+    expected_a = _walk(serial, MODULE_A)
+    serial.process_tokens(tokenize_str(MODULE_B))
+    expected_b = _walk(serial, MODULE_B)
+
+    # both modules at once on two checkers.
+    a, b = _checker(), _checker()
+    a.process_tokens(tokenize_str(MODULE_A))
+    b.process_tokens(tokenize_str(MODULE_B))
+
+    assert _walk(a, MODULE_A) == expected_a
+    assert _walk(b, MODULE_B) == expected_b
+    assert expected_a == [
+        ('invalid-docstring-quote', 4, ("'''", '"""')),
+        ('invalid-triple-quote', 5, ('"""', "'''")),
+    ]
+
+
+def test_lint_tokens_matches_engine():
+    sources = _sources()
+    config = engine.QuoteConfig(string_quote='double-avoid-escape')
+
+    results = pool.lint_sources(sources, config, max_workers=1)
+
+    for source, violations in zip(sources, results):
+        expected = engine.check_bytes(source.encode('utf-8'), config)
+        assert violations == expected
+
+
+@pytest.mark.parametrize('detection', ['tokens', 'ast'])
+def test_threaded_matches_serial(detection, switch_often):
+    sources = _sources()
+    config = engine.QuoteConfig(triple_quote='double')
+
+    serial = pool.lint_sources(sources, config, detection, max_workers=1)
+    assert any(serial)
+
+    linter = pool.SourceLinter(config, detection, max_workers=8)
+    for _ in range(2):
+        assert list(linter.lint_many(sources)) == serial
+
+
+def test_lint_error():
+    with pytest.raises(tokenize.TokenError):
+        pool.lint_sources(['x = (\n'], max_workers=2)
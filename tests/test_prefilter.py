@@ -0,0 +1,146 @@
+"""Tests for proving files clean from their bytes.
+"""
+
+import glob
+import itertools
+import os
+import tokenize
+
+import pytest
+
+from pylint_quotes import cli, engine, prefilter, runner
+from pylint_quotes.cache import ResultCache
+
+HERE = os.path.dirname(__file__)
+EXAMPLE_FILES = sorted(glob.glob(os.path.join(HERE, '..', 'example', 'foo', '*.py')))
+STDLIB_FILES = sorted(glob.glob(os.path.join(os.path.dirname(tokenize.__file__), '*.py')))
+
+CONFIGS = [
+    engine.QuoteConfig(string_quote=string, triple_quote=triple, docstring_quote=docstring)
+    for string, triple, docstring in itertools.product(
+        engine.CONFIG_OPTS + engine.SMART_CONFIG_OPTS, engine.CONFIG_OPTS, engine.CONFIG_OPTS,
+    )
+]
+
+CLEAN = b'''\
+"""Module."""
+
+
+def fn():
+    """Function."""
+    # a comment, with """ in it.
+    return 'a', f'{1}', """triple""" """"""
+'''
+
+
+@pytest.mark.parametrize('config', CONFIGS)
+def test_sound(config):
+    for path in EXAMPLE_FILES + STDLIB_FILES:
+        with open(path, 'rb') as f:
+            content = f.read()
+        if prefilter.could_violate(content, config):
+            continue
+        try:
+            assert engine.check_bytes(content, config) == [], path
+        except (tokenize.TokenError, SyntaxError):
+            pass
+
+
+@pytest.mark.parametrize('source', [
+    b'x = "a"\n',
+    b'x = ""\n',
+    b'x = f"{y}"\n',
+    # after a closing triple quote.
+    b'x = """a""""b"\n',
+    b'x = """a"""""\n',
+    # after a closing triple quote ending in an escaped quote.
+    b'x = """a\\"""""b"\n',
+    b'x = """a\\""""""\n',
+    b"x = '''a'''\n",
+])
+def test_could_violate(source):
+    config = engine.QuoteConfig(string_quote='single', triple_quote='double', docstring_quote='double')
+
+    assert engine.check_bytes(source, config)
+    assert prefilter.could_violate(source, config)
+
+
+def test_proven_clean():
+    config = engine.QuoteConfig(string_quote='single', triple_quote='double', docstring_quote='double')
+
+    assert engine.check_bytes(CLEAN, config) == []
+    assert not prefilter.could_violate(CLEAN, config)
+
+    # docstrings and other triple quoted strings may use different quotes,
+    # which cannot be told apart from the bytes alone.
+    assert prefilter.could_violate(CLEAN, engine.QuoteConfig())
+
+
+def test_smart_quotes():
+    config = engine.QuoteConfig(string_quote='single-avoid-escape', triple_quote='double', docstring_quote='double')
+
+    assert not prefilter.could_violate(b"x = 'a'\n", config)
+    assert prefilter.could_violate(b"x = 'it\\'s'\n", config)
+    assert engine.check_bytes(b"x = 'it\\'s'\n", config)
+
+
+def test_coding_cookie():
+    config = engine.QuoteConfig(string_quote='single', triple_quote='double', docstring_quote='double')
+
+    assert not prefilter.could_violate(b'# -*- coding: latin-1 -*-\nx = 1\n', config)
+    assert not prefilter.could_violate(b'#!/usr/bin/env python\n# coding=utf-8\nx = 1\n', config)
+    # the quotes of other encodings are not necessarily their ASCII bytes.
+    assert prefilter.could_violate(b'# coding: utf-16\nx = 1\n', config)
+    assert prefilter.could_violate(b'# coding: shift_jis\nx = 1\n', config)
+    assert prefilter.could_violate(b'# coding: unknown\nx = 1\n', config)
+    # a cookie past the second line is not an encoding declaration.
+    assert not prefilter.could_violate(b'\n\n# coding: utf-16\nx = 1\n', config)
+
+
+def test_file_could_violate(tmp_path):
+    config = engine.QuoteConfig()
+    empty, clean, violating = tmp_path / 'empty.py', tmp_path / 'clean.py', tmp_path / 'violating.py'
+    empty.write_bytes(b'')
+    clean.write_bytes(b"x = 'a'\n")
+    violating.write_bytes(b'x = "a"\n')
+
+    assert not prefilter.file_could_violate(str(empty), config)
+    assert not prefilter.file_could_violate(str(clean), config)
+    assert prefilter.file_could_violate(str(violating), config)
+
+
+def test_runner_skips(tmp_path):
+    config = engine.QuoteConfig()
+    clean, violating = tmp_path / 'clean.py', tmp_path / 'violating.py'
+    clean.write_text("x = 'a'\n")
+    violating.write_text('x = "a"\n')
+    cache = ResultCache(str(tmp_path / '.cache'))
+
+    results = list(runner.run([str(clean), str(violating)], config, cache=cache))
+
+    assert [(r.skipped, len(r.violations)) for r in results] == [(True, 0), (False, 1)]
+    # the clean file is not looked up in the cache.
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    results = list(runner.run([str(clean)], config, prefilter_files=False))
+
+    assert [(r.skipped, r.violations) for r in results] == [(False, [])]
+
+
+def test_cli_stats(tmp_path, capsys):
+    (tmp_path / 'clean.py').write_text("x = 'a'\n")
+    (tmp_path / 'broken.py').write_text('x = (\n')
+    (tmp_path / 'violating.py').write_text('x = "a"\n')
+
+    status = cli.main(['check', '--stats', str(tmp_path)])
+    captured = capsys.readouterr()
+
+    assert status == 16
+    assert 'pylint-quotes: pre-filter: 2 of 3 files proven clean (67%)\n' in captured.err
+
+    # without the pre-filter, the file which does not tokenize is reported.
+    status = cli.main(['check', '--no-prefilter', '--stats', str(tmp_path)])
+    captured = capsys.readouterr()
+
+    assert status == runner.ERROR_STATUS | runner.CONVENTION_STATUS
+    assert 'pylint-quotes: pre-filter: 0 of 3 files proven clean (0%)\n' in captured.err
@@ -0,0 +1,66 @@
+"""Tests for the timings and counters of the checker.
+"""
+
+import pytest
+
+from pylint_quotes.profiling import QuoteProfile
+
+from utils import lint, quote_checker
+
+SOURCE = '''\
+"""Module."""
+
+
+def fn():
+    """Function."""
+    return "a", \'\'\'b\'\'\'
+
+
+class C:
+    \'\'\'Class.\'\'\'
+'''
+
+
+def _lint(tmp_path, *args, n_files=1):
+    paths = []
+    for i in range(n_files):
+        path = tmp_path / 'mod{}.py'.format(i)
+        path.write_text(SOURCE)
+        paths.append(str(path))
+    return lint(paths, *args)
+
+
+@pytest.mark.parametrize('detection', ['tokens', 'ast'])
+def test_profile(tmp_path, detection):
+    linter, output = _lint(tmp_path, '--quote-profile=y', '--reports=y', '--docstring-detection=' + detection)
+
+    profile = QuoteProfile.from_stats(linter.stats)
+    assert profile.counts == {'modules': 1, 'string_tokens': 5, 'triple_quotes': 4, 'messages': 2}
+    assert list(profile.module_times) == ['mod0']
+    assert all(t >= 0 for t in profile.times.values())
+    assert sum(profile.module_times.values()) == pytest.approx(sum(profile.times.values()))
+    assert 'Quote checker profile' in output
+    assert 'quote string tokens' in output
+    assert 'slowest modules' in output
+
+
+def test_profile_parallel(tmp_path):
+    linter, _ = _lint(tmp_path, '--quote-profile=y', '--jobs=2', n_files=3)
+
+    profile = QuoteProfile.from_stats(linter.stats)
+    # the profiles of the workers are summed.
+    assert profile.counts == {'modules': 3, 'string_tokens': 15, 'triple_quotes': 12, 'messages': 6}
+    assert sorted(profile.module_times) == ['mod0', 'mod1', 'mod2']
+    assert [name for name, _ in profile.slowest(2)] == sorted(
+        profile.module_times, key=profile.module_times.get, reverse=True)[:2]
+
+
+def test_profile_disabled(tmp_path):
+    linter, output = _lint(tmp_path, '--reports=y')
+
+    assert QuoteProfile.from_stats(linter.stats) is None
+    assert not any(key.startswith('quote_') for key in linter.stats)
+    assert 'Quote checker profile' not in output
+    # nothing is shadowed on the checker.
+    checker = quote_checker(linter)
+    assert not {'process_tokens', '_process_for_docstring', 'leave_module', 'add_message'} & set(vars(checker))
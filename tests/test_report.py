@@ -0,0 +1,122 @@
+"""Tests for the writers of the results of the standalone checks.
+"""
+
+import io
+import json
+import os
+
+import pytest
+
+from pylint_quotes import cli, engine, report, runner
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'example')
+
+ERROR = runner.CheckResult('bad.py', error=('E0001', 'syntax-error', 3, 2, 'invalid syntax'))
+
+
+def _results():
+    config = engine.QuoteConfig()
+    return [runner.check_path(os.path.join('foo', name), config) for name in ('__init__.py', 'other.py')] + [ERROR]
+
+
+def _write(writer_class, results, buffer_size=report.DEFAULT_BUFFER_SIZE):
+    out = io.StringIO()
+    with writer_class(out, buffer_size) as writer:
+        for result in results:
+            writer.write(result)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize('buffer_size', [1, report.DEFAULT_BUFFER_SIZE])
+def test_text(monkeypatch, buffer_size):
+    monkeypatch.chdir(EXAMPLE_DIR)
+
+    expected = [
+        'foo/__init__.py:3:12: C4001: Invalid string quote ", should be \' (invalid-string-quote)',
+        'foo/other.py:1:0: C4003: Invalid docstring quote \'\'\', should be """ (invalid-docstring-quote)',
+        'foo/other.py:10:15: C4002: Invalid triple quote """, should be \'\'\' (invalid-triple-quote)',
+    ]
+    assert _write(report.TextWriter, _results(), buffer_size).splitlines() == [
+        line.replace('/', os.sep, 1) for line in expected
+    ] + ['bad.py:3:2: E0001: invalid syntax (syntax-error)']
+
+
+def test_json_lines(monkeypatch):
+    monkeypatch.chdir(EXAMPLE_DIR)
+    results = _results()
+
+    lines = _write(report.JsonLinesWriter, results, buffer_size=1).splitlines()
+    # each line is the same as the record encoded by json.dumps.
+    assert lines[0] == json.dumps({
+        'path': os.path.join('foo', '__init__.py'), 'msg_id': 'C4001', 'symbol': 'invalid-string-quote',
+        'line': 3, 'column': 12, 'quote': '"', 'correct_quote': '\'',
+    })
+    records = [json.loads(line) for line in lines]
+    assert [(r['path'], r['msg_id'], r['line'], r['column'], r['quote'], r['correct_quote']) for r in records] == [
+        (result.path, v.msg_id, v.row, v.col, v.quote, v.correct_quote)
+        for result in results[:2] for v in result.violations
+    ] + [('bad.py', 'E0001', 3, 2, None, None)]
+    assert records[-1]['message'] == 'invalid syntax'
+
+
+@pytest.mark.parametrize('buffer_size', [1, report.DEFAULT_BUFFER_SIZE])
+def test_sarif(monkeypatch, buffer_size):
+    monkeypatch.chdir(EXAMPLE_DIR)
+    results = _results() + [runner.CheckResult(os.path.abspath('clean.py'), [])]
+
+    log = json.loads(_write(report.SarifWriter, results, buffer_size))
+    assert log['version'] == '2.1.0'
+    run, = log['runs']
+    rules = run['tool']['driver']['rules']
+    assert [rule['id'] for rule in rules] == ['C4001', 'C4002', 'C4003']
+    assert [
+        (
+            rules[r['ruleIndex']]['id'] if 'ruleIndex' in r else r['ruleId'], r['level'],
+            r['locations'][0]['physicalLocation']['artifactLocation']['uri'],
+            r['locations'][0]['physicalLocation']['region']['startLine'],
+            r['locations'][0]['physicalLocation']['region']['startColumn'],
+        )
+        for r in run['results']
+    ] == [
+        ('C4001', 'note', 'foo/__init__.py', 3, 13),
+        ('C4003', 'note', 'foo/other.py', 1, 1),
+        ('C4002', 'note', 'foo/other.py', 10, 16),
+        ('E0001', 'error', 'bad.py', 3, 3),
+    ]
+    assert run['results'][0]['message']['text'] == 'Invalid string quote ", should be \''
+    assert run['results'][0]['properties'] == {'quote': '"', 'correctQuote': '\''}
+
+
+def test_sarif_without_results():
+    log = json.loads(_write(report.SarifWriter, [runner.CheckResult('mod.py', [])]))
+
+    assert log['runs'][0]['results'] == []
+
+
+def test_artifact_uri(tmp_path):
+    path = tmp_path / 'a b.py'
+
+    assert report.artifact_uri(os.path.join('pkg', 'a b.py')) == 'pkg/a%20b.py'
+    assert report.artifact_uri(str(path)) == path.as_uri()
+
+
+@pytest.mark.parametrize('output_format', ['jsonl', 'sarif'])
+def test_cli_output(tmp_path, capsys, monkeypatch, output_format):
+    monkeypatch.chdir(EXAMPLE_DIR)
+    output = tmp_path / 'out'
+
+    serial = cli.main(['check', '--output-format', output_format, 'foo'])
+    serial_output = capsys.readouterr().out
+    status = cli.main(['check', '--output-format', output_format, '-j', '2', '--output', str(output), 'foo'])
+
+    assert serial == status == runner.CONVENTION_STATUS
+    assert capsys.readouterr().out == ''
+    # with jobs, the files are written in the order they finish.
+    if output_format == 'jsonl':
+        assert sorted(output.read_text().splitlines()) == sorted(serial_output.splitlines())
+        assert len(serial_output.splitlines()) == 6
+    else:
+        def results(text):
+            return sorted(json.dumps(r, sort_keys=True) for r in json.loads(text)['runs'][0]['results'])
+        assert results(output.read_text()) == results(serial_output)
+        assert len(results(serial_output)) == 6
@@ -0,0 +1,92 @@
+"""Tests for the standalone runner.
+"""
+
+import os
+
+from pylint_quotes import engine, runner
+
+
+def _write(tmp_path, files):
+    paths = []
+    for name, content in files:
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(content)
+        paths.append(str(path))
+    return paths
+
+
+def test_iter_python_files(tmp_path):
+    _write(tmp_path, [
+        (name, '') for name in
+        ('b.py', 'a.py', 'notes.txt', 'pkg/c.py', '.hidden/d.py', '__pycache__/e.py')
+    ])
+
+    files = list(runner.iter_python_files([str(tmp_path)]))
+
+    assert files == [
+        str(tmp_path / 'a.py'),
+        str(tmp_path / 'b.py'),
+        str(tmp_path / 'pkg' / 'c.py'),
+    ]
+
+
+def test_schedule_by_size(tmp_path):
+    small, large, medium = _write(tmp_path, [
+        ('small.py', 'x = 1\n'),
+        ('large.py', 'x = 1\n' * 100),
+        ('medium.py', 'x = 1\n' * 10),
+    ])
+
+    assert runner.schedule([small, large, medium]) == [large, medium, small]
+
+
+def test_schedule_by_duration(tmp_path):
+    small, large, medium = _write(tmp_path, [
+        ('small.py', 'x = 1\n'),
+        ('large.py', 'x = 1\n' * 100),
+        ('medium.py', 'x = 1\n' * 10),
+    ])
+
+    # the small file was slow last time, so it goes first; the medium file
+    # has no recorded duration, so its size is scaled by the large file's
+    # time per byte.
+    durations = {small: 2.0, large: 1.0}
+
+    assert runner.schedule([small, large, medium], durations) == [small, large, medium]
+
+
+def test_parallel_matches_serial(tmp_path):
+    paths = _write(tmp_path, [
+        ('mod{}.py'.format(i), '"""Doc."""\nx = "a"\n' * (i % 7 + 1))
+        for i in range(20)
+    ])
+    paths.append(str(tmp_path / 'missing.py'))
+    config = engine.QuoteConfig()
+
+    def _summary(results):
+        return [(r.path, list(r.violations), r.error) for r in results]
+
+    durations = {}
+    parallel = _summary(runner.run(paths, config, jobs=3, durations=durations))
+
+    assert parallel == _summary(runner.run(paths, config))
+    assert [p for p, _, _ in parallel] == paths
+    assert set(durations) == set(paths)
+
+    # unordered, each file is yielded once, as soon as it is done.
+    durations = {}
+    unordered = _summary(runner.run(paths, config, jobs=3, durations=durations, ordered=False))
+    assert sorted(unordered) == sorted(parallel)
+    assert set(durations) == set(paths)
+
+
+def test_durations_roundtrip(tmp_path):
+    path = str(tmp_path / 'durations.json')
+
+    assert runner.load_durations(path) == {}
+
+    runner.save_durations(path, {'a.py': 0.5})
+
+    assert runner.load_durations(path) == {'a.py': 0.5}
+    assert os.listdir(str(tmp_path)) == ['durations.json']
@@ -0,0 +1,112 @@
+"""Tests that the regex scanner finds the same strings as tokenizing.
+"""
+
+import glob
+import io
+import os
+import tokenize
+
+import pytest
+
+from pylint_quotes import docstrings, engine, scanner
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STDLIB_FILES = sorted(glob.glob(os.path.join(os.path.dirname(tokenize.__file__), '*.py')))
+FILES = sorted(glob.glob(os.path.join(HERE, '..', 'example', 'foo', '*.py'))) + STDLIB_FILES
+
+
+def _tokenized(content):
+    return list(docstrings.iter_strings(tokenize.tokenize(io.BytesIO(content).readline)))
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_stdlib_matches_tokenize():
+    scanned = 0
+    for path in FILES:
+        content = _read(path)
+        try:
+            strings = list(scanner.iter_strings(content))
+        except scanner.ScanError:
+            continue
+        assert strings == _tokenized(content), path
+        scanned += 1
+
+    # only the odd file falls back to tokenizing.
+    assert scanned > len(FILES) * 0.95
+
+
+def test_check_matches_tokenize():
+    config = engine.QuoteConfig('double-avoid-escape', 'double', 'single')
+    for path in FILES:
+        content = _read(path)
+        assert engine.check_bytes(content, config) == engine.check_bytes(content, config, scanner='tokenize'), path
+
+
+@pytest.mark.parametrize('source', [
+    # prefixes, and names which are not prefixes.
+    'x = rb"a" + Rb\'b\' + f"{y}" + u"c" + ur"d" + bf"e" + print"f"\n',
+    'x = é"a" + éb"b" + aé"c"\n',
+    # docstrings, and what stops a string from being one.
+    '"""Module."""\ndef f(): "doc"\nclass C:\n    """Class.""" ; x = 1\n',
+    'def f(a: "x" = (lambda: "y")) -> "z":\n    (\n        "not doc"\n    )\n',
+    'async def f():\n    """Doc."""\n    async with x:\n        "no"\n',
+    'def f():\n    b"no"\n\ndef g():\n    f"no"\n\ndef h():\n    "a" \\\n    "b"\n',
+    'class C:\n"doc?"\n',
+    'if x:\n    class C:\n"no"\n',
+    '"a" "b" # comment\n("c")\n',
+    # line ends, indentation and continuations.
+    'x = 1\r\ndef f():\r\n\t"""Doc."""\r\n\tif x:\r\n\t        return """a\r\nb"""\r\n',
+    'x = (1,\n\n  # comment\n      "a")\ndef f(): \\\n    "doc"\n',
+    "x = '''a\\'''b''' + 'c\\\nd'\n",
+    'x = "a"',
+    '',
+])
+def test_edge_cases(source):
+    content = source.encode('utf-8')
+
+    assert list(scanner.iter_strings(content)) == _tokenized(content)
+
+
+@pytest.mark.parametrize('content', [
+    b'\xef\xbb\xbf"""Doc."""\nx = "\xc3\xa9"\n',
+    b'# -*- coding: latin-1 -*-\nx = "\xe9" + \'\xe9\'\n',
+])
+def test_encodings(content):
+    assert list(scanner.iter_strings(content)) == _tokenized(content)
+
+
+@pytest.mark.parametrize('content', [
+    # unterminated strings.
+    b'x = "a\n',
+    b'x = """a\n',
+    b'x = """a"\n',
+    b'x = ab"\n',
+    # a stray backslash or carriage return.
+    b'x = 1 \\ 2\n',
+    b'x = 1\ry = 2\n',
+    # unbalanced brackets.
+    b'x = (1\n',
+    b'x = 1)\n',
+    b'x = 1 + \\\n',
+    # inconsistent indentation.
+    b'if x:\n        y = 1\n    z = 2\n',
+    # an encoding which is not a superset of ASCII, or bytes which do not decode.
+    b'# coding: utf-16\nx = 1\n',
+    b'x = 1\ny = 2\nz = "\xff"\n',
+])
+def test_fall_back(content):
+    with pytest.raises(scanner.ScanError):
+        list(scanner.iter_strings(content))
+
+    # the source is tokenized instead, with any error that raises.
+    try:
+        expected = engine.check_bytes(content, engine.QuoteConfig(), scanner='tokenize')
+    except (SyntaxError, UnicodeDecodeError, tokenize.TokenError) as e:
+        with pytest.raises(type(e)):
+            engine.check_bytes(content, engine.QuoteConfig())
+    else:
+        assert engine.check_bytes(content, engine.QuoteConfig()) == expected
@@ -0,0 +1,167 @@
+"""Tests for checking the staged content of files from the git index.
+"""
+
+import os
+import subprocess
+
+import pytest
+
+from pylint_quotes import cli, engine, staged
+from pylint_quotes.cache import ResultCache
+
+
+def _git(repo, *args):
+    return subprocess.run(
+        ('git', '-c', 'user.name=test', '-c', 'user.email=test@example.com') + args,
+        cwd=str(repo), check=True, stdout=subprocess.PIPE, universal_newlines=True,
+    ).stdout
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    _git(tmp_path, 'init', '-q')
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / 'mod.py').write_text("x = 'a'\n")
+    (tmp_path / 'other.py').write_text("x = 'a'\n")
+    _git(tmp_path, 'add', '.')
+    _git(tmp_path, 'commit', '-q', '-m', 'initial')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_blob_reader(repo):
+    sha = _git(repo, 'rev-parse', 'HEAD:other.py').strip()
+
+    with staged.BlobReader(cwd=str(repo)) as reader:
+        assert reader.read(sha) == b"x = 'a'\n"
+        # the same process serves any number of reads.
+        assert reader.read(sha) == b"x = 'a'\n"
+        with pytest.raises(staged.BlobNotFoundError):
+            reader.read('0' * 40)
+        assert reader.read(sha) == b"x = 'a'\n"
+
+
+def test_staged_blobs(repo):
+    (repo / 'pkg' / 'mod.py').write_text('x = "a"\n')
+    (repo / 'new.py').write_text('y = 1\n')
+    (repo / 'notes.txt').write_text('notes\n')
+    _git(repo, 'add', '.')
+    _git(repo, 'rm', '-q', 'other.py')
+    os.symlink('new.py', str(repo / 'link.py'))
+    _git(repo, 'add', 'link.py')
+
+    blobs = staged.staged_blobs(cwd=str(repo))
+
+    assert [path for path, _ in blobs] == ['new.py', 'pkg/mod.py']
+    assert blobs[1][1] == _git(repo, 'rev-parse', ':pkg/mod.py').strip()
+
+
+def test_partially_staged(repo, capsys):
+    # only the first change is staged; the working tree has a second one.
+    (repo / 'pkg' / 'mod.py').write_text('x = "a"\n')
+    _git(repo, 'add', 'pkg/mod.py')
+    (repo / 'pkg' / 'mod.py').write_text('x = "a"\ny = "b"\n')
+    # a syntax error which is not staged is not reported.
+    (repo / 'other.py').write_text('x = (\n')
+
+    status = cli.main(['check', '--staged'])
+    lines = capsys.readouterr().out.splitlines()
+
+    assert status == 16
+    assert lines == [
+        os.path.join('pkg', 'mod.py') + ':1:4: C4001: Invalid string quote ", should be \' (invalid-string-quote)',
+    ]
+
+
+def test_staged_paths(repo, capsys, monkeypatch):
+    (repo / 'pkg' / 'mod.py').write_text('x = "a"\n')
+    (repo / 'other.py').write_text('x = "a"\n')
+    _git(repo, 'add', '.')
+    monkeypatch.chdir(repo / 'pkg')
+
+    status = cli.main(['check', '--staged'])
+    lines = capsys.readouterr().out.splitlines()
+
+    assert status == 16
+    assert [line.split(':')[0] for line in lines] == [os.path.join('..', 'other.py'), 'mod.py']
+
+    status = cli.main(['check', '--staged', '.'])
+    lines = capsys.readouterr().out.splitlines()
+
+    assert [line.split(':')[0] for line in lines] == ['mod.py']
+
+
+def test_staged_syntax_error(repo):
+    (repo / 'other.py').write_text('x = (\n')
+    _git(repo, 'add', 'other.py')
+
+    result, = staged.check_staged(engine.QuoteConfig(), root=str(repo), prefilter_files=False)
+
+    assert result.error[:2] == ('E0001', 'syntax-error')
+
+    # without any quotes, the blob is proven clean without tokenizing it.
+    result, = staged.check_staged(engine.QuoteConfig(), root=str(repo))
+
+    assert (result.error, result.skipped) == (None, True)
+
+
+def test_staged_missing_blob(repo, monkeypatch, capsys):
+    missing = '0' * 40
+    sha = _git(repo, 'rev-parse', ':other.py').strip()
+    monkeypatch.setattr(
+        staged, 'staged_blobs', lambda cwd=None: [('other.py', missing), ('pkg/mod.py', sha)])
+
+    missing_result, result = staged.check_staged(engine.QuoteConfig(), root=str(repo))
+
+    assert missing_result.error == (
+        'F0001', 'fatal', 1, 0, 'no blob {} in the repository'.format(missing))
+    assert (result.path, result.error) == (os.path.join('pkg', 'mod.py'), None)
+
+    # the CLI reports the file rather than failing.
+    assert cli.main(['check', '--staged']) != 0
+    assert 'other.py:1:0: F0001' in capsys.readouterr().out
+
+
+def test_staged_cache(repo):
+    (repo / 'pkg' / 'mod.py').write_text('x = "a"\n')
+    (repo / 'other.py').write_text('x = "a"\n')
+    _git(repo, 'add', '.')
+    config = engine.QuoteConfig()
+
+    cache = ResultCache(str(repo / '.cache'))
+    first = [r.violations for r in staged.check_staged(config, cache=cache, root=str(repo))]
+
+    # both files stage the same blob, so only the first is a miss.
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache = ResultCache(str(repo / '.cache'))
+    second = [r.violations for r in staged.check_staged(config, cache=cache, root=str(repo))]
+
+    assert (cache.hits, cache.misses) == (2, 0)
+    assert first == second
+    assert [len(v) for v in first] == [1, 1]
+
+
+def test_staged_outside_repository(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    with pytest.raises(SystemExit):
+        cli.main(['check', '--staged'])
+
+
+def test_staged_baseline(repo, capsys):
+    (repo / 'pkg' / 'mod.py').write_text('x = "a"\n')
+    _git(repo, 'add', '.')
+    assert cli.main(['check', '--baseline', 'baseline.json', '--update-baseline', 'pkg']) == 0
+
+    # the staged content is fingerprinted, not the working tree.
+    (repo / 'pkg' / 'mod.py').write_text('x = "a"\ny = "b"\n')
+    _git(repo, 'add', '.')
+    (repo / 'pkg' / 'mod.py').write_text('x = 1\n')
+    status = cli.main(['check', '--staged', '--baseline', 'baseline.json'])
+    lines = capsys.readouterr().out.splitlines()
+
+    assert status == 16
+    assert lines == [
+        os.path.join('pkg', 'mod.py') + ':2:4: C4001: Invalid string quote ", should be \' (invalid-string-quote)',
+    ]
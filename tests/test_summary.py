@@ -0,0 +1,116 @@
+"""Tests for summarizing the quote violations of each module in one message.
+"""
+
+import json
+import os
+
+import astroid
+import pytest
+from pylint.testutils import UnittestLinter, _tokenize_str as tokenize_str
+
+from pylint_quotes import engine
+from pylint_quotes.checker import StringQuoteChecker
+
+from utils import lint, walk
+
+SOURCE = '''\
+\'\'\'Module.\'\'\'
+
+
+def fn():
+    \'\'\'Function.\'\'\'
+    return "a", "b", """c"""
+
+
+x = "d"
+'''
+
+SUMMARY = (
+    '2 invalid-docstring-quote (first at line 1, column 0), 3 invalid-string-quote (first at line 6, column 11), '
+    '1 invalid-triple-quote (first at line 6, column 21)'
+)
+
+SUMMARY_OPTS = ['--enable=quote-violations-summary', '--quote-summary=y']
+
+
+@pytest.mark.parametrize('detection', ['tokens', 'ast'])
+def test_summary(tmp_path, detection):
+    path = tmp_path / 'mod.py'
+    path.write_text(SOURCE)
+    summary_file = tmp_path / 'violations.jsonl'
+
+    linter = UnittestLinter()
+    linter.current_file = str(path)
+    linter.current_name = 'mod'
+    checker = StringQuoteChecker(linter)
+    checker.config.docstring_detection = detection
+    checker.config.quote_summary = True
+    checker.config.quote_summary_file = str(summary_file)
+    checker.open()
+    checker.process_tokens(tokenize_str(SOURCE))
+    walk(checker, astroid.parse(SOURCE))
+    checker.close()
+
+    assert [(m.msg_id, m.line, m.args) for m in linter.release_messages()] == [
+        ('quote-violations-summary', 1, (SUMMARY,)),
+    ]
+    records = [json.loads(line) for line in summary_file.read_text().splitlines()]
+    assert records[0] == {
+        'path': str(path), 'module': 'mod', 'msg_id': 'C4003', 'symbol': 'invalid-docstring-quote',
+        'line': 1, 'column': 0, 'quote': '\'\'\'', 'correct_quote': '"""',
+    }
+    assert [(r['line'], r['column'], r['msg_id']) for r in records] == [
+        (v.row, v.col, v.msg_id) for v in engine.check_bytes(SOURCE.encode(), engine.QuoteConfig())
+    ]
+
+
+def test_summary_of_clean_module():
+    linter = UnittestLinter()
+    checker = StringQuoteChecker(linter)
+    checker.config.quote_summary = True
+    checker.open()
+    checker.process_tokens(tokenize_str('x = \'a\'\n'))
+    checker.leave_module(None)
+
+    assert linter.release_messages() == []
+
+
+def _lint(path, summary_file, *args):
+    _, output = lint(
+        [path], *SUMMARY_OPTS, '--quote-summary-file=' + summary_file,
+        '--msg-template={path}:{line}:{symbol}:{msg}', *args)
+    with open(summary_file) as f:
+        records = sorted(f)
+    return sorted(line for line in output.splitlines() if ':' in line), records
+
+
+def test_parallel_summary_file(tmp_path):
+    package = tmp_path / 'pkg'
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+    for i in range(6):
+        (package / 'mod{}.py'.format(i)).write_text(SOURCE)
+
+    serial = _lint(str(package), str(tmp_path / 'serial.jsonl'))
+    parallel = _lint(str(package), str(tmp_path / 'parallel.jsonl'), '--jobs=3')
+
+    assert len(serial[0]) == 6
+    assert len(serial[1]) == 36
+    assert parallel == serial
+    # the parts written by the workers are removed once joined.
+    assert sorted(os.listdir(str(tmp_path))) == ['parallel.jsonl', 'pkg', 'serial.jsonl']
+
+
+@pytest.mark.parametrize('options', [[], ['--enable=useless-suppression'], ['--quote-cache-dir={cache_dir}']])
+def test_summary_pragma(tmp_path, options):
+    path = tmp_path / 'mod.py'
+    path.write_text('"""Module."""\nA = "a"\nB = "b"  # pylint: disable=invalid-string-quote\nC = "c"\n')
+    _, output = lint(
+        [str(path)], *SUMMARY_OPTS, '--score=n', '--msg-template={line}:{symbol}:{msg}',
+        *[option.format(cache_dir=tmp_path / 'cache') for option in options])
+
+    # the disabled violation is neither counted nor reported as a useless
+    # suppression.
+    assert [line for line in output.splitlines() if ':' in line] == [
+        '2:quote-violations-summary:Quote violations: 2 invalid-string-quote (first at line 2, column 4)',
+    ]
@@ -0,0 +1,102 @@
+"""Tests for the row-ordered index of tokenized triple quotes, and the
+records it holds.
+"""
+
+import io
+import tokenize
+import tracemalloc
+
+from pylint.testutils import UnittestLinter
+
+from pylint_quotes.checker import StringQuoteChecker
+from pylint_quotes.triple_quotes import TripleQuoteIndex, TripleQuoteRecord
+
+
+def _index(*rows):
+    index = TripleQuoteIndex()
+    for row in rows:
+        index.add(row, TripleQuoteRecord('"""', row, 0))
+    return index
+
+
+def test_first_row_in_range():
+    index = _index(2, 5, 9)
+
+    assert index.first_row(0) == 2
+    assert index.first_row(3) == 5
+    assert index.first_row(5, 5) == 5
+    assert index.first_row(6, 8) is None
+    assert index.first_row(10) is None
+
+
+def test_first_row_skips_consumed():
+    index = _index(2, 5, 9)
+
+    index.pop(5)
+
+    assert 5 not in index
+    assert index.first_row(3) == 9
+    assert index.first_row(3, 8) is None
+
+
+def test_values_in_row_order():
+    index = _index(9, 2, 5)
+
+    assert [r.row for r in index.values()] == [2, 5, 9]
+    assert len(index) == 3
+
+
+def test_readd_consumed_row():
+    index = _index(2, 5)
+
+    index.pop(2)
+    index.add(2, TripleQuoteRecord("'''", 2, 4))
+
+    assert [r.row for r in index.values()] == [2, 5]
+    assert index.get(2) == TripleQuoteRecord("'''", 2, 4)
+
+
+def _tracked_memory(literal_size, n_strings=50):
+    """Measure the memory used to track the triple quotes of a module.
+
+    Returns:
+        tuple: the memory still allocated once the tokens are gone, and the
+        peak memory allocated by the checker while processing the tokens.
+    """
+    source = ''.join(
+        'x{} = """{}"""\n'.format(i, 'x' * literal_size) for i in range(n_strings)
+    )
+    checker = StringQuoteChecker(UnittestLinter())
+    checker.config.docstring_detection = 'ast'
+    checker.open()
+
+    tracemalloc.start()
+    try:
+        checker.process_tokens(tokenize.generate_tokens(io.StringIO(source).readline))
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    tokens = list(tokenize.generate_tokens(io.StringIO(source).readline))
+    checker.open()
+    # tracing again from scratch, rather than with tracemalloc.reset_peak,
+    # which is only there from python 3.9.
+    tracemalloc.start()
+    try:
+        checker.process_tokens(tokens)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert len(checker._module.triple_quotes) == n_strings
+    return retained, peak
+
+
+def test_memory_independent_of_literal_size():
+    small_retained, small_peak = _tracked_memory(10)
+    large_retained, large_peak = _tracked_memory(100000)
+
+    # 50 strings of 100kB each: keeping any of their text alive, or copying
+    # it, would take megabytes.
+    assert large_retained < small_retained + 64 * 1024
+    assert large_peak < small_peak + 64 * 1024
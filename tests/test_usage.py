@@ -0,0 +1,139 @@
+"""Tests for the survey of the quotes a codebase already uses.
+"""
+
+import collections
+import glob
+import itertools
+import os
+import tokenize
+
+import pytest
+
+from pylint_quotes import cli, engine, usage
+
+STDLIB_FILES = sorted(glob.glob(os.path.join(os.path.dirname(tokenize.__file__), '*.py')))[:30]
+
+
+def test_count_strings():
+    content = (
+        b'"""Module."""\n'
+        b'x = "a" + \'b\' + "it\'s" + \'say "hi"\' + "both \' \\""\n'
+        b'def f():\n'
+        b'    \'\'\'Doc.\'\'\'\n'
+        b'    return """c""", \'\'\'d\'\'\'\n'
+    )
+
+    counts = usage.count_strings(engine.find_strings(content))
+
+    assert counts.files == 1
+    assert counts.strings == {'\'': 2, '"': 3}
+    assert counts.escapes == 2
+    assert counts.triples == {'\'\'\'': 1, '"""': 1}
+    assert counts.docstrings == {'\'\'\'': 1, '"""': 1}
+    assert counts.violations == {
+        'string-quote': {'single': 3, 'double': 2, 'single-avoid-escape': 2, 'double-avoid-escape': 1},
+        'triple-quote': {'single': 1, 'double': 1},
+        'docstring-quote': {'single': 1, 'double': 1},
+    }
+
+
+def test_violations_match_checks():
+    configs = [engine.QuoteConfig(*values) for values in itertools.product(*(v for _, v in usage.OPTIONS))]
+    for path in STDLIB_FILES:
+        counts = usage.count_file(path)
+        for config in configs:
+            symbols = collections.Counter(v.symbol for v in engine.check_file(path, config))
+            assert [
+                counts.violations[option][value] for (option, _), value in zip(usage.OPTIONS, config)
+            ] == [
+                symbols['invalid-string-quote'], symbols['invalid-triple-quote'], symbols['invalid-docstring-quote']
+            ], (path, config)
+
+
+def test_recommend():
+    counts = usage.QuoteUsage()
+    counts.violations['string-quote'].update({
+        'single': 3, 'double': 5, 'single-avoid-escape': 2, 'double-avoid-escape': 4,
+    })
+
+    # on a tie, the default wins.
+    assert counts.recommend() == engine.QuoteConfig('single-avoid-escape', 'single', 'double')
+
+
+def _write_tree(root, n_files, double_every=None):
+    for i in range(n_files):
+        package = root / 'pkg{}'.format(i % 3)
+        package.mkdir(exist_ok=True)
+        quote = '"' if double_every and i % double_every == 0 else '\''
+        (package / 'mod{}.py'.format(i)).write_text(
+            '"""Module."""\nx = [{0}a{0}, {0}b{0}, {0}c{0}]\n'.format(quote) * (1 + i % 5)
+        )
+    return str(root)
+
+
+def test_survey_sample(tmp_path):
+    paths = list(cli.runner.iter_python_files([_write_tree(tmp_path, 40)]))
+    (tmp_path / 'bad.py').write_bytes(b'x = "\xff"\n')
+    paths.append(str(tmp_path / 'bad.py'))
+
+    full = usage.survey(paths)
+    sampled = usage.survey(paths, sample=10, seed=1)
+
+    assert len(full.modules) == 40
+    assert [r.path for r in full.errors] == [str(tmp_path / 'bad.py')]
+    assert full.total.files == 40
+    assert sorted(full.packages()) == [str(tmp_path / 'pkg{}'.format(i)) for i in range(3)]
+    assert sum(p.files for p in full.packages().values()) == 40
+    assert len(sampled.modules) + len(sampled.errors) == 10
+    assert sampled.population == 41
+    assert list(usage.survey(paths, sample=10, seed=1).modules) == list(sampled.modules)
+
+
+def test_survey_stop_early(tmp_path):
+    paths = list(cli.runner.iter_python_files([_write_tree(tmp_path, 400, double_every=10)]))
+
+    surveyed = usage.survey(paths, stop_early=True, seed=0)
+
+    assert len(surveyed.modules) < 400
+    assert surveyed.total.recommend() == engine.QuoteConfig('single', 'double', 'double')
+    assert surveyed.is_stable(usage.z_score(0.99))
+
+
+def test_survey_unstable(tmp_path):
+    # an even split is never stable, so every file is surveyed.
+    paths = list(cli.runner.iter_python_files([_write_tree(tmp_path, 200, double_every=2)]))
+
+    surveyed = usage.survey(paths, stop_early=True, seed=0)
+
+    assert len(surveyed.modules) == 200
+
+
+@pytest.mark.parametrize('confidence, z', [(0.95, 1.96), (0.99, 2.576)])
+def test_z_score(confidence, z):
+    assert usage.z_score(confidence) == pytest.approx(z, abs=1e-3)
+
+
+def test_cli_stats(tmp_path, capsys):
+    root = _write_tree(tmp_path, 6, double_every=3)
+
+    status = cli.main(['stats', root])
+    out = capsys.readouterr().out.splitlines()
+
+    assert status == 0
+    assert out[0].split() == ['package', 'files', '\'', '"', 'escapes', '\'\'\'', '"""', 'doc', '\'\'\'', 'doc', '"""']
+    assert [line.split()[:2] for line in out[1:5]] == [
+        [os.path.join(root, 'pkg0'), '2'], [os.path.join(root, 'pkg1'), '2'], [os.path.join(root, 'pkg2'), '2'],
+        ['total', '6'],
+    ]
+    assert out[6:] == [
+        '# surveyed 6 of 6 files',
+        '# string-quote violations: single 15, double 33, single-avoid-escape 15, double-avoid-escape 33',
+        'string-quote=single',
+        '# triple-quote violations: single 10, double 0',
+        'triple-quote=double',
+        '# docstring-quote violations: single 6, double 0',
+        'docstring-quote=double',
+    ]
+
+    cli.main(['stats', '--modules', root])
+    assert len(capsys.readouterr().out.splitlines()) == 1 + 6 + 1 + 8
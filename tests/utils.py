@@ -1,11 +1,21 @@
 """Test utilities.
 """
 
+import io
+import os
+import tokenize
+
+from pylint.lint import Run
+from pylint.reporters.text import TextReporter
 from pylint.testutils import CheckerTestCase
 
 from pylint.testutils import _tokenize_str as tokenize_str
 
 import astroid
+import pytest
+from astroid import nodes
+
+from pylint_quotes.checker import DOCSTRING_DETECTION_OPTS, StringQuoteChecker
 
 # constants for single quote types
 Q_SING = "'"
@@ -15,12 +25,39 @@ Q_DOUB = '"'
 TRI_Q_SING = "'''"
 TRI_Q_DOUB = '"""'
 
+# the messages of the quote checks, as pylint options take them
+SYMBOLS = 'invalid-string-quote,invalid-triple-quote,invalid-docstring-quote'
+
+
+def ast_detection_only(fun):
+    """Mark a test as only run with `docstring-detection=ast`.
+
+    The checks visit a single node after tokenizing: with 'ast', only the
+    docstring of that node is checked, while with 'tokens' every docstring
+    of the source is, as it is tokenized. A test of which docstring the AST
+    walk matches to the node, in a source with several, is ast only.
+    """
+    fun.docstring_detection = ('ast',)
+    return fun
+
 
 class StringQuoteCheckerTestCase(CheckerTestCase):
     """A class which extends the pylint CheckerTestCase by wrapping
     some common code used in testing.
+
+    Each test is run with both docstring detection modes (see
+    `ast_detection_only`).
     """
 
+    @pytest.fixture(autouse=True, params=DOCSTRING_DETECTION_OPTS)
+    def docstring_detection(self, request):
+        """Run the test with each docstring detection mode."""
+        modes = getattr(request.function, 'docstring_detection', DOCSTRING_DETECTION_OPTS)
+        if request.param not in modes:
+            pytest.skip('only run with docstring-detection={}'.format(' or '.join(modes)))
+        self.checker.config.docstring_detection = request.param
+        return request.param
+
     def _check(self, test_str, visiter, *messages):
         """Method to perform the actual test check for those methods
         that utilize a visitor.
@@ -75,4 +112,56 @@ class StringQuoteCheckerTestCase(CheckerTestCase):
             test_str,
             self.checker.visit_asyncfunctiondef,
             *messages
-        )
\ No newline at end of file
+        )
+
+
+def walk(checker, node):
+    """Visit the node and its children the way the pylint AST walker would."""
+    if isinstance(node, nodes.Module):
+        checker.visit_module(node)
+    elif isinstance(node, nodes.ClassDef):
+        checker.visit_classdef(node)
+    elif isinstance(node, nodes.AsyncFunctionDef):
+        checker.visit_asyncfunctiondef(node)
+    elif isinstance(node, nodes.FunctionDef):
+        checker.visit_functiondef(node)
+
+    for child in node.get_children():
+        walk(checker, child)
+
+    if isinstance(node, nodes.Module):
+        checker.leave_module(node)
+
+
+def lint(paths, *args, reporter=None):
+    """Run pylint with only the quote checks enabled, ignoring any rcfile
+    and without persisting the results.
+
+    Args:
+        paths: the files and packages to lint.
+        *args: more pylint options.
+        reporter: the reporter of the run, a TextReporter by default.
+
+    Returns:
+        tuple: the linter of the run, and the output of the default
+        reporter, or '' if another reporter is given.
+    """
+    out = io.StringIO()
+    run = Run([
+        '--rcfile=' + os.devnull, '--persistent=n', '--load-plugins=pylint_quotes',
+        '--disable=all', '--enable=' + SYMBOLS,
+    ] + list(args) + list(paths), reporter=reporter or TextReporter(out), exit=False)
+    return run.linter, out.getvalue()
+
+
+def quote_checker(linter):
+    """Get the StringQuoteChecker of a linter."""
+    return next(c for c in linter.get_checkers() if isinstance(c, StringQuoteChecker))
+
+
+def read_source(path):
+    """Read a Python source file, decoded as tokenize would."""
+    with open(path, 'rb') as f:
+        encoding, _ = tokenize.detect_encoding(f.readline)
+        f.seek(0)
+        return f.read().decode(encoding)